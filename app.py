@@ -63,6 +63,10 @@ except ImportError as e:
 # --------------------------------------------------------------------------
 CURRENT_YEAR = config_manager.GLOBAL_CONFIG.get("target_year", 2025)
 
+# [Stale-While-Revalidate] 캐시가 만료돼도 화면은 바로 표시하고 갱신은 백그라운드에서
+# (config.json의 "stale_while_revalidate": false 로 끌 수 있음)
+data_loader.set_stale_while_revalidate(config_manager.GLOBAL_CONFIG.get("stale_while_revalidate", True))
+
 st.set_page_config(
     page_title=f"{CURRENT_YEAR}학년도 출결 관리",
     page_icon="🏫",
@@ -94,6 +98,7 @@ init_session_state()
 # 4. HELPER FUNCTIONS
 # --------------------------------------------------------------------------
 def clear_cache_data():
+    data_loader.invalidate_memory_cache()
     if os.path.exists(CACHE_DIR):
         try:
             for filename in os.listdir(CACHE_DIR):
@@ -169,11 +174,19 @@ with st.sidebar:
     
     st.markdown("---")
     
+    # 데이터 기준 시각 (가장 오래된 월의 마지막 동기화/확인 시각)
+    as_of = data_loader.data_as_of()
+    if as_of:
+        refreshing = " · 🔄 백그라운드 갱신 중" if data_loader.is_refreshing() else ""
+        st.caption(f"🕒 데이터 기준: {as_of.strftime('%m/%d %H:%M')}{refreshing}")
+
     with st.expander("⚙️ 데이터 관리"):
         if st.button("🔄 데이터 새로고침 (캐시삭제)", use_container_width=True):
             clear_cache_data()
             time.sleep(0.5)
             st.rerun()
+        memo = data_loader.memory_cache_stats()
+        st.caption(f"🧠 메모리 캐시: {memo['size']}/{memo['maxsize']}개월 · 적중 {memo['hits']} / 실패 {memo['misses']}")
 
     st.divider()
     with st.expander("🔐 관리자 설정"):
@@ -189,29 +202,32 @@ with st.sidebar:
 # --------------------------------------------------------------------------
 current_menu = st.session_state['menu']
 
+# [공유 스냅샷] 한 번의 rerun 안에서 여러 리포트가 같은 데이터를 공유 (필요한 월만 지연 로드)
+snapshot = data_loader.AttendanceSnapshot()
+
 if current_menu == "대시보드(Home)":
-    dashboard.render(CURRENT_YEAR, all_months)
+    dashboard.render(CURRENT_YEAR, all_months, snapshot)
 
 elif current_menu == "🔔 알림 센터":
-    notification.render()
+    notification.render(snapshot)
 
 elif current_menu == "월별/학급별 리포트":
-    monthly_report.render(selected_months)
+    monthly_report.render(selected_months, snapshot)
 
 elif current_menu == "교외체험학습 통계":
-    fieldtrip.render()
+    fieldtrip.render(snapshot)
 
 elif current_menu == "생리인정결석 체크":
-    menstrual.render()
+    menstrual.render(snapshot)
 
 elif current_menu == "장기결석 경고 관리":
-    absence.render()
+    absence.render(snapshot)
 
 elif current_menu == "증빙서류 체크리스트":
-    checklist.render(selected_months)
+    checklist.render(selected_months, snapshot)
 
 elif current_menu == "주간 요약 & 달력":
-    weekly_calendar.render(selected_months)
+    weekly_calendar.render(selected_months, snapshot)
 
 elif current_menu == "📅 학사일정 관리":
     schedule_manager.render(CURRENT_YEAR)
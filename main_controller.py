@@ -24,6 +24,7 @@ try:
     from src.components import universal_calendar_batch as calendar_gen
     from src.components import universal_weekly_summary_batch as weekly_gen
     from src.components import universal_monthly_index as index_gen
+    from src.components import report_pipeline   # [New] 빌드 그래프 (바뀐 산출물만 재생성)
 
     # 3. 통계 및 도구
     from src.components import generate_checklist as checklist_gen
@@ -42,6 +43,9 @@ except ImportError as e:
     print("   프로젝트 루트 폴더에서 실행했는지 확인해주세요.")
     sys.exit(1)
 
+# [설정] python main_controller.py --force -> 입력 변화와 무관하게 리포트 전체 재생성
+FORCE_REBUILD = False
+
 # ==========================================
 # 유틸리티 함수
 # ==========================================
@@ -50,6 +54,7 @@ def clear_screen():
 
 def clear_all_cache():
     print("\n 🧹 캐시 데이터를 정리하는 중...")
+    data_loader.invalidate_memory_cache()
     if not os.path.exists(CACHE_DIR):
         print("   ℹ️ 캐시 폴더가 이미 비어있거나 존재하지 않습니다.")
         return
@@ -295,42 +300,43 @@ def main():
             
             # 데이터 동기화 여부
             sync = input("\n ☁️  구글 시트 최신 데이터를 다운로드 할까요? (y/n) > ").lower()
+            roster = None
             if sync == 'y':
-                roster = data_loader.get_master_roster()
-                data_loader.sync_all_data_batch(roster, target_months=targets)
+                # 명렬표(생일 포함) + 만료된 월을 한 번의 일괄 요청으로
+                roster = data_loader.bootstrap_fetch(target_months=targets)
+
+            # [공유 스냅샷] 명렬표/월별 데이터를 한 번만 로드하여 모든 리포트가 공유
+            snapshot = data_loader.AttendanceSnapshot(roster=roster)
             
             print("\n" + "="*30)
             print(" ▶ 작업 시작...")
             print("="*30)
 
-            # [1] 기본 세트
+            # [1] 기본 세트 (입력이 바뀐 월만 다시 생성)
             if mode == '1' or mode == '6':
                 print("\n [1/4] 달력/월별/주간 리포트 생성...")
-                calendar_gen.run_calendar(target_months=targets)
-                monthly_report.run_monthly_reports(target_months=targets)
-                weekly_gen.run_weekly(target_months=targets)
-                checklist_gen.run_checklists(target_months=targets)
+                report_pipeline.build(targets, snapshot, only=report_pipeline.REPORT_SET, force=FORCE_REBUILD)
 
             # [2] 체험학습
             if mode == '2' or mode == '6':
                 print("\n [2/4] 체험학습 통계...")
-                fieldtrip_gen.run_fieldtrip_stats()
+                report_pipeline.build(targets, snapshot, only=['fieldtrip'], force=FORCE_REBUILD)
 
             # [3] 생리인정
             if mode == '3' or mode == '6':
                 print("\n [3/4] 생리인정결석 체크...")
-                menstrual_stats.run_menstrual_stats()
+                report_pipeline.build(targets, snapshot, only=['menstrual'], force=FORCE_REBUILD)
 
             # [4] 장기결석
             if mode == '4' or mode == '6':
                 print("\n [4/4] 장기결석 관리...")
-                absence_gen.run_long_term_absence()
+                report_pipeline.build(targets, snapshot, only=['long_term'], force=FORCE_REBUILD)
 
             # [공통] 인덱스 갱신
             last_index = None
             if mode == '1' or mode == '6':
                 print("\n 🔗 인덱스 페이지 갱신 중...")
-                last_index = index_gen.run_monthly_index(target_months=targets)
+                report_pipeline.build(targets, snapshot, only=['index'], force=FORCE_REBUILD)
 
             print("\n" + "="*50)
             print(" 🎉 모든 작업 완료!")
@@ -342,4 +348,6 @@ def main():
             input("\n [Enter]를 누르면 메뉴로 돌아갑니다.")
 
 if __name__ == "__main__":
+    FORCE_REBUILD = "--force" in sys.argv[1:]
+    if FORCE_REBUILD: print(" ⚠️ --force: 리포트를 모두 다시 생성합니다.")
     main()
\ No newline at end of file
@@ -10,12 +10,16 @@ from src.paths import ROOT_DIR
 # [Import] 서비스 및 데이터 로더
 from src.services import data_loader 
 from src.services import universal_notification as bot
+from src.services import compliance, running_counters, sync_delta
+from src.paths import CACHE_DIR, DATA_DIR
+from src.utils.state_manager import StateManager
+from src.utils import event_classifier as ec
 # [Import] 체크리스트 매니저 (제출 여부 확인용)
 from src.components import checklist_manager as checklist_db 
 
 # [Import] Utils (DateCalculator)
 try:
-    from src.utils.date_calculator import DateCalculator
+    from src.utils.date_calculator import get_date_calculator
     has_utils = True
 except ImportError:
     has_utils = False
@@ -25,7 +29,7 @@ except ImportError:
 DOCUMENT_DEADLINE_DAYS = 5
 
 # Utils 인스턴스 초기화 (Default to ROOT_DIR via src.paths)
-date_calc = DateCalculator() if has_utils else None
+date_calc = get_date_calculator() if has_utils else None  # 공용 인스턴스 (학년도 캘린더 공유)
 
 def get_today_date():
     return datetime.date.today()
@@ -33,7 +37,7 @@ def get_today_date():
 # =========================================================
 # 1. 📅 오늘의 출결 브리핑
 # =========================================================
-def send_morning_briefing(roster):
+def send_morning_briefing(roster, snapshot=None):
     today = get_today_date()
     month = today.month
     
@@ -42,9 +46,10 @@ def send_morning_briefing(roster):
 
     print(f"   ☀️ [브리핑] {today.strftime('%m월 %d일')} 출결 데이터 집계 중...")
     
-    # data_loader를 통해 오늘 데이터 로드
+    # data_loader를 통해 오늘 데이터 로드 (공유 스냅샷이 있으면 재사용)
+    if snapshot is None: snapshot = data_loader.AttendanceSnapshot(roster=roster)
     try:
-        events = data_loader.load_all_events(None, month, roster)
+        events = snapshot.get_events(month)
     except Exception:
         print("      ❌ 데이터 로드 실패")
         return
@@ -61,7 +66,7 @@ def send_morning_briefing(roster):
     lines = []
     for e in today_events:
         # [강화된 로직] 미인정/무단 결석은 불꽃 아이콘으로 강조
-        is_unexcused = e.get('is_unexcused', False) or "미인정" in e['raw_type'] or "무단" in e['raw_type']
+        is_unexcused = e['excuse'] == ec.EXCUSE_UNEXCUSED
         icon = "🔥" if is_unexcused else "📝"
         
         # 표시할 타입 (결석 글자 제외 등 가공)
@@ -87,23 +92,9 @@ def send_enhanced_birthday_alert(roster):
     print("   🎂 [생일] 생일자 확인 중...")
     today = get_today_date()
     
-    # 구글 시트에서 생일 정보 가져오기
+    # 생일 정보 (부트스트랩/명렬표와 함께 캐시된 A~E열, 없을 때만 시트에서 받음)
     try:
-        client = data_loader.get_google_client()
-        if not client: return
-        doc = data_loader.get_sheet_instance() # 기존 인스턴스 재사용 권장
-        if not doc:
-             # data_loader에 인스턴스가 없으면 새로 연결 시도 (fallback)
-             doc = client.open_by_url(data_loader.GOOGLE_SHEET_URL)
-
-        # 시트 이름 찾기 ('기본정보' 등)
-        worksheet = None
-        for title in ["기본정보", "명렬표", "학생명단"]:
-            try: worksheet = doc.worksheet(title); break
-            except: pass
-        if not worksheet: worksheet = doc.get_worksheet(0)
-            
-        rows = worksheet.get_all_values()
+        rows = data_loader.get_birthday_rows()
     except Exception as e:
         print(f"      ⚠️ 생일 데이터 로드 실패: {e}")
         return
@@ -186,7 +177,7 @@ def send_enhanced_birthday_alert(roster):
 # =========================================================
 # 3. 📑 증빙서류 미제출 독촉 (제출여부 확인 기능 추가)
 # =========================================================
-def send_document_reminder(roster):
+def send_document_reminder(roster, snapshot=None):
     print(f"   📑 [서류] 증빙서류 필요 건(결석/인정) {DOCUMENT_DEADLINE_DAYS}일 경과 확인...")
     today = get_today_date()
     
@@ -194,10 +185,11 @@ def send_document_reminder(roster):
     check_months = sorted(list(set([today.month, (today.replace(day=1) - datetime.timedelta(days=1)).month])))
     check_months = [m for m in check_months if m in data_loader.ACADEMIC_MONTHS]
     
+    if snapshot is None: snapshot = data_loader.AttendanceSnapshot(roster=roster)
     all_events = []
     for month in check_months:
         try:
-            events = data_loader.load_all_events(None, month, roster)
+            events = snapshot.get_events(month)
             all_events.extend(events)
         except: continue
     
@@ -210,11 +202,11 @@ def send_document_reminder(roster):
         raw_type = group['raw_type']
         
         # [정책] 미인정/무단은 증빙서류 제출 대상이 아닐 수 있음 -> 제외
-        if ("미인정" in raw_type) or group.get('is_unexcused', False):
+        if group['excuse'] == ec.EXCUSE_UNEXCUSED:
             continue
             
         # 결석, 인정결석, 기타결석 등 증빙이 필요한 건만 타겟팅
-        is_target = ("결석" in raw_type) or ("인정" in raw_type) or ("기타" in raw_type)
+        is_target = group['kind'] == ec.KIND_ABSENCE or group['excuse'] in (ec.EXCUSE_AUTHORIZED, ec.EXCUSE_OTHER)
         
         if is_target:
             start_date = group['start']
@@ -246,10 +238,102 @@ def send_document_reminder(roster):
     else:
         print("      -> 대상 없음 (모두 제출 완료)")
 
+# =========================================================
+# 4. 🔀 지난 알림 이후 시트 변경 사항 (동기화 변경 로그)
+# =========================================================
+def _cursor_state(cursor_file):
+    """알림 기준점은 변경 로그와 같은 데이터 폴더에 보관 (이전 버전이 캐시 폴더에 남긴 파일은 한 번 옮김)"""
+    legacy, path = CACHE_DIR / cursor_file, DATA_DIR / cursor_file
+    if legacy.exists() and not path.exists():
+        try:
+            DATA_DIR.mkdir(parents=True, exist_ok=True)
+            os.replace(legacy, path)
+        except OSError as e:
+            print(f"      ⚠️ 이전 알림 기준점 이동 실패: {e}")
+    return StateManager(str(DATA_DIR))
+
+def send_change_alert(snapshot):
+    print("   🔀 [변경] 지난 알림 이후 수정된 기록 확인 중...")
+    cursor_file = f"alert_cursor_{data_loader.cache_namespace(snapshot.year)}.json"
+    state_mgr = _cursor_state(cursor_file)
+    cursor = state_mgr.load_json(cursor_file, default={'seq': None})
+
+    changes, seq, complete = data_loader.sync_changes(cursor['seq'] or 0, year=snapshot.year)
+    if cursor['seq'] is None:
+        # 처음 실행: 지금까지의 로그는 이미 반영된 것으로 보고 기준점만 기록
+        state_mgr.save_json(cursor_file, {'seq': seq})
+        print("      -> 기준점 기록 (다음 실행부터 변경 사항 알림)")
+        return
+    if not changes:
+        print("      -> 변경 없음")
+        return
+
+    icons = {sync_delta.ADDED: "🆕", sync_delta.CORRECTED: "✏️", sync_delta.REMOVED: "🗑️"}
+    lines = []
+    for c in sorted(changes, key=lambda c: (c['date'], c['num'])):
+        day = datetime.date.fromisoformat(c['date']).strftime('%m/%d')
+        if c['change'] == sync_delta.CORRECTED:
+            detail = f"{c['before']['type']} → {c['after']['type']}"
+        else:
+            detail = (c['after'] or c['before'])['type']
+        lines.append(f"{icons[c['change']]} {day} {c['num']}번 {c['name']} {detail}")
+
+    counts = sync_delta.summarize(changes)
+    header = f"🔀 [출결 변경 사항] 추가 {counts[sync_delta.ADDED]} / 수정 {counts[sync_delta.CORRECTED]} / 삭제 {counts[sync_delta.REMOVED]}"
+    if not complete: header += "\n(오래된 변경 기록 일부는 정리되어 빠졌습니다)"
+    if bot.send_alert(header + "\n" + "\n".join(lines)):
+        state_mgr.save_json(cursor_file, {'seq': seq})
+        print(f"      -> 변경 알림 전송 ({len(changes)}건)")
+
+# =========================================================
+# 5. 📈 규정 누적 카운터 (변경분만 반영, 새로 생긴 위반만 알림)
+# =========================================================
+def describe_flag(st, flag):
+    """누적 카운터 위반 항목 -> 알림 문구"""
+    rule_id, check = flag.split('.')[:2]
+    if rule_id == 'long_term':
+        a = st['absence']
+        return f"장기결석 누적 {a['count']}일" if check == 'count' else f"장기결석 연속 {a['max_streak']}일"
+    if rule_id == 'fieldtrip':
+        trip = st['trip']
+        if check == 'dom_total': return f"국내 체험학습 {trip['dom']['days']}일"
+        if check == 'intl_total': return f"국외 체험학습 {trip['int']['days']}일"
+        return f"국내 체험학습 연속 {trip['dom']['max']}일"
+    month = flag.split('.')[2]
+    usage = st['menstrual'][month]
+    return f"생리인정 {month}월 결{usage['abs']}/기{usage['sub']}"
+
+def update_running_counters(snapshot):
+    print("\n   📈 [Counters] 규정 누적값 갱신 중...")
+    state = running_counters.update(snapshot)
+    mode = {'unchanged': '변경 없음', 'delta': '변경분 반영', 'rebuild': '전체 재계산'}.get(state.get('mode'), '-')
+    print(f"      -> {mode} (학생 {len(state['students'])}명)")
+
+    # 1. 이번 갱신에서 새로 기준을 넘은 항목 알림 (처음 계산할 때는 기준점만 기록)
+    alerts = []
+    for num, flags in state.get('new_flags', {}).items():
+        st = state['students'][num]
+        alerts.extend(f"⚠️ {num}번 {st['name']}: {describe_flag(st, f)}" for f in flags)
+    if alerts and bot.send_alert("📈 [규정 기준 도달]\n" + "\n".join(alerts)):
+        print(f"      -> 규정 알림 전송 ({len(alerts)}건)")
+
+    # 2. 장기결석 주의 명단 (누적 기준 이상 또는 오늘까지 연속 결석이 이어지는 학생, 로그만)
+    lt = compliance.rule_limits('long_term')
+    today = get_today_date()
+    watch = []
+    for num, st in state['students'].items():
+        a = st['absence']
+        if not a: continue
+        streak = running_counters.current_streak(a, today)
+        if a['count'] >= lt['l1'] or streak >= lt['consecutive']:
+            watch.append(f"{num}번 {st['name']}(누적 {a['count']}일, 연속 {streak}일)")
+    if watch: print("      -> 장기결석 주의: " + ", ".join(watch))
+    return state
+
 # =========================================================
 # 실행 진입점
 # =========================================================
-def run_daily_checks():
+def run_daily_checks(snapshot=None):
     print("\n" + "="*40)
     print(" 🌅 [매일 아침/오후] 출결 종합 브리핑")
     print("="*40)
@@ -266,19 +350,26 @@ def run_daily_checks():
             return
 
     try:
-        roster = data_loader.get_master_roster()
+        if snapshot is None: snapshot = data_loader.AttendanceSnapshot()
+        roster = snapshot.roster
         if not roster:
             print(" ❌ 명렬표를 불러오지 못해 중단합니다.")
             return
 
         # 2. 출결 브리핑
-        send_morning_briefing(roster)
+        send_morning_briefing(roster, snapshot)
         
         # 3. 생일 알림 (월요일 주간예보 포함)
         send_enhanced_birthday_alert(roster)
         
         # 4. 서류 독촉 (제출완료 건 제외)
-        send_document_reminder(roster)
+        send_document_reminder(roster, snapshot)
+
+        # 5. 시트 변경 사항 (지난 알림 이후 추가/수정/삭제된 기록)
+        send_change_alert(snapshot)
+
+        # 6. 규정 누적 카운터 (새로 기준을 넘은 학생 알림)
+        update_running_counters(snapshot)
         
         print("\n ✅ 점검 완료.")
     except Exception as e:
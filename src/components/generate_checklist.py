@@ -7,9 +7,10 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_PATH)) # components -> src -
 sys.path.append(PROJECT_ROOT) 
 
 # [Refactor] Utils 및 서비스 모듈 임포트
-from src.utils.date_calculator import DateCalculator
+from src.utils.date_calculator import get_date_calculator
 from src.utils.template_manager import TemplateManager
 from src.utils.state_manager import StateManager
+from src.utils import event_classifier as ec
 import src.services.data_loader as data_loader
 
 # 경로 설정
@@ -17,7 +18,7 @@ OUTPUT_DIR = os.path.join(PROJECT_ROOT, "reports", "checklist")
 STATUS_DIR = os.path.join(OUTPUT_DIR, "status")
 
 # [Refactor] 3대장 도구 초기화
-date_calc = DateCalculator(PROJECT_ROOT)
+date_calc = get_date_calculator()  # 공용 인스턴스 (학년도 캘린더 공유)
 tmpl_mgr = TemplateManager(PROJECT_ROOT)
 state_mgr = StateManager(STATUS_DIR)
 
@@ -76,30 +77,28 @@ def filter_checklist_events(events):
     2. 질병지각/조퇴/결과 제외 (질병결석은 포함)
     """
     targets = []
-    exclude_keywords = ["질병지각", "질병조퇴", "질병결과"]
 
     for e in events:
-        if e.get('is_unexcused', False):
+        if e['excuse'] == ec.EXCUSE_UNEXCUSED:
             continue
             
-        raw_type = e.get('raw_type', '')
-        if any(keyword in raw_type for keyword in exclude_keywords):
+        if e['excuse'] == ec.EXCUSE_DISEASE and e['kind'] in ec.PARTIAL_KINDS:
             continue
             
         targets.append(e)
     return targets
 
-def run_checklists(target_months=None):
+def run_checklists(target_months=None, snapshot=None):
     if target_months is None: target_months = data_loader.ACADEMIC_MONTHS
     
     print(f"=== 증빙서류 체크리스트 생성 (Phase 2 Refactored) ===")
-    roster = data_loader.get_master_roster()
+    if snapshot is None: snapshot = data_loader.AttendanceSnapshot()
     
     for month in target_months:
-        year = data_loader.TARGET_YEAR + 1 if month < 3 else data_loader.TARGET_YEAR
+        year = snapshot.year_of(month)  # 스냅샷 학년도 기준 (1·2월은 다음 해)
         
-        # 1. 데이터 로드 (Raw Data: 'date' 키 가짐)
-        all_events = data_loader.load_all_events(None, month, roster)
+        # 1. 데이터 로드 (공유 스냅샷, Raw Data: 'date' 키 가짐)
+        all_events = snapshot.get_events(month)
         
         # 2. 필터링
         filtered_events = filter_checklist_events(all_events)
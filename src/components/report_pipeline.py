@@ -0,0 +1,276 @@
+import os
+import json
+import time
+import hashlib
+import datetime
+from pathlib import Path
+
+from src.paths import REPORTS_DIR, SRC_DIR
+from src.services import data_loader, compliance
+from src.utils.state_manager import StateManager
+from src.utils.date_calculator import HOLIDAY_STORE
+from src.utils import parallel_render
+
+try:
+    from src.services.config_manager import GLOBAL_CONFIG
+except ImportError:
+    GLOBAL_CONFIG = {}
+
+from src.components import universal_calendar_batch as calendar_gen
+from src.components import universal_monthly_report_batch as monthly_gen
+from src.components import universal_weekly_summary_batch as weekly_gen
+from src.components import generate_checklist as checklist_gen
+from src.components import universal_monthly_index as index_gen
+from src.components import universal_fieldtrip_stats as fieldtrip_gen
+from src.components import universal_menstrual_stats as menstrual_gen
+from src.components import universal_long_term_absence as absence_gen
+
+# =============================================================================
+# [리포트 빌드 그래프] 산출물마다 입력을 선언하고, 입력이 바뀐 산출물만 다시 생성
+# - 입력 해시: 월 이벤트(스냅샷이 읽은 데이터의 지문), 학년도 월 목록, 명렬표, 휴일 파일, 체크리스트 상태, 템플릿, 생성기 코드, 규정 기준값
+# - reports/build_manifest.json 에 산출물별 입력 해시와 출력 파일을 기록
+# - 입력 해시가 기록과 같고 출력 파일이 모두 있으면 건너뜀 (force=True 또는 main_controller --force 로 전체 재생성)
+# - 다시 만들 산출물은 (생성기, 월) 작업으로 나눠 프로세스 풀에서 병렬 렌더링 (src.utils.parallel_render)
+# =============================================================================
+MANIFEST_FILE = "build_manifest.json"
+MANIFEST_VERSION = 1
+TEMPLATE_DIR = Path(SRC_DIR) / "templates"
+
+def _month_file(folder, suffix):
+    return lambda m: [os.path.join(str(folder), f"{m:02d}월_{suffix}.html")]
+
+# per_month: 월별 산출물이면 True (False면 학년도 전체 1개)
+TARGETS = [
+    {
+        'id': 'calendar', 'module': calendar_gen, 'per_month': True,
+        'inputs': ['events', 'roster', 'holidays'], 'templates': ['calendar_template.html'],
+        'outputs': _month_file(calendar_gen.OUTPUT_DIR, "생활기록_달력"),
+        'run': lambda months, snapshot: calendar_gen.run_calendar(target_months=months, snapshot=snapshot),
+    },
+    {
+        'id': 'monthly', 'module': monthly_gen, 'per_month': True,
+        'inputs': ['events', 'roster', 'holidays'], 'templates': ['monthly_detail.html', 'monthly_class.html'],
+        'outputs': lambda m: _month_file(monthly_gen.OUTPUT_DIR, "월별출결현황")(m) + _month_file(monthly_gen.OUTPUT_DIR, "학급별현황")(m),
+        'run': lambda months, snapshot: monthly_gen.run_monthly_reports(target_months=months, snapshot=snapshot),
+    },
+    {
+        'id': 'weekly', 'module': weekly_gen, 'per_month': True,
+        'inputs': ['events', 'roster', 'holidays'], 'templates': ['weekly_summary.html'],
+        'outputs': _month_file(weekly_gen.OUTPUT_DIR, "주간요약"),
+        'run': lambda months, snapshot: weekly_gen.run_weekly(target_months=months, snapshot=snapshot),
+    },
+    {
+        'id': 'weekly_semester', 'module': weekly_gen, 'per_month': False,
+        'inputs': ['events', 'roster', 'holidays'], 'templates': ['weekly_summary.html'],
+        'outputs': lambda m: [os.path.join(weekly_gen.OUTPUT_DIR, f"{name}_주간요약.html") for name in weekly_gen.SEMESTERS],
+        'run': lambda months, snapshot: weekly_gen.run_weekly_semesters(snapshot=snapshot),
+    },
+    {
+        'id': 'checklist', 'module': checklist_gen, 'per_month': True,
+        'inputs': ['events', 'roster', 'holidays', 'checklist'], 'templates': ['checklist_template.html'],
+        'outputs': _month_file(checklist_gen.OUTPUT_DIR, "증빙서류_체크리스트"),
+        'run': lambda months, snapshot: checklist_gen.run_checklists(target_months=months, snapshot=snapshot),
+    },
+    {
+        'id': 'index', 'module': index_gen, 'per_month': True,
+        'inputs': ['months', 'roster'], 'templates': ['monthly_index_template.html'],
+        'outputs': _month_file(index_gen.INDEX_DIR, "통합_인덱스"),
+        'run': lambda months, snapshot: index_gen.run_monthly_index(target_months=months, year=snapshot.year),
+    },
+    {
+        'id': 'fieldtrip', 'module': fieldtrip_gen, 'per_month': False,
+        'inputs': ['events', 'roster', 'holidays', 'limits'], 'templates': ['stats_fieldtrip.html'],
+        'outputs': lambda m: [os.path.join(fieldtrip_gen.OUTPUT_DIR, "연간_체크_체험학습통계.html")],
+        'run': lambda months, snapshot: fieldtrip_gen.run_fieldtrip_stats(snapshot=snapshot),
+    },
+    {
+        'id': 'menstrual', 'module': menstrual_gen, 'per_month': False,
+        'inputs': ['events', 'roster', 'limits'], 'templates': ['stats_menstrual.html'],
+        'outputs': lambda m: [os.path.join(menstrual_gen.OUTPUT_DIR, "생리인정결석_통계.html")],
+        'run': lambda months, snapshot: menstrual_gen.run_menstrual_stats(snapshot=snapshot),
+    },
+    {
+        'id': 'long_term', 'module': absence_gen, 'per_month': False,
+        'inputs': ['events', 'roster', 'holidays', 'limits'], 'templates': ['stats_longterm.html'],
+        'outputs': lambda m: [os.path.join(absence_gen.OUTPUT_DIR, "장기결석_경고리포트.html")],
+        'run': lambda months, snapshot: absence_gen.run_long_term_absence(snapshot=snapshot),
+    },
+]
+
+REPORT_SET = ['calendar', 'monthly', 'weekly', 'weekly_semester', 'checklist']   # 메뉴 1
+STATS_SET = ['fieldtrip', 'menstrual', 'long_term']
+
+def target_by_id(target_id):
+    return next(t for t in TARGETS if t['id'] == target_id)
+
+# =============================================================================
+# 입력 해시
+# =============================================================================
+def _hash(*parts):
+    h = hashlib.blake2b(digest_size=12)
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else json.dumps(p, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+def _file_hash(path):
+    try:
+        with open(path, "rb") as f: return _hash(f.read())
+    except OSError:
+        return None
+
+class _Inputs:
+    """한 번의 빌드에서 입력 해시를 계산해 재사용"""
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.year = snapshot.year
+        self._memo = {}
+
+    def _get(self, key, compute):
+        if key not in self._memo: self._memo[key] = compute()
+        return self._memo[key]
+
+    def events(self, months):
+        # 스냅샷이 읽은 데이터 기준 (동기화 기록은 백그라운드 갱신으로 렌더링한 데이터보다 앞설 수 있음)
+        return _hash([self.snapshot.month_stamp(m) for m in months])
+
+    def months(self):
+        return _hash(list(index_gen.ACADEMIC_MONTHS))
+
+    def roster(self):
+        return self._get('roster', lambda: _hash(sorted(self.snapshot.roster.items())))
+
+    def holidays(self):
+        def compute():
+            files = []
+            for y in (self.year, self.year + 1):
+                for base in HOLIDAY_STORE.search_dirs:
+                    files.append(_file_hash(Path(base) / f"holidays_{y}.json"))
+            return _hash(files)
+        return self._get('holidays', compute)
+
+    def checklist(self, months):
+        return _hash([_file_hash(os.path.join(checklist_gen.STATUS_DIR, f"checklist_{self.year_of(m)}_{m:02d}.json"))
+                      for m in months])
+
+    def limits(self):
+        return self._get('limits', lambda: _hash({r['id']: compliance.rule_limits(r) for r in compliance.RULES}))
+
+    def template(self, name):
+        return self._get(('tmpl', name), lambda: _file_hash(TEMPLATE_DIR / name))
+
+    def code(self, module):
+        return self._get(('code', module.__name__), lambda: _file_hash(module.__file__))
+
+    def year_of(self, month):
+        return self.year + 1 if month < 3 else self.year
+
+    def of(self, target, months):
+        inputs = {'year': self.year, 'code': self.code(target['module'])}
+        for name in target['inputs']:
+            fn = getattr(self, name)
+            inputs[name] = fn(months) if name in ('events', 'checklist') else fn()
+        for name in target['templates']:
+            inputs[f"template:{name}"] = self.template(name)
+        return inputs
+
+# =============================================================================
+# 매니페스트
+# =============================================================================
+def load_manifest():
+    manifest = StateManager(str(REPORTS_DIR)).load_json(MANIFEST_FILE, default=None)
+    if not manifest or manifest.get('version') != MANIFEST_VERSION:
+        manifest = {'version': MANIFEST_VERSION, 'artifacts': {}}
+    return manifest
+
+def _artifact_key(year, target, month):
+    return f"{year}/{target['id']}" + (f"/{month:02d}" if month is not None else "")
+
+def _is_fresh(record, inputs, outputs):
+    return record is not None and record.get('inputs') == inputs and all(os.path.exists(p) for p in outputs)
+
+def _file_stamp(path):
+    """출력 파일 식별값 (생성기는 임시 파일에 쓴 뒤 교체하므로 다시 쓰면 반드시 바뀜)"""
+    try:
+        st = os.stat(path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+# =============================================================================
+# 빌드
+# =============================================================================
+# 병렬 렌더링 작업자 수 (config.json "render_workers", 0: CPU 코어 수, 1: 순차 실행)
+RENDER_WORKERS = GLOBAL_CONFIG.get("render_workers", 1)
+
+def _prepare_shared(snapshot, targets):
+    """fork 전에 부모에서 미리 읽어 두어 자식들이 같은 데이터를 공유하도록 함"""
+    snapshot.preload()
+    if any(t['id'] in STATS_SET for t in targets):
+        snapshot.compliance()
+
+def build(target_months=None, snapshot=None, only=None, force=False, workers=None):
+    """
+    선택한 산출물 중 입력이 바뀌었거나 출력 파일이 없는 것만 다시 생성.
+    only: 대상 id 목록 (생략 시 전체), force: 입력과 무관하게 모두 재생성
+    workers: 병렬 렌더링 프로세스 수 (생략 시 RENDER_WORKERS) - (생성기, 월) 단위로 나눠 실행
+    Returns: {'built': [산출물 키], 'skipped': [산출물 키]}
+    """
+    if target_months is None: target_months = data_loader.ACADEMIC_MONTHS
+    if snapshot is None: snapshot = data_loader.AttendanceSnapshot()
+    targets = [t for t in TARGETS if only is None or t['id'] in only]
+    workers = parallel_render.resolve_workers(RENDER_WORKERS if workers is None else workers)
+    if workers > 1: workers = parallel_render.effective_workers(workers)  # 스레드가 있는 프로세스(Streamlit)에서는 순차
+
+    started = time.perf_counter()
+    manifest = load_manifest()
+    artifacts = manifest['artifacts']
+    hashes = _Inputs(snapshot)
+    result = {'built': [], 'skipped': []}
+
+    # 1. 오래된 산출물 찾기 (월별 산출물은 월 단위, 학년도 산출물은 전체 월 입력 기준)
+    stale = {}
+    for target in targets:
+        units = [(m, [m]) for m in target_months] if target['per_month'] else [(None, list(data_loader.ACADEMIC_MONTHS))]
+        for month, months in units:
+            key = _artifact_key(hashes.year, target, month)
+            inputs = hashes.of(target, months)
+            outputs = target['outputs'](month)
+            if not force and _is_fresh(artifacts.get(key), inputs, outputs):
+                result['skipped'].append(key)
+            else:
+                stale.setdefault(target['id'], []).append((month, key, inputs, outputs))
+
+    # 2. 작업 구성: 병렬이면 (생성기, 월)마다 1개, 순차면 생성기마다 오래된 월을 모아 1개
+    jobs, job_units = [], []
+    for target in targets:
+        units = stale.get(target['id'], [])
+        if not units: continue
+        groups = [[u] for u in units] if workers > 1 else [units]
+        for group in groups:
+            months = [m for m, _, _, _ in group if m is not None]
+            jobs.append(lambda run=target['run'], months=months: run(months, snapshot))
+            job_units.append(group)
+
+    if jobs:
+        before = {p: _file_stamp(p) for group in job_units for _, _, _, outputs in group for p in outputs}
+        if workers > 1: _prepare_shared(snapshot, targets)
+        outcomes = parallel_render.run_jobs(jobs, workers)
+
+        # 3. 성공했고 출력 파일이 이번 빌드에서 실제로 다시 쓰인 산출물만 기록
+        #    (생성기는 렌더링 오류를 삼키고 이전 파일을 그대로 두므로, 파일이 있는지만 봐서는 실패를 알 수 없음)
+        built_at = datetime.datetime.now().isoformat(timespec='seconds')
+        for ok, group in zip(outcomes, job_units):
+            if not ok: continue
+            for month, key, inputs, outputs in group:
+                stamps = [_file_stamp(p) for p in outputs]
+                if all(st is not None and st != before[p] for p, st in zip(outputs, stamps)):
+                    artifacts[key] = {'inputs': inputs, 'outputs': [os.path.relpath(p, str(REPORTS_DIR)) for p in outputs], 'built_at': built_at}
+                    result['built'].append(key)
+                else:
+                    print(f"⚠️ [Build] {key}: 출력 파일이 갱신되지 않아 다음 빌드에서 다시 생성합니다.")
+
+    if result['built']:
+        StateManager(str(REPORTS_DIR)).save_json(MANIFEST_FILE, manifest)
+    elapsed = time.perf_counter() - started
+    print(f"🧱 [Build] 생성 {len(result['built'])}개 / 최신 유지 {len(result['skipped'])}개 ({elapsed:.2f}초, 작업자 {min(workers, max(len(jobs), 1))})")
+    return result
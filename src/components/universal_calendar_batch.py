@@ -7,11 +7,11 @@ from pathlib import Path
 # [Import] 데이터 로더 및 경로
 # src.paths를 통해 안전하게 루트 경로 및 데이터 경로를 가져옵니다.
 from src.paths import ROOT_DIR, REPORTS_DIR
-from src.services.data_loader import load_all_events, get_master_roster, TARGET_YEAR, ACADEMIC_MONTHS
+from src.services.data_loader import AttendanceSnapshot, ACADEMIC_MONTHS
 
 # [Import] Utils (DateCalculator & TemplateManager)
 try:
-    from src.utils.date_calculator import DateCalculator
+    from src.utils.date_calculator import get_date_calculator
     from src.utils.template_manager import TemplateManager
     has_utils = True
 except ImportError:
@@ -23,7 +23,7 @@ OUTPUT_DIR = REPORTS_DIR / "calendar"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Utils 인스턴스 (Default to ROOT_DIR via src.paths)
-date_calc = DateCalculator() if has_utils else None
+date_calc = get_date_calculator() if has_utils else None  # 공용 인스턴스 (학년도 캘린더 공유)
 tmpl_mgr = TemplateManager() if has_utils else None
 
 def build_calendar_data(year, month, daily_records):
@@ -79,40 +79,33 @@ def build_calendar_data(year, month, daily_records):
         
     return calendar_weeks
 
-def run_calendar(target_months=None):
+def run_calendar(target_months=None, snapshot=None):
     if target_months is None: target_months = ACADEMIC_MONTHS
     
     print(f"=== 생활기록 달력 생성 (대상: {target_months}) ===")
     
+    if snapshot is None: snapshot = AttendanceSnapshot()
     try:
-        master_roster = get_master_roster()
+        snapshot.roster
     except Exception as e:
         print(f"❌ 명렬표 로드 실패: {e}")
         return
     
     for month in target_months:
-        year = TARGET_YEAR + 1 if month < 3 else TARGET_YEAR
+        year = snapshot.year_of(month)  # 스냅샷 학년도 기준 (1·2월은 다음 해)
         
-        # 데이터 로드
+        # 데이터 로드 (공유 스냅샷의 학생 x 날짜 행렬에서 이번 달 열만 사용)
+        _, last_day = calendar.monthrange(year, month)
         try:
-            raw_events = load_all_events(None, month, master_roster)
+            matrix = snapshot.matrix([month])
+            by_day = matrix.events_by_day(datetime.date(year, month, 1), datetime.date(year, month, last_day))
         except:
             print(f"⚠️ {month}월 데이터 로드 실패, 빈 달력 생성")
-            raw_events = []
+            by_day = {}
 
-        # 일별 데이터 정리
-        daily = {}
-        if raw_events:
-            for e in raw_events:
-                day = e['date'].day
-                if day not in daily: daily[day] = []
-                
-                # 표시 형식: "1 홍길동 : 질병결석"
-                daily[day].append(f"{e['num']} {e['name']} : {e['type']}")
-            
-            # 번호순 정렬
-            for d in daily:
-                daily[d].sort(key=lambda x: int(x.split()[0]) if x.split()[0].isdigit() else 0)
+        # 일별 데이터 정리 (행렬 조회 결과가 이미 번호순)
+        # 표시 형식: "1 홍길동 : 질병결석"
+        daily = {d.day: [f"{e['num']} {e['name']} : {e['type']}" for e in evs] for d, evs in by_day.items()}
         
         # 템플릿 데이터 생성
         calendar_weeks = build_calendar_data(year, month, daily)
@@ -10,13 +10,13 @@ if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
 # [Import] 데이터 로더 및 서비스
-from src.services.data_loader import load_all_events, get_master_roster, ACADEMIC_MONTHS
+from src.services.data_loader import AttendanceSnapshot
 from src.paths import REPORTS_DIR
+from src.services import compliance
 import src.services.universal_notification as bot
 
 # [Import] Utils (DateCalculator & TemplateManager)
 try:
-    from src.utils.date_calculator import DateCalculator
     from src.utils.template_manager import TemplateManager
     has_utils = True
 except ImportError:
@@ -27,66 +27,25 @@ except ImportError:
 OUTPUT_DIR = os.path.join(str(REPORTS_DIR), "stats")
 if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# [설정] 장기결석 기준값
-LIMITS = {
-    'l1': 30, 'l2': 40, 'l3': 45, 'l4': 50, # 누적일수 단계
-    'consecutive': 7                        # 연속결석 기준
-}
+# [설정] 장기결석 기준값 - 규정 엔진 기준값 (config.json "compliance"로 변경 가능)
+# l1~l4: 누적일수 단계 / consecutive: 연속결석 기준
+LIMITS = compliance.rule_limits('long_term')
 
 # Utils 인스턴스
-date_calc = DateCalculator(PROJECT_ROOT) if has_utils else None
 tmpl_mgr = TemplateManager(PROJECT_ROOT) if has_utils else None
 
 # =========================================================
 # 로직 함수 (Utils 활용)
 # =========================================================
 
-def check_is_connected(start, end):
-    """두 날짜 사이가 모두 휴일/주말이라서 연속된 것으로 볼 수 있는지 확인"""
-    delta = (end - start).days
-    if delta == 1: return True
-    if delta <= 0: return False
-
-    if date_calc:
-        current = start + datetime.timedelta(days=1)
-        while current < end:
-            if date_calc.is_school_day(current): return False
-            current += datetime.timedelta(days=1)
-        return True
-    else:
-        gap_days = [start + datetime.timedelta(days=x) for x in range(1, delta)]
-        return all(d.weekday() in [5, 6] for d in gap_days)
-
-def calculate_max_consecutive(dates):
-    """최대 연속 결석일수(Streak)와 구간 정보 계산"""
-    if not dates: return 0, []
-    dates = sorted(list(set(dates)))
-    long_periods = []
-    
-    streak_start = dates[0]
-    streak_end = dates[0]
-    streak_count = 1
-    max_streak = 1
-    
-    for i in range(1, len(dates)):
-        curr = dates[i-1]
-        nxt = dates[i]
-        
-        if check_is_connected(curr, nxt):
-            streak_end = nxt
-            streak_count += 1
-        else:
-            if streak_count >= LIMITS['consecutive']:
-                long_periods.append((streak_start, streak_end, streak_count))
-            max_streak = max(max_streak, streak_count)
-            streak_start = nxt
-            streak_end = nxt
-            streak_count = 1
-            
-    if streak_count >= LIMITS['consecutive']:
-        long_periods.append((streak_start, streak_end, streak_count))
-    max_streak = max(max_streak, streak_count)
-    
+def calculate_max_consecutive(streaks):
+    """
+    최대 연속 결석일수(Streak)와 기준 이상 구간 정보 계산
+    (streaks: 출결 행렬의 연속 구간 [(시작일, 종료일, 일수), ...] - 사이에 휴일/주말만 있으면 연속)
+    """
+    if not streaks: return 0, []
+    max_streak = max(days for _, _, days in streaks)
+    long_periods = [p for p in streaks if p[2] >= LIMITS['consecutive']]
     return max_streak, long_periods
 
 def get_status_info(count):
@@ -97,27 +56,24 @@ def get_status_info(count):
     elif count >= LIMITS['l1']: return "🟨 1차 독촉", "bg-yellow", 60
     else: return "정상", "bg-green", (count / LIMITS['l4']) * 100
 
-def analyze_long_term_absence(roster):
-    """데이터 분석 및 통계 생성"""
-    stats = {num: {'name': name, 'count': 0, 'details': [], 'raw_dates': []} for num, name in roster.items()}
+def analyze_long_term_absence(roster, snapshot=None):
+    """데이터 분석 및 통계 생성 (snapshot: 공유 AttendanceSnapshot, 없으면 새로 생성)"""
+    if snapshot is None: snapshot = AttendanceSnapshot(roster=roster)
     print("   📉 [분석] 장기결석 위험군 스캔 중...")
     
-    for month in ACADEMIC_MONTHS:
-        try:
-            events = load_all_events(None, month, roster)
-        except Exception: continue
-            
-        for e in events:
-            if e['num'] not in stats: continue
-            raw_type = e.get('raw_type', '')
-            
-            # [미인정 포함 로직] 결석 키워드 포함 & (인정결석이 아니거나, 미인정이면 포함)
-            if "결석" in raw_type:
-                is_pure_authorized = ("인정" in raw_type) and ("미인정" not in raw_type)
-                if not is_pure_authorized:
-                    stats[e['num']]['count'] += 1
-                    stats[e['num']]['details'].append(f"{e['date'].strftime('%m.%d')}({raw_type[:2]})")
-                    stats[e['num']]['raw_dates'].append(e['date'])
+    # 규정 평가 엔진 결과 (집계 대상: 결석 중 인정결석이 아닌 것 - 미인정 포함)
+    # 연속 구간은 학생 x 날짜 행렬의 마스크 + 등교일 누적합으로 한 번에 계산됨
+    students = snapshot.compliance()['students']['long_term']
+    stats = {}
+    for num in roster:
+        agg = students[num]
+        stats[num] = {
+            'name': agg['name'],
+            'count': agg['count'],
+            'details': [f"{e['date'].strftime('%m.%d')}({e.get('raw_type', '')[:2]})" for e in agg['events']],
+            'streaks': agg['streaks'],
+            'flags': agg['flags'],
+        }
     return stats
 
 def generate_report(stats):
@@ -132,15 +88,15 @@ def generate_report(stats):
     
     for num, data in sorted_stats:
         count = data['count']
-        max_cons, raw_periods = calculate_max_consecutive(data['raw_dates'])
-        is_long_streak = (max_cons >= LIMITS['consecutive'])
+        max_cons, raw_periods = calculate_max_consecutive(data['streaks'])
+        is_long_streak = 'streak' in data['flags']
         
         if count == 0 and not is_long_streak: continue
         
         msg, color_class, pct = get_status_info(count)
         
         # 알림 수집
-        if count >= LIMITS['l1']:
+        if 'count' in data['flags']:
             alerts.append(f"{data['name']}(누적 {count}일): {msg}")
             
         # 연속 결석 구간 포맷팅
@@ -182,10 +138,10 @@ def generate_report(stats):
         bot.send_alert(f"📉 [장기결석/연속결석 경고]\n" + "\n".join(alerts))
         print(f"   🔔 알림 전송 완료 ({len(alerts)}건)")
 
-def run_long_term_absence():
+def run_long_term_absence(snapshot=None):
     try:
-        roster = get_master_roster()
-        stats = analyze_long_term_absence(roster)
+        if snapshot is None: snapshot = AttendanceSnapshot()
+        stats = analyze_long_term_absence(snapshot.roster, snapshot)
         generate_report(stats)
     except Exception as e:
         print(f"❌ 장기결석 리포트 생성 중 오류 발생: {e}")
@@ -1,50 +1,41 @@
 import os
 import datetime
-from jinja2 import Environment, FileSystemLoader
-from src.services.data_loader import load_all_events, get_master_roster, ACADEMIC_MONTHS
+from src.services.data_loader import AttendanceSnapshot
 from src.paths import REPORTS_DIR, SRC_DIR
+from src.utils.template_manager import get_template_env, stream_to_file
+from src.services import compliance
 import src.services.universal_notification as bot
 
 OUTPUT_DIR = os.path.join(str(REPORTS_DIR), "stats")
 TEMPLATE_DIR = os.path.join(str(SRC_DIR), "templates")
 if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+env = get_template_env(TEMPLATE_DIR)  # 공유 환경 (bytecode 캐시)
 
-LIMIT_ABSENCE = 1
-LIMIT_SUB = 3
+# 규정 엔진 기준값 (config.json "compliance"로 변경 가능)
+LIMIT_ABSENCE = compliance.rule_limits('menstrual')['absence']
+LIMIT_SUB = compliance.rule_limits('menstrual')['sub']
 
-def analyze_menstrual_stats(roster):
-    # [1] 명렬표 기준 초기화 (모든 학생 포함)
-    raw_stats = {num: {m: {'abs': [], 'sub': []} for m in ACADEMIC_MONTHS} for num in roster}
+def analyze_menstrual_stats(roster, snapshot=None):
+    if snapshot is None: snapshot = AttendanceSnapshot(roster=roster)
     print("   🩸 [분석] 생리인정결석 데이터 스캔 중...")
-    
-    for month in ACADEMIC_MONTHS:
-        events = load_all_events(None, month, roster)
-        for e in events:
-            # [2] 명렬표에 없는 번호 무시 (유령 학생 제거)
-            if e['num'] not in raw_stats:
-                continue
-
-            if "생리" in e['raw_type'] or "생리" in e['reason']:
-                date_str = e['date'].strftime("%m.%d")
-                if "결석" in e['raw_type']:
-                    raw_stats[e['num']][month]['abs'].append(date_str)
-                elif any(x in e['raw_type'] for x in ["지각", "조퇴", "결과"]):
-                    raw_stats[e['num']][month]['sub'].append(date_str)
+    # [1] 규정 평가 엔진 결과 (명렬표 학생만, 월별 결석/기타 건수와 위반 판정 포함)
+    students = snapshot.compliance()['students']['menstrual']
     
     rows = []
     alerts = []
     
-    # [3] 명렬표 순서대로 리포트 행 생성
+    # [2] 명렬표 순서대로 리포트 행 생성
     for num in sorted(roster.keys()):
         name = roster[num]
         cells = []
         
-        for month in ACADEMIC_MONTHS:
-            data = raw_stats[num][month]
-            abs_cnt = len(data['abs'])
-            sub_cnt = len(data['sub'])
+        for month in snapshot.months:  # 규정 평가 결과는 스냅샷 월 기준
+            data = students[num]['months'][month]
+            abs_cnt = data['abs']
+            sub_cnt = data['sub']
+            abs_dates = [e['date'].strftime("%m.%d") for e in data['abs_events']]
+            sub_dates = [e['date'].strftime("%m.%d") for e in data['sub_events']]
             
             cell_class = ""
             content = ""
@@ -53,11 +44,12 @@ def analyze_menstrual_stats(roster):
             # 사용 내역이 있을 때만 내용 채움
             if abs_cnt > 0 or sub_cnt > 0:
                 tips = []
-                if abs_cnt: tips.append(f"결석: {', '.join(data['abs'])}")
-                if sub_cnt: tips.append(f"기타: {', '.join(data['sub'])}")
+                if abs_cnt: tips.append(f"결석: {', '.join(abs_dates)}")
+                if sub_cnt: tips.append(f"기타: {', '.join(sub_dates)}")
                 tooltip = " | ".join(tips)
                 
-                is_violation = (abs_cnt > 0 and sub_cnt > 0) or (abs_cnt > LIMIT_ABSENCE) or (sub_cnt > LIMIT_SUB)
+                # 결석+기타 혼용, 결석 LIMIT_ABSENCE 초과, 기타 LIMIT_SUB 초과 (엔진 판정)
+                is_violation = bool(data['flags'])
                 
                 if is_violation:
                     cell_class = "violation"
@@ -80,18 +72,13 @@ def analyze_menstrual_stats(roster):
         
     return rows, alerts
 
-def run_menstrual_stats():
-    roster = get_master_roster()
-    rows, alerts = analyze_menstrual_stats(roster)
+def run_menstrual_stats(snapshot=None):
+    if snapshot is None: snapshot = AttendanceSnapshot()
+    rows, alerts = analyze_menstrual_stats(snapshot.roster, snapshot)
     
     template = env.get_template("stats_menstrual.html")
-    html = template.render(
-        months=ACADEMIC_MONTHS,
-        rows=rows
-    )
-    
     out_file = os.path.join(OUTPUT_DIR, "생리인정결석_통계.html")
-    with open(out_file, "w", encoding="utf-8") as f: f.write(html)
+    stream_to_file(template, dict(months=snapshot.months, rows=rows), out_file)
     print(f"   ✅ 리포트 생성 완료: {out_file}")
 
     if alerts:
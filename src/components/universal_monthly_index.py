@@ -1,6 +1,5 @@
 import os
 import sys
-from jinja2 import Environment, FileSystemLoader
 
 # 프로젝트 경로 설정
 from src.services.data_loader import (
@@ -8,27 +7,30 @@ from src.services.data_loader import (
     TARGET_YEAR
 )
 from src.paths import REPORTS_DIR, SRC_DIR
+from src.utils.template_manager import get_template_env, stream_to_file
 
 # 템플릿 환경 설정
 TEMPLATE_DIR = os.path.join(SRC_DIR, "templates")
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+env = get_template_env(TEMPLATE_DIR)  # 공유 환경 (bytecode 캐시)
 
 REPORT_ROOT = str(REPORTS_DIR)
 INDEX_DIR = os.path.join(REPORT_ROOT, "index")
 if not os.path.exists(INDEX_DIR): os.makedirs(INDEX_DIR)
 
-def generate_monthly_index(month):
+def generate_monthly_index(month, year=None):
     """
     특정 월의 index.html을 생성합니다.
     Jinja2 템플릿을 사용하여 드롭다운 네비게이션이 포함된 HTML을 만듭니다.
+    year: 학년도 (생략 시 TARGET_YEAR)
     """
-    current_year = TARGET_YEAR + 1 if month < 3 else TARGET_YEAR
+    if year is None: year = TARGET_YEAR
+    current_year = year + 1 if month < 3 else year
     month_str = f"{month:02d}월"
     
     # 1. 네비게이션 옵션 데이터 생성 (모든 월에 대한 링크 정보)
     nav_options = []
     for m in ACADEMIC_MONTHS:
-        y = TARGET_YEAR + 1 if m < 3 else TARGET_YEAR
+        y = year + 1 if m < 3 else year
         # 같은 폴더(index/) 안에 있으므로 파일명만 적으면 됨
         nav_path = f"{m:02d}월_통합_인덱스.html"
         nav_options.append({
@@ -53,18 +55,15 @@ def generate_monthly_index(month):
     # 3. 템플릿 렌더링
     try:
         template = env.get_template("monthly_index_template.html")
-        html_content = template.render(
+        # 4. 파일 저장 (스트리밍 렌더링 + 원자적 교체)
+        output_path = os.path.join(INDEX_DIR, f"{month_str}_통합_인덱스.html")
+        stream_to_file(template, dict(
             year=current_year,
             month=month,
             month_str=month_str,
             nav_options=nav_options,
             links=links
-        )
-        
-        # 4. 파일 저장
-        output_path = os.path.join(INDEX_DIR, f"{month_str}_통합_인덱스.html")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        ), output_path)
             
         return output_path
         
@@ -72,9 +71,10 @@ def generate_monthly_index(month):
         print(f"❌ [Index] {month}월 인덱스 생성 실패: {e}")
         return None
 
-def run_monthly_index(target_months=None):
+def run_monthly_index(target_months=None, year=None):
     """
     지정된 월(또는 전체 학기)에 대해 인덱스 페이지를 일괄 갱신합니다.
+    year: 학년도 (생략 시 TARGET_YEAR, 빌드 파이프라인은 스냅샷 학년도를 넘김)
     """
     if target_months is None: 
         target_months = ACADEMIC_MONTHS
@@ -83,7 +83,7 @@ def run_monthly_index(target_months=None):
     
     count = 0
     for m in target_months:
-        if generate_monthly_index(m):
+        if generate_monthly_index(m, year):
             count += 1
             
     print(f"    ✅ 총 {count}개 월별 인덱스 페이지 생성 완료!")
@@ -1,17 +1,16 @@
 import os
 import datetime
 import calendar
-from jinja2 import Environment, FileSystemLoader
 
 # [설정] 필요한 상수 및 로더 import
 from src.services.data_loader import (
-    load_all_events, 
-    get_master_roster, 
-    ACADEMIC_MONTHS, 
-    HOLIDAYS_KR,
-    TARGET_YEAR
+    AttendanceSnapshot,
+    ACADEMIC_MONTHS
 )
+from src.utils.date_calculator import get_date_calculator
+from src.utils import event_classifier as ec
 from src.paths import REPORTS_DIR, SRC_DIR
+from src.utils.template_manager import get_template_env, stream_to_file
 
 # [경로] monthly 폴더 사용
 OUTPUT_DIR = os.path.join(str(REPORTS_DIR), "monthly")
@@ -21,17 +20,22 @@ if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR, exist_ok=True)
 TEMPLATE_DIR = os.path.join(str(SRC_DIR), "templates")
 if not os.path.exists(TEMPLATE_DIR): os.makedirs(TEMPLATE_DIR, exist_ok=True)
 
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+env = get_template_env(TEMPLATE_DIR)  # 공유 환경 (bytecode 캐시)
+
+# 분류 코드(kind) -> 학급 통계표 열 키
+KIND_KEYS = {ec.KIND_ABSENCE: 'abs', ec.KIND_LATE: 'lat', ec.KIND_EARLY: 'ear', ec.KIND_RESULT: 'res'}
 
 def calculate_school_days(year, month):
     s = datetime.date(year, month, 1)
     if month == 12: e = datetime.date(year + 1, 1, 1) - datetime.timedelta(days=1)
     else: e = datetime.date(year, month + 1, 1) - datetime.timedelta(days=1)
     
+    # 공용 학년도 캘린더(비트맵)로 등교일 판정
+    date_calc = get_date_calculator()
     days = []
     curr = s
     while curr <= e:
-        if curr.weekday() < 5 and curr not in HOLIDAYS_KR:
+        if date_calc.is_school_day(curr):
             days.append(curr)
         curr += datetime.timedelta(days=1)
     
@@ -41,7 +45,8 @@ def calculate_school_days(year, month):
 # 1. 월별 세부 리포트 (monthly_detail.html)
 # =========================================================
 def create_monthly_html(events, master_roster, school_days, month, year, output_path):
-    if events: events.sort(key=lambda x: (x['date'], x['num']))
+    # 공유 스냅샷의 리스트이므로 제자리 정렬 대신 복사본을 정렬
+    events = sorted(events or [], key=lambda x: (x['date'], x['num']))
     
     processed_events = []
     for e in events:
@@ -50,7 +55,7 @@ def create_monthly_html(events, master_roster, school_days, month, year, output_
             continue
             
         # 인정 결석 등은 세부 리포트에는 표시하되, 필수 확인 대상(is_req)에서는 제외할 수도 있음
-        is_req = ("결석" in e['raw_type'] or "인정" in e['raw_type']) and not e['is_unexcused']
+        is_req = (e['kind'] == ec.KIND_ABSENCE or e['excuse'] == ec.EXCUSE_AUTHORIZED) and e['excuse'] != ec.EXCUSE_UNEXCUSED
         processed_events.append({
             'is_req': is_req,
             'date_str': e['date'].strftime("%Y.%m.%d"),
@@ -62,9 +67,7 @@ def create_monthly_html(events, master_roster, school_days, month, year, output_
         })
 
     template = env.get_template("monthly_detail.html")
-    html = template.render(year=year, month=f"{month:02d}", events=processed_events)
-    
-    with open(output_path, "w", encoding="utf-8") as f: f.write(html)
+    stream_to_file(template, dict(year=year, month=f"{month:02d}", events=processed_events), output_path)
 
 # =========================================================
 # 2. 학급별 통계 리포트 (monthly_class.html)
@@ -88,20 +91,9 @@ def create_class_html(events, master_roster, school_days, month, year, output_pa
             if e['num'] not in stats: 
                 continue
             
-            t = e['raw_type']
-            
-            # 카테고리 분류 (질병=0, 미인정=1, 기타=2, 인정=3)
-            cat = 0 
-            if e['is_unexcused']: cat = 1     # 미인정
-            elif "인정" in t: cat = 3         # 인정
-            elif "기타" in t: cat = 2         # 기타
-            else: cat = 0                     # 질병 (기본값)
-            
-            k = None
-            if "결석" in t: k = 'abs'
-            elif "지각" in t: k = 'lat'
-            elif "조퇴" in t: k = 'ear'
-            elif "결과" in t: k = 'res'
+            # 카테고리 분류 (질병=0, 미인정=1, 기타=2, 인정=3) - 수집 시 계산된 코드 사용
+            cat = ec.class_column(e['excuse'])
+            k = KIND_KEYS.get(e['kind'])
             
             if k:
                 stats[e['num']][k][cat].append(e['date'].strftime("%m.%d"))
@@ -165,20 +157,19 @@ def create_class_html(events, master_roster, school_days, month, year, output_pa
     period_str = f"{year}.{month:02d}.01. - {year}.{month:02d}.{last_day}."
 
     template = env.get_template("monthly_class.html")
-    html = template.render(period_str=period_str, rows=rows, month=month)
-    
-    with open(output_path, "w", encoding="utf-8") as f: f.write(html)
+    stream_to_file(template, dict(period_str=period_str, rows=rows, month=month), output_path)
 
-def run_monthly_reports(target_months=None):
+def run_monthly_reports(target_months=None, snapshot=None):
     if not target_months: target_months = ACADEMIC_MONTHS
     print(f"=== [1-2] 월별/학급별 리포트 생성 (Jinja2) ===")
     
-    roster = get_master_roster()
+    if snapshot is None: snapshot = AttendanceSnapshot()
+    roster = snapshot.roster
     
     for month in target_months:
-        year = TARGET_YEAR + 1 if month < 3 else TARGET_YEAR
+        year = snapshot.year_of(month)  # 스냅샷 학년도 기준 (1·2월은 다음 해)
         
-        events = load_all_events(None, month, roster)
+        events = snapshot.get_events(month)
         days = calculate_school_days(year, month)
         
         out_detail = os.path.join(OUTPUT_DIR, f"{month:02d}월_월별출결현황.html")
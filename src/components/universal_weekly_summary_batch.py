@@ -1,79 +1,125 @@
-import pandas as pd
 import datetime
+import calendar
 import os
 
 # [수정] 필요한 것들을 직접 import
 from src.services.data_loader import (
-    load_all_events, 
-    get_master_roster, 
-    TARGET_YEAR, 
+    AttendanceSnapshot,
     ACADEMIC_MONTHS
 )
 from src.paths import REPORTS_DIR
+from src.utils.template_manager import TemplateManager
 
 OUTPUT_DIR = os.path.join(str(REPORTS_DIR), "weekly")
 if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR)
 
-# ... (이후 코드 그대로)
+tmpl_mgr = TemplateManager()
 
-def create_weekly_html(month, year, student_data, output_path):
-    import calendar
+# 학기 구분 (학기별 주간 요약 파일)
+SEMESTERS = {
+    '1학기': [3, 4, 5, 6, 7, 8],
+    '2학기': [9, 10, 11, 12, 1, 2],
+}
+
+# =========================================================
+# 주간 요약 데이터 (학생 x 주 버킷을 행렬에서 한 번에 생성)
+# =========================================================
+def build_weekly_rows(roster, matrix, start, end, multi_month=False):
+    """
+    start ~ end 기간을 주 단위로 나눈 표 데이터.
+    Returns: (주 목록 [(시작, 끝)], 행 목록 [{'num', 'name', 'cells': [[{'label', 'type'}]]}])
+    """
+    weeks, buckets = matrix.week_buckets(start, end)
+    rows = []
+    for num in sorted(roster.keys()):
+        by_week = buckets.get(num, {})
+        cells = []
+        for w in range(len(weeks)):
+            cells.append([
+                {'label': f"{e['date'].month}/{e['date'].day}" if multi_month else f"{e['date'].day}일", 'type': e['type']}
+                for e in by_week.get(w, [])
+            ])
+        rows.append({'num': num, 'name': roster[num], 'cells': cells})
+    return weeks, rows
+
+def _week_label(s, e):
+    return f"{s.month}/{s.day}~{e.month}/{e.day}"
+
+def _month_groups(weeks, start, end):
+    """다월 보기 상단 머리글: 주를 월별로 묶음 (월이 걸친 주는 수요일이 속한 월 = 더 많은 날이 속한 월)"""
+    groups = []
+    for s, _ in weeks:
+        ref = min(max(s + datetime.timedelta(days=3), start), end)  # 기간 밖의 월은 머리글에 넣지 않음
+        label = f"{ref.year}년 {ref.month}월"
+        if groups and groups[-1]['label'] == label: groups[-1]['span'] += 1
+        else: groups.append({'label': label, 'span': 1})
+    return groups
+
+def create_weekly_html(month, year, roster, matrix, output_path):
+    """roster: {번호: 이름}, matrix: 이번 달이 채워진 AttendanceMatrix"""
     _, last = calendar.monthrange(year, month)
     start = datetime.date(year, month, 1)
     end = datetime.date(year, month, last)
-    
-    weeks = []
-    curr = start
-    while curr.weekday() != 6: curr -= datetime.timedelta(days=1)
-    while curr <= end:
-        weeks.append((curr, curr + datetime.timedelta(days=6))); curr += datetime.timedelta(days=7)
-        
-    html = f"""<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><style>
-        body {{ font-family: 'Malgun Gothic'; }}
-        table {{ width: 100%; border-collapse: collapse; font-size: 10pt; table-layout: fixed; }}
-        th, td {{ border: 1px solid #999; padding: 5px; vertical-align: top; word-wrap: break-word; }}
-        th {{ background: #eee; height: 30px; }}
-        .col-num {{ width: 40px; background: #f0f0f0; text-align: center; }}
-        .col-name {{ width: 60px; background: #f0f0f0; text-align: center; font-weight: bold; }}
-    </style></head><body><h2>{year}년 {month}월 주간 요약</h2><table><thead><tr><th class="col-num">번호</th><th class="col-name">이름</th>"""
-    
-    for s, e in weeks: html += f"<th>{s.month}/{s.day}~{e.month}/{e.day}</th>"
-    html += "</tr></thead><tbody>"
-    
-    for num in sorted(student_data.keys()):
-        s = student_data[num]
-        html += f"<tr><td class='col-num'>{num}</td><td class='col-name'>{s['name']}</td>"
-        for w_s, w_e in weeks:
-            cell = ""
-            matched = [e for e in s['events'] if w_s <= e['date'] <= w_e]
-            matched.sort(key=lambda x: x['date'])
-            for e in matched:
-                cell += f"[{e['date'].day}일] {e['type']}<br>"
-            html += f"<td>{cell}</td>"
-        html += "</tr>"
-    html += "</table></body></html>"
-    with open(output_path, "w", encoding="utf-8") as f: f.write(html)
+
+    weeks, rows = build_weekly_rows(roster, matrix, start, end)
+    context = {
+        'title': f"{year}년 {month}월 주간 요약",
+        'weeks': [_week_label(s, e) for s, e in weeks],
+        'month_groups': None,
+        'rows': rows,
+    }
+    return tmpl_mgr.render_and_save("weekly_summary.html", context, output_path)
+
+def create_range_weekly_html(title, start, end, roster, matrix, output_path):
+    """여러 달(학기 등)에 걸친 주간 요약 - 월 머리글 포함"""
+    weeks, rows = build_weekly_rows(roster, matrix, start, end, multi_month=True)
+    context = {
+        'title': title,
+        'weeks': [_week_label(s, e) for s, e in weeks],
+        'month_groups': _month_groups(weeks, start, end),
+        'rows': rows,
+    }
+    return tmpl_mgr.render_and_save("weekly_summary.html", context, output_path)
 
 # [수정] 외부 호출 가능 함수
-def run_weekly(target_months=None):
-        
+def run_weekly(target_months=None, snapshot=None):
+
     if target_months is None: target_months = ACADEMIC_MONTHS
 
     print(f"=== 주간 요약 생성 (대상: {target_months}) ===")
-    roster = get_master_roster()
-    
+    if snapshot is None: snapshot = AttendanceSnapshot()
+    roster = snapshot.roster
+
+    # 날짜/주 계산은 스냅샷의 학년도 기준 (이전 학년도 스냅샷도 같은 방식으로 생성)
     for month in target_months:
-        year = TARGET_YEAR + 1 if month < 3 else TARGET_YEAR
-        
-        events = load_all_events(None, month, roster)
-        data = {n: {'name': name, 'events': []} for n, name in roster.items()}
-        if events:
-            for e in events:
-                if e['num'] in data: data[e['num']]['events'].append(e)
-        
+        year = snapshot.year_of(month)
+
+        matrix = snapshot.matrix([month])
+
         out = os.path.join(OUTPUT_DIR, f"{month:02d}월_주간요약.html")
-        create_weekly_html(month, year, data, out)
+        create_weekly_html(month, year, roster, matrix, out)
         print(f"   -> {year}년 {month}월 완료")
 
+def run_weekly_semesters(snapshot=None, semesters=None):
+    """학기별(여러 달) 주간 요약 - 학년도 행렬 하나에서 주 버킷을 한 번에 생성"""
+    if semesters is None: semesters = list(SEMESTERS)
+
+    print(f"=== 학기별 주간 요약 생성 ({', '.join(semesters)}) ===")
+    if snapshot is None: snapshot = AttendanceSnapshot()
+    roster = snapshot.roster
+
+    for name in semesters:
+        months = SEMESTERS[name]
+        matrix = snapshot.matrix(months)
+        first, last = months[0], months[-1]
+        start = datetime.date(snapshot.year_of(first), first, 1)
+        end_year = snapshot.year_of(last)
+        end = datetime.date(end_year, last, calendar.monthrange(end_year, last)[1])
+
+        out = os.path.join(OUTPUT_DIR, f"{name}_주간요약.html")
+        title = f"{snapshot.year}학년도 {name} 주간 요약 ({first}월~{last}월)"
+        create_range_weekly_html(title, start, end, roster, matrix, out)
+        print(f"   -> {snapshot.year}학년도 {name} 완료")
+
 if __name__ == "__main__":
-    run_weekly()
\ No newline at end of file
+    run_weekly()
@@ -0,0 +1,154 @@
+import datetime
+
+import numpy as np
+
+from src.utils.date_calculator import get_date_calculator
+from src.utils.run_length import connected_runs
+
+# =============================================================================
+# [출결 행렬] 학생 x 학년도 날짜(3/1 ~ 다음 해 2월 말) uint8 상태 코드 행렬
+# - 칸 값: 0 = 기록 없음, 그 외 = PRESENT | (kind << 3) | excuse (분류 코드는 event_classifier)
+# - 시간/사유 등 원본은 곁 테이블(side)에 (행, 날짜 인덱스) -> 이벤트 리스트로 보관
+# - 한 칸에 이벤트가 여러 개면(같은 번호가 두 행 등) 코드는 첫 이벤트, 전체는 side에 있음
+# - 주간/달력/연속결석 계산은 이 행렬의 슬라이스와 누적합으로 처리합니다. (주간 요약: week_buckets)
+# =============================================================================
+PRESENT = 0x80
+
+def status_code(kind, excuse):
+    return PRESENT | (kind << 3) | excuse
+
+def kind_of(codes):
+    return (codes >> 3) & 0x07
+
+def excuse_of(codes):
+    return codes & 0x07
+
+class AttendanceMatrix:
+    def __init__(self, academic_year, nums=()):
+        self.year = academic_year
+        cal = get_date_calculator().academic_calendar(academic_year)
+        self.start = cal.start
+        self.n_days = len(cal.bitmap)
+        self.school = cal.bitmap        # 등교일 여부 (날짜 인덱스)
+        self.cum = cal.cum              # cum[i]: 0 ~ i-1일의 등교일 수
+
+        self.nums = []
+        self.row_of = {}
+        self.codes = np.zeros((0, self.n_days), dtype=np.uint8)
+        self.side = {}                  # (행, 날짜 인덱스) -> 이벤트 리스트
+        self._multi = set()             # 이벤트가 2개 이상인 칸
+        self.months = set()
+        for num in nums: self._row(num)
+
+    # -------------------------------------------------------------------------
+    # 채우기
+    # -------------------------------------------------------------------------
+    def _row(self, num):
+        r = self.row_of.get(num)
+        if r is None:
+            r = len(self.nums)
+            self.nums.append(num)
+            self.row_of[num] = r
+            if r >= len(self.codes):
+                grown = np.zeros((max(8, 2 * len(self.codes)), self.n_days), dtype=np.uint8)
+                grown[:len(self.codes)] = self.codes
+                self.codes = grown
+        return r
+
+    def add_month(self, month, events):
+        """월 이벤트를 행렬에 반영 (월마다 한 번만)"""
+        if month in self.months: return
+        self.months.add(month)
+        for e in events:
+            d = self.day(e['date'])
+            if not 0 <= d < self.n_days: continue
+            r = self._row(e['num'])
+            cell = self.side.setdefault((r, d), [])
+            cell.append(e)
+            if len(cell) == 1:
+                self.codes[r, d] = status_code(e['kind'], e['excuse'])
+            else:
+                self._multi.add((r, d))
+
+    # -------------------------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------------------------
+    def day(self, date_obj):
+        return (date_obj - self.start).days
+
+    def date_of(self, idx):
+        return self.start + datetime.timedelta(days=int(idx))
+
+    def grid(self):
+        """실제 학생 행만 (행 순서 = self.nums)"""
+        return self.codes[:len(self.nums)]
+
+    def events_between(self, num, start, end):
+        """한 학생의 start ~ end(포함) 이벤트를 날짜순으로"""
+        r = self.row_of.get(num)
+        if r is None: return []
+        lo, hi = max(self.day(start), 0), min(self.day(end), self.n_days - 1)
+        if lo > hi: return []
+        result = []
+        for d in (lo + np.flatnonzero(self.codes[r, lo:hi + 1])).tolist():
+            result.extend(self.side[(r, d)])
+        return result
+
+    def events_by_day(self, start, end):
+        """start ~ end(포함) 날짜별 이벤트 {날짜: [번호순 이벤트]}"""
+        lo, hi = max(self.day(start), 0), min(self.day(end), self.n_days - 1)
+        if lo > hi or not self.nums: return {}
+        order = np.argsort(np.asarray(self.nums), kind="stable")
+        block = self.grid()[order, lo:hi + 1]
+        by_day = {}
+        for d in np.flatnonzero(block.any(axis=0)).tolist():
+            rows = order[np.flatnonzero(block[:, d])].tolist()
+            by_day[self.date_of(lo + d)] = [e for r in rows for e in self.side[(r, lo + d)]]
+        return by_day
+
+    def week_buckets(self, start, end):
+        """
+        start ~ end(포함)를 일요일 시작 주 단위로 나누고, 이벤트를 (번호, 주) 버킷에 한 번에 분배
+        Returns: (주 목록 [(주 시작일, 주 마지막일)], {번호: {주 번호: [날짜순 이벤트]}})
+        """
+        first = start - datetime.timedelta(days=(start.weekday() + 1) % 7)  # 그 주 일요일
+        weeks = []
+        cur = first
+        while cur <= end:
+            weeks.append((cur, cur + datetime.timedelta(days=6)))
+            cur += datetime.timedelta(days=7)
+
+        buckets = {}
+        lo, hi = max(self.day(start), 0), min(self.day(end), self.n_days - 1)
+        if lo > hi or not self.nums: return weeks, buckets
+        rows, days = np.nonzero(self.grid()[:, lo:hi + 1])  # 행 우선 -> 학생별로 날짜순
+        week_idx = (days + (lo - self.day(first))) // 7
+        for r, d, w in zip(rows.tolist(), days.tolist(), week_idx.tolist()):
+            buckets.setdefault(self.nums[r], {}).setdefault(w, []).extend(self.side[(r, lo + d)])
+        return weeks, buckets
+
+    def mask(self, predicate):
+        """
+        predicate(kind 배열, excuse 배열) -> bool 배열 을 모든 칸에 적용한 행렬.
+        이벤트가 여러 개인 칸은 그중 하나라도 맞으면 True.
+        """
+        grid = self.grid()
+        result = (grid != 0) & predicate(kind_of(grid), excuse_of(grid))
+        for r, d in self._multi:
+            kinds = np.array([e['kind'] for e in self.side[(r, d)]])
+            excuses = np.array([e['excuse'] for e in self.side[(r, d)]])
+            result[r, d] = bool(np.any(predicate(kinds, excuses)))
+        return result
+
+    def streaks(self, mask):
+        """
+        표시된 날짜들을 학생별로 '사이에 등교일이 없으면 연속'으로 묶은 구간 (모든 학생을 한 번에 계산)
+        Returns: {번호: [(시작일, 종료일, 표시된 날 수), ...]}
+        """
+        rows, days = np.nonzero(mask)  # 행 우선 -> 학생별로 날짜순
+        firsts, lasts = connected_runs(rows, days, days, self.cum)
+        result = {}
+        for f, l in zip(firsts.tolist(), lasts.tolist()):
+            num = self.nums[rows[f]]
+            result.setdefault(num, []).append((self.date_of(days[f]), self.date_of(days[l]), l - f + 1))
+        return result
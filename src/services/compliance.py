@@ -0,0 +1,210 @@
+import operator
+
+import numpy as np
+
+from src.utils import event_classifier as ec
+from src.utils.date_calculator import get_date_calculator
+
+try:
+    from src.services.config_manager import GLOBAL_CONFIG
+except ImportError:
+    GLOBAL_CONFIG = {}
+
+# =============================================================================
+# [규정 평가 엔진] 체험학습/생리인정/장기결석 규정을 학년도 이벤트 1회 스캔으로 함께 평가
+# - 규정은 아래 RULES에 데이터로 선언합니다. (대상 조건, 분할, 집계 방식, 기준값, 위반 조건)
+# - 기준값은 config.json의 "compliance": {"규정 id": {"기준 이름": 값}}으로 덮어쓸 수 있습니다.
+# - 결과: 규정별 학생 집계(aggregates) + 위반 목록(violations) -> 각 리포트는 이 결과로 렌더링
+#
+# 조건 형식: (필드 또는 지표, 연산자, 값) - 값이 문자열이면 기준값(limits) 이름
+# 위반 조건 'when': [[조건, 조건], [조건]] -> 안쪽은 모두 만족(AND), 바깥은 하나라도(OR)
+# =============================================================================
+RULES = [
+    {
+        'id': 'fieldtrip',
+        'title': '교외체험학습',
+        'where': [('trip', '!=', ec.TRIP_NONE)],
+        'roster_only': False,   # 명렬표에 없는 번호도 집계
+        'splits': {
+            'dom': [('trip', '==', ec.TRIP_DOMESTIC)],
+            'int': [('trip', '==', ec.TRIP_INTERNATIONAL)],
+        },
+        'measure': 'groups',    # 연속 구간으로 묶어 실제 수업일수 합계/최대
+        'limits': {'dom_total': 10, 'dom_cons': 5, 'intl_total': 10},
+        'checks': [
+            {'id': 'dom_total', 'when': [[('dom_total', '>', 'dom_total')]]},
+            {'id': 'intl_total', 'when': [[('int_total', '>', 'intl_total')]]},
+            {'id': 'dom_cons', 'when': [[('dom_max', '>', 'dom_cons')]]},
+        ],
+    },
+    {
+        'id': 'menstrual',
+        'title': '생리인정결석',
+        'where': [('is_menstrual', '==', True)],
+        'roster_only': True,
+        'splits': {
+            'abs': [('kind', '==', ec.KIND_ABSENCE)],
+            'sub': [('kind', 'in', ec.PARTIAL_KINDS)],
+        },
+        'measure': 'monthly',   # 월별 건수 (위반 조건도 월 단위로 평가)
+        'limits': {'absence': 1, 'sub': 3},
+        'checks': [
+            {'id': 'monthly', 'when': [[('abs', '>', 0), ('sub', '>', 0)], [('abs', '>', 'absence')], [('sub', '>', 'sub')]]},
+        ],
+    },
+    {
+        'id': 'long_term',
+        'title': '장기결석',
+        'where': [('kind', '==', ec.KIND_ABSENCE), ('excuse', '!=', ec.EXCUSE_AUTHORIZED)],
+        'roster_only': True,
+        'measure': 'streaks',   # 누적 건수 + 연속 결석 구간 (사이에 등교일이 없으면 연속)
+        'limits': {'l1': 30, 'l2': 40, 'l3': 45, 'l4': 50, 'consecutive': 7},
+        'checks': [
+            {'id': 'count', 'when': [[('count', '>=', 'l1')]]},
+            {'id': 'streak', 'when': [[('max_streak', '>=', 'consecutive')]]},
+        ],
+    },
+]
+
+_OPS = {
+    '==': operator.eq, '!=': operator.ne,
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+    'in': lambda a, b: np.isin(a, b) if isinstance(a, np.ndarray) else a in b,
+}
+
+def rule_by_id(rule_id):
+    return next(r for r in RULES if r['id'] == rule_id)
+
+def rule_limits(rule):
+    """기본 기준값 + config.json 'compliance' 덮어쓰기 (rule: 규정 딕셔너리 또는 id)"""
+    if isinstance(rule, str): rule = rule_by_id(rule)
+    limits = dict(rule['limits'])
+    limits.update(GLOBAL_CONFIG.get("compliance", {}).get(rule['id'], {}))
+    return limits
+
+def matches(record, conditions, limits=None):
+    """조건 목록을 모두 만족하는지 (이벤트 또는 집계 지표에 사용)"""
+    for field, op, value in conditions:
+        if isinstance(value, str) and limits is not None: value = limits[value]
+        if not _OPS[op](record[field], value): return False
+    return True
+
+def _fired(checks, metrics, limits):
+    return [c['id'] for c in checks if any(matches(metrics, conds, limits) for conds in c['when'])]
+
+def _code_predicate(conditions):
+    """where 조건 -> 출결 행렬 코드 배열용 판정 함수 (kind/excuse 조건만 사용)"""
+    def predicate(kinds, excuses):
+        arrays = {'kind': kinds, 'excuse': excuses}
+        result = np.ones(kinds.shape, dtype=bool)
+        for field, op, value in conditions:
+            result &= _OPS[op](arrays[field], value)
+        return result
+    return predicate
+
+# =============================================================================
+# 평가
+# =============================================================================
+def evaluate(snapshot, rules=None, months=None):
+    """
+    스냅샷의 학년도 이벤트를 한 번 훑으면서 모든 규정의 대상 이벤트를 모으고, 규정별로 집계/위반 판정.
+    Returns: {'limits': {id: 기준값}, 'students': {id: {번호: 집계}}, 'violations': {id: [위반]}}
+    """
+    rules = rules or RULES
+    months = list(months or snapshot.months)
+    roster = snapshot.roster
+    limits = {r['id']: rule_limits(r) for r in rules}
+
+    # 1. 규정별 학생 버킷 초기화 (명렬표 순서)
+    buckets = {}
+    for r in rules:
+        splits = list(r.get('splits', {'all': []}))
+        buckets[r['id']] = {num: {'name': name, 'months': {m: {s: [] for s in splits} for m in months}}
+                            for num, name in roster.items()}
+
+    # 2. 단일 스캔: 이벤트마다 모든 규정의 대상 조건을 확인해 분할 버킷에 넣음
+    for month in months:
+        try:
+            events = snapshot.get_events(month)
+        except Exception: continue
+        for e in events:
+            for r in rules:
+                if not matches(e, r['where']): continue
+                students = buckets[r['id']]
+                if e['num'] not in students:
+                    if r.get('roster_only'): continue
+                    students[e['num']] = {'name': e['name'], 'months': {m: {s: [] for s in r.get('splits', {'all': []})} for m in months}}
+                for split, conds in r.get('splits', {'all': []}).items():
+                    if matches(e, conds):
+                        students[e['num']]['months'][month][split].append(e)
+                        break
+
+    # 3. 규정별 집계 + 위반 판정
+    result = {'limits': limits, 'students': {}, 'violations': {}}
+    for r in rules:
+        measure = _MEASURES[r['measure']]
+        students, violations = measure(r, buckets[r['id']], limits[r['id']], months, snapshot)
+        result['students'][r['id']] = students
+        result['violations'][r['id']] = violations
+    return result
+
+def _measure_groups(rule, students, limits, months, snapshot):
+    splits = list(rule.get('splits', {'all': []}))
+    date_calc = get_date_calculator()
+
+    # 분할별로 전체 학생을 한 번에 그룹화 (번호+이름 단위로 분리)
+    groups = {num: {s: [] for s in splits} for num in students}
+    for s in splits:
+        events = [e for st in students.values() for m in months for e in st['months'][m][s]]
+        for g in date_calc.group_consecutive_events(events, by=('num', 'name')):
+            groups[g['num']][s].append(g)
+
+    aggregates, violations = {}, []
+    for num in sorted(students):
+        agg = {'name': students[num]['name']}
+        for s in splits:
+            agg[f'{s}_groups'] = groups[num][s]
+            agg[f'{s}_total'] = sum(g.get('real_days', 1) for g in groups[num][s])
+            agg[f'{s}_max'] = max((g.get('real_days', (g['end'] - g['start']).days + 1) for g in groups[num][s]), default=0)
+        agg['flags'] = _fired(rule['checks'], agg, limits)
+        violations.extend({'num': num, 'name': agg['name'], 'check': c} for c in agg['flags'])
+        aggregates[num] = agg
+    return aggregates, violations
+
+def _measure_monthly(rule, students, limits, months, snapshot):
+    splits = list(rule.get('splits', {'all': []}))
+    aggregates, violations = {}, []
+    for num in sorted(students):
+        st = students[num]
+        agg = {'name': st['name'], 'months': {}}
+        for m in months:
+            cell = {s: len(st['months'][m][s]) for s in splits}
+            cell.update({f'{s}_events': st['months'][m][s] for s in splits})
+            cell['flags'] = _fired(rule['checks'], cell, limits)
+            violations.extend({'num': num, 'name': st['name'], 'month': m, 'check': c} for c in cell['flags'])
+            agg['months'][m] = cell
+        aggregates[num] = agg
+    return aggregates, violations
+
+def _measure_streaks(rule, students, limits, months, snapshot):
+    # 연속 구간은 학생 x 날짜 행렬에서 모든 학생을 한 번에 계산
+    matrix = snapshot.matrix(months)
+    streaks = matrix.streaks(matrix.mask(_code_predicate(rule['where'])))
+
+    aggregates, violations = {}, []
+    for num, st in students.items():  # 명렬표 순서 유지
+        events = [e for m in months for split in st['months'][m].values() for e in split]
+        runs = streaks.get(num, [])
+        agg = {
+            'name': st['name'],
+            'events': events,
+            'count': len(events),
+            'streaks': runs,
+            'max_streak': max((d for _, _, d in runs), default=0),
+        }
+        agg['flags'] = _fired(rule['checks'], agg, limits)
+        violations.extend({'num': num, 'name': st['name'], 'check': c} for c in agg['flags'])
+        aggregates[num] = agg
+    return aggregates, violations
+
+_MEASURES = {'groups': _measure_groups, 'monthly': _measure_monthly, 'streaks': _measure_streaks}
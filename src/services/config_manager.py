@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 import datetime
 
+from src.utils.date_calculator import HOLIDAY_STORE
+
 # 프로젝트 루트 경로 (data_loader.py와 동일한 방식으로 계산)
 # 이 파일 위치: src/services/config_manager.py
 # 루트 위치: ../../
@@ -60,25 +62,25 @@ def load_config():
         # 매핑도 없고 단일 URL도 없으면 경고
         print(f"⚠️ [Config] {target_year}년도 시트 URL을 찾을 수 없습니다.")
 
-    holiday_file = BASE_DIR / f"holidays_{target_year}.json"
+    # 휴일 파일은 공용 HOLIDAY_STORE가 한 번만 읽어 보관 (DateCalculator와 공유)
+    holiday_file = HOLIDAY_STORE.get_path(int(target_year)) if str(target_year).isdigit() else None
 
-    if holiday_file.exists():
+    if holiday_file is not None:
         try:
-            with open(holiday_file, 'r', encoding='utf-8') as f:
-                holiday_data = json.load(f)
-                
-                # 기존 로직과의 호환성을 위해 리스트와 딕셔너리 모두 제공
-                # (1) 날짜 리스트 (기존 data_loader 호환)
-                config['holidays'] = list(holiday_data.keys())
-                
-                # (2) 상세 정보 (날짜: 이름)
-                config['holiday_details'] = holiday_data
+            holiday_data = dict(HOLIDAY_STORE.get_details(int(target_year)))
+            
+            # 기존 로직과의 호환성을 위해 리스트와 딕셔너리 모두 제공
+            # (1) 날짜 리스트 (기존 data_loader 호환)
+            config['holidays'] = list(holiday_data.keys())
+            
+            # (2) 상세 정보 (날짜: 이름)
+            config['holiday_details'] = holiday_data
                 
             print(f"✅ [Config] {target_year}년도 휴일 데이터 로드 완료 ({len(config['holidays'])}일)")
         except Exception as e:
             print(f"⚠️ [Config] 휴일 파일 로드 실패: {e}")
     else:
-        print(f"ℹ️ [Config] 휴일 파일이 없습니다: {holiday_file.name}")
+        print(f"ℹ️ [Config] 휴일 파일이 없습니다: holidays_{target_year}.json")
 
     return config
 
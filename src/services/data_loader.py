@@ -1,12 +1,16 @@
 import gspread
+from gspread.utils import rowcol_to_a1
 from oauth2client.service_account import ServiceAccountCredentials
 import pandas as pd
+import numpy as np
 import datetime
 import os
 import time
 import pickle
 import json
 import re
+import hashlib
+import threading
 from pathlib import Path
 
 # [나침반] 경로 설정
@@ -18,9 +22,20 @@ from src.paths import (
     ensure_directories
 )
 
+# [이벤트 저장소] 월별 이벤트는 컬럼형(Arrow) 저장소에 보관
+from src.services import event_store
+from src.services.attendance_matrix import AttendanceMatrix
+from src.services import compliance
+from src.services import sync_delta
+from src.services import event_log
+from src.utils.state_manager import StateManager
+from src.utils.single_flight import SingleFlight
+from src.utils.lru_cache import LRUCache
+from src.utils.event_classifier import classify_events, CLASS_FIELDS
+
 # ✅ [Refactor] Utils 모듈 임포트 (추가됨)
 try:
-    from src.utils.date_calculator import DateCalculator
+    from src.utils.date_calculator import DateCalculator, get_date_calculator
 except ImportError:
     print("⚠️ [DataLoader] DateCalculator를 임포트할 수 없습니다. 경로를 확인하세요.")
 
@@ -52,6 +67,32 @@ ACADEMIC_MONTHS = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 1, 2]
 # [싱글톤] 구글 연결 객체 재사용
 _SHEET_CLIENT = None
 _DOC_INSTANCE = None
+_DOC_INSTANCES = {}  # 시트 URL -> 문서 (학년도별 시트)
+
+# =============================================================================
+# [캐시 네임스페이스] 학년도 + 스프레드시트 ID 별로 캐시를 분리
+# - 여러 학년도(진급 전후, 연도 비교)를 덮어쓰지 않고 동시에 보관합니다.
+# - year 인자를 생략하면 현재 설정(TARGET_YEAR)을 사용합니다.
+# =============================================================================
+def _resolve_year(year=None):
+    return TARGET_YEAR if year is None else int(year)
+
+def sheet_url_for(year=None):
+    """학년도별 시트 URL (config의 "spreadsheets" 매핑 우선, 없으면 현재 설정 URL)"""
+    url = GLOBAL_CONFIG.get("spreadsheets", {}).get(str(_resolve_year(year)))
+    return url or GOOGLE_SHEET_URL
+
+def sheet_id_for(year=None):
+    """시트 URL의 문서 ID (/d/<ID>/...), 형식이 다르면 URL에서 안전한 문자만 추림"""
+    url = sheet_url_for(year) or ""
+    m = re.search(r"/d/([A-Za-z0-9_-]+)", url)
+    if m: return m.group(1)
+    return re.sub(r"[^A-Za-z0-9_-]", "", url)[-64:] or event_store.DEFAULT_SHEET
+
+def cache_namespace(year=None):
+    """캐시 키/파일 이름 접두어: '{학년도}_{시트ID}'"""
+    year = _resolve_year(year)
+    return f"{year}_{sheet_id_for(year)}"
 
 def get_holidays():
     """
@@ -92,23 +133,28 @@ def get_google_client():
         print(f"❌ 인증 파일 없음: {key_path}")
         return None
 
-def get_sheet_instance():
+def get_sheet_instance(year=None):
     global _DOC_INSTANCE
-    if _DOC_INSTANCE: return _DOC_INSTANCE
+    url = sheet_url_for(year)
+    if url == GOOGLE_SHEET_URL and _DOC_INSTANCE: return _DOC_INSTANCE
+    if url in _DOC_INSTANCES: return _DOC_INSTANCES[url]
 
     client = get_google_client()
     if client:
         try:
-            _DOC_INSTANCE = client.open_by_url(GOOGLE_SHEET_URL)
-            return _DOC_INSTANCE
+            doc = client.open_by_url(url)
+            _DOC_INSTANCES[url] = doc
+            if url == GOOGLE_SHEET_URL: _DOC_INSTANCE = doc
+            return doc
         except Exception as e:
             print(f"❌ 시트 열기 실패: {e}")
             return None
     return None
 
 # =============================================================================
-# 캐시 관리
+# 캐시 관리 (명렬표 등 소형 데이터: pickle / 월별 이벤트: event_store)
 # =============================================================================
+EVENTS_TTL = 1800
 def get_cache_path(key):
     return os.path.join(str(CACHE_DIR), f"{key}.pkl")
 
@@ -130,21 +176,256 @@ def load_from_cache(key, ttl=3600):
         except: pass
     return None
 
+# =============================================================================
+# [증분 동기화] 시트 수정 시각 + 월별 내용 지문(fingerprint)
+# - Sheets API는 워크시트별 수정 시각을 주지 않으므로 스프레드시트 전체의
+#   Drive modifiedTime을 월마다 "마지막으로 확인한 시각"으로 기록하고(verified),
+#   월별로는 원본 값의 해시를 기록합니다.
+# - 그 월을 마지막으로 확인한 뒤 수정 시각이 그대로면 값 다운로드 없이 TTL만 연장,
+#   바뀌었으면 받아 온 값의 지문이 달라진 월만 다시 파싱합니다.
+# =============================================================================
+# 백그라운드 갱신 스레드와 상태 파일(JSON)을 함께 쓰므로 읽기-수정-쓰기를 잠금으로 보호
+_STATE_LOCK = threading.RLock()
+
+def _sync_state_file(year=None):
+    return f"sync_state_{cache_namespace(year)}.json"
+
+def _load_sync_state(year=None):
+    return StateManager(str(CACHE_DIR)).load_json(_sync_state_file(year), default={"months": {}, "verified": {}})
+
+def _save_sync_state(state, year=None):
+    with _STATE_LOCK:
+        StateManager(str(CACHE_DIR)).save_json(_sync_state_file(year), state)
+
+def _merge_month_state(state, months, year=None):
+    """
+    다른 스레드가 그 사이 기록한 월을 덮어쓰지 않도록, 지정한 월만(지문 + 확인 시각) 최신 상태 파일에 병합하여 저장.
+    """
+    with _STATE_LOCK:
+        latest = _load_sync_state(year)
+        for m in months:
+            if str(m) in state.get("months", {}):
+                latest.setdefault("months", {})[str(m)] = state["months"][str(m)]
+            if str(m) in state.get("verified", {}):
+                latest.setdefault("verified", {})[str(m)] = state["verified"][str(m)]
+        _save_sync_state(latest, year)
+
+def _mark_verified(state, months, modified_time):
+    """해당 월들의 값을 modified_time 시점에 받아 확인했음을 기록"""
+    if not modified_time: return
+    for m in months:
+        state.setdefault("verified", {})[str(m)] = modified_time
+
+def month_versions(months=None, year=None):
+    """월별 원본 지문 (동기화 기록) - 값이 바뀐 월만 다시 계산할 때 비교용"""
+    months_state = _load_sync_state(year).get("months", {})
+    return {m: months_state.get(str(m)) for m in (months or ACADEMIC_MONTHS)}
+
+def sync_changes(since=0, months=None, year=None):
+    """
+    동기화 변경분 (since: 마지막으로 읽은 일련번호).
+    Returns: (변경 목록, 마지막 seq, 완전 여부) - 자세한 형식은 src.services.sync_delta
+    """
+    return sync_delta.changes_since(cache_namespace(year), since, months)
+
+def events_as_of(when, months=None, year=None):
+    """
+    과거 시점(날짜/일시)에 저장소가 갖고 있던 월별 이벤트 (이벤트 로그 재생).
+    Returns: {월: [이벤트]} - 예: events_as_of(datetime.date(2025, 5, 12), [5])
+    """
+    return event_log.state_at(cache_namespace(year), when, months)
+
+def event_history(num=None, month=None, since=None, year=None):
+    """기록 수정 이력 (감사용) - 자세한 형식은 src.services.event_log.history"""
+    return event_log.history(cache_namespace(year), num=num, month=month, since=since)
+
+def get_sheet_modified_time(doc):
+    """스프레드시트의 마지막 수정 시각 (Drive API 1회 호출, 실패 시 None)"""
+    try:
+        return doc.get_lastUpdateTime()
+    except Exception as e:
+        print(f"⚠️ [Sync] 시트 수정 시각 확인 실패: {e}")
+        return None
+
+def content_fingerprint(values, roster=None):
+    """원본 셀 값(+이름 보충에 쓰이는 명렬표)의 해시"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    if roster:
+        h.update(json.dumps(sorted(roster.items()), ensure_ascii=False).encode('utf-8'))
+    return h.hexdigest()
+
+def _months_unchanged(state, modified_time, months, year=None):
+    """각 월을 마지막으로 확인한 뒤 시트 수정 시각이 그대로이고, 해당 월들이 모두 저장소에 있으면 True"""
+    if not modified_time: return False
+    year = _resolve_year(year)
+    verified = state.get("verified", {})
+    for m in months:
+        if str(m) not in state.get("months", {}): return False
+        # 이전 형식 상태 파일은 월별 기록이 없으므로 전체 수정 시각으로 판단
+        if verified.get(str(m), state.get("modified_time")) != modified_time: return False
+        if event_store.month_timestamp(year, m, sheet=sheet_id_for(year)) is None: return False
+    return True
+
+def _apply_month_values(state, m, raw_values, roster, year=None):
+    """
+    받아 온 월 값의 지문이 기록과 같으면 TTL만 연장하고, 다르면 다시 파싱하여 저장.
+    Returns: 다시 파싱했으면 True
+    """
+    fp = content_fingerprint(raw_values, roster)
+    months_state = state.setdefault("months", {})
+    year = _resolve_year(year)
+    if months_state.get(str(m)) == fp and event_store.touch_month(year, m, sheet=sheet_id_for(year)):
+        return False
+    _parse_and_save(m, raw_values, roster, year)
+    months_state[str(m)] = fp
+    return True
+
+# =============================================================================
+# [범위 최적화] 워크시트 격자 크기 + 헤더 배치를 기억해 두고 사용 영역만 요청
+# - 처음(또는 격자 크기가 바뀌면)에는 격자(rowCount x columnCount) 전체를 요청하고,
+#   이후에는 번호/이름/날짜 열과 학생 행까지만(+여유분) 요청합니다.
+# - 학생 행/날짜 열이 요청 범위 끝에 닿으면 격자 전체로 다시 받습니다.
+# - 값 렌더링은 FORMATTED_VALUE 유지 (UNFORMATTED는 날짜 헤더가 일련번호로,
+#   체크박스가 bool로 와서 파싱이 깨짐)
+# =============================================================================
+ROW_MARGIN = 10
+COL_MARGIN = 2
+VALUE_RENDER = 'FORMATTED_VALUE'
+FALLBACK_RANGE = "A1:ZZ2000"
+_LAYOUT_CACHE = {}  # 네임스페이스 -> {워크시트 제목: 배치}
+
+def _layout_file(year=None):
+    return f"sheet_layout_{cache_namespace(year)}.json"
+
+def _layouts(year=None):
+    ns = cache_namespace(year)
+    if ns not in _LAYOUT_CACHE:
+        _LAYOUT_CACHE[ns] = StateManager(str(CACHE_DIR)).load_json(_layout_file(year))
+    return _LAYOUT_CACHE[ns]
+
+def _save_layouts(year=None):
+    with _STATE_LOCK:
+        StateManager(str(CACHE_DIR)).save_json(_layout_file(year), _layouts(year))
+
+def _grid_of(ws):
+    try: return int(ws.row_count), int(ws.col_count)
+    except: return None
+
+def _used_range(ws, year=None):
+    """
+    요청할 범위 (A1 표기, 시트 이름 제외)와 그 크기.
+    Returns: (a1, 행 수, 열 수, 축소 여부)
+    """
+    grid = _grid_of(ws)
+    if not grid: return FALLBACK_RANGE, 2000, 702, False
+
+    layout = _layouts(year).get(ws.title)
+    if layout and [layout['rows'], layout['cols']] == list(grid):
+        n_rows = min(grid[0], layout['last_row'] + 1 + ROW_MARGIN)
+        n_cols = min(grid[1], layout['last_col'] + 1 + COL_MARGIN)
+        return f"A1:{rowcol_to_a1(n_rows, n_cols)}", n_rows, n_cols, (n_rows, n_cols) != grid
+    return f"A1:{rowcol_to_a1(*grid)}", grid[0], grid[1], False
+
+def _learn_layout(ws, target_month, values, requested, year=None):
+    """
+    받아 온 값으로 사용 영역(마지막 학생 행, 마지막 날짜 열)을 기록합니다.
+    축소 범위로 받았는데 헤더를 못 찾았거나 데이터가 범위 끝에 닿았으면
+    기록을 지우고 False (-> 격자 전체로 다시 요청).
+    """
+    layouts = _layouts(year)
+    _, n_rows, n_cols, narrowed = requested
+    grid = _grid_of(ws)
+
+    header = _analyze_header(values, target_month, year) if values else None
+    if header is None:
+        layouts.pop(ws.title, None)
+        return not narrowed
+
+    header_row_idx, col_idx_num, col_idx_name, date_map = header
+    last_col = max([col_idx_num, col_idx_name] + [c + 1 for c in date_map])  # 날짜(체크) 열 + 옆 텍스트 열
+    last_row = header_row_idx
+    for i in range(len(values) - 1, header_row_idx, -1):
+        row = values[i]
+        if len(row) > col_idx_num and str(row[col_idx_num]).strip().isdigit():
+            last_row = i
+            break
+
+    if narrowed and grid:
+        if (last_row >= n_rows - 1 and n_rows < grid[0]) or (last_col >= n_cols - 1 and n_cols < grid[1]):
+            layouts.pop(ws.title, None)
+            return False
+
+    if grid:
+        layouts[ws.title] = {'rows': grid[0], 'cols': grid[1], 'last_row': last_row, 'last_col': last_col}
+    return True
+
+def _fetch_ws_values(ws, target_month, year=None):
+    """워크시트 하나의 사용 영역만 받아 오기 (끝에 닿으면 격자 전체로 재요청)"""
+    requested = _used_range(ws, year)
+    values = ws.get(requested[0], value_render_option=VALUE_RENDER)
+    if not _learn_layout(ws, target_month, values, requested, year):
+        requested = _used_range(ws, year)
+        values = ws.get(requested[0], value_render_option=VALUE_RENDER)
+        _learn_layout(ws, target_month, values, requested, year)
+    _save_layouts(year)
+    return [list(r) for r in values]
+
 # =============================================================================
 # 1. 명단 확보 (A열=번호, B열=이름 고정)
 # =============================================================================
-def get_master_roster(force_update=False):
+ROSTER_TTL = 86400 * 7
+ROSTER_TITLES = ['명렬표', '명단', '기본정보', '학생명단']
+BIRTHDAY_TITLES = ["기본정보", "명렬표", "학생명단"]
+
+def _roster_key(year=None):
+    return f"master_roster_{cache_namespace(year)}"
+
+def _birthday_key(year=None):
+    return f"birthday_rows_{cache_namespace(year)}"
+
+def _parse_roster(rows):
+    roster = {}
+    
+    for row in rows:
+        if len(row) < 2: continue
+        
+        num_val = str(row[0]).strip()
+        name_val = str(row[1]).strip()
+        
+        if not num_val.isdigit(): continue
+        num = int(num_val)
+        
+        if num <= 0 or num >= 100: continue
+        if not name_val or "이름" in name_val or "성명" in name_val: continue
+
+        roster[num] = name_val
+
+    return dict(sorted(roster.items()))
+
+# [Single-Flight] 여러 세션이 같은 월/명렬표를 동시에 요청하면 한 번만 받아 결과를 공유
+_FLIGHTS = SingleFlight()
+
+def get_master_roster(force_update=False, year=None):
+    if not force_update:
+        cached = load_from_cache(_roster_key(year), ttl=ROSTER_TTL)
+        if cached is not None: return cached
+
+    return _FLIGHTS.do(('roster', cache_namespace(year), bool(force_update)), _download_roster, force_update, year)
+
+def _download_roster(force_update=False, year=None):
+    # 캐시 확인과 다운로드 시작 사이에 다른 요청이 이미 받아 두었을 수 있음
     if not force_update:
-        cached = load_from_cache("master_roster", ttl=86400 * 7)
+        cached = load_from_cache(_roster_key(year), ttl=ROSTER_TTL)
         if cached is not None: return cached
 
     print("☁️ [Google] 학생 명단 다운로드 중... (A열:번호/B열:이름)")
     try:
-        doc = get_sheet_instance()
+        doc = get_sheet_instance(year)
         if not doc: return {}
 
         sheet = None
-        for title in ['명렬표', '명단', '기본정보', '학생명단']:
+        for title in ROSTER_TITLES:
             try: sheet = doc.worksheet(title); break
             except: continue
             
@@ -154,41 +435,43 @@ def get_master_roster(force_update=False):
                 print("❌ 명렬표 시트를 찾을 수 없습니다.")
                 return {}
 
-        rows = sheet.get_all_values()
-        roster = {}
-        
-        for row in rows:
-            if len(row) < 2: continue
-            
-            num_val = str(row[0]).strip()
-            name_val = str(row[1]).strip()
-            
-            if not num_val.isdigit(): continue
-            num = int(num_val)
-            
-            if num <= 0 or num >= 100: continue
-            if not name_val or "이름" in name_val or "성명" in name_val: continue
-
-            roster[num] = name_val
-
-        roster = dict(sorted(roster.items()))
-        save_to_cache("master_roster", roster)
+        rows = sheet.get('A:B', value_render_option=VALUE_RENDER)
+        roster = _parse_roster(rows)
+        save_to_cache(_roster_key(year), roster)
         return roster
     except Exception as e:
         print(f"❌ 명렬표 로드 실패: {e}")
         return {}
 
+def get_birthday_rows(force_update=False, year=None):
+    """생일 알림용 기본정보 시트의 A~E열 (번호/이름/.../생일), 명렬표와 같은 주기로 캐시"""
+    if not force_update:
+        cached = load_from_cache(_birthday_key(year), ttl=ROSTER_TTL)
+        if cached is not None: return cached
+
+    doc = get_sheet_instance(year)
+    if not doc: return []
+
+    # 시트 이름 찾기 ('기본정보' 등)
+    worksheet = None
+    for title in BIRTHDAY_TITLES:
+        try: worksheet = doc.worksheet(title); break
+        except: pass
+    if not worksheet: worksheet = doc.get_worksheet(0)
+
+    # 번호/이름/생일(E열)만 요청
+    rows = [list(r) for r in worksheet.get('A:E', value_render_option=VALUE_RENDER)]
+    save_to_cache(_birthday_key(year), rows)
+    return rows
+
 # =============================================================================
 # [핵심 엔진] 데이터 파싱 및 캐시 저장
 # =============================================================================
-def _parse_and_save(target_month, all_values, roster):
-    cache_key = f"events_{target_month}"
-    
-    if not all_values or len(all_values) < 2:
-        save_to_cache(cache_key, [])
-        return []
-
-    # 1. 헤더 분석
+def _analyze_header(all_values, target_month, year=None):
+    """
+    상단 10행에서 헤더를 찾아 (헤더 행 인덱스, 번호 열, 이름 열, {열 인덱스: 날짜}) 반환.
+    번호/이름 열을 찾지 못하면 None.
+    """
     header_row_idx = 0
     header = []
     col_idx_num = -1  
@@ -208,13 +491,12 @@ def _parse_and_save(target_month, all_values, roster):
             break
     
     if col_idx_num == -1 or col_idx_name == -1:
-        print(f"   ⚠️ {target_month}월: 번호/이름 열을 찾을 수 없어 건너뜁니다.")
-        save_to_cache(cache_key, [])
-        return []
+        return None
 
-    # 2. 날짜 매핑
+    # 날짜 매핑
     date_map = {}
-    year = TARGET_YEAR + 1 if target_month < 3 else TARGET_YEAR
+    academic_year = _resolve_year(year)
+    year = academic_year + 1 if target_month < 3 else academic_year
     
     for idx, cell in enumerate(header):
         cell_str = str(cell).strip()
@@ -230,120 +512,334 @@ def _parse_and_save(target_month, all_values, roster):
                     if m == target_month:
                         date_map[idx] = datetime.date(year, m, d)
             except: pass
-    
+
+    return header_row_idx, col_idx_num, col_idx_name, date_map
+
+def _extract_events(rows, col_idx_num, col_idx_name, date_map, roster):
+    """
+    [벡터화 파서] 가로형(학생 x 날짜) 시트를 세로형 이벤트 리스트로 변환합니다.
+    - 행을 2차원 배열로 만든 뒤, 마스크 한 번으로 값이 있는 칸(체크박스/텍스트 열 쌍)만 추려냅니다.
+    - 시간/사유/구분 추출은 추려낸 칸에만 pandas str.extract로 일괄 적용합니다.
+    - 결과는 기존 셀 단위 루프와 동일한 순서(행 -> 열)와 내용의 이벤트 딕셔너리입니다.
+    - 분류 코드(kind/excuse/trip/is_menstrual)도 여기서 한 번만 계산해 함께 저장합니다.
+    """
+    if not rows or not date_map: return []
+
+    date_cols = np.fromiter(date_map.keys(), dtype=np.int64, count=len(date_map))
+    date_objs = list(date_map.values())
+    width = max(int(date_cols.max()) + 2, col_idx_num + 1, col_idx_name + 1)
+
+    # 1. 2D 그리드 (짧은 행은 빈 문자열로 채움 -> '열 없음'과 '빈 칸'을 동일하게 처리)
+    lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+    pad = [""] * width
+    grid = np.array([r if len(r) == width else (list(r) + pad[len(r):] if len(r) < width else r[:width])
+                     for r in rows], dtype=object)
+
+    def _as_str(values):
+        return np.char.strip(values.astype(str))
+
+    # 2. 학생 행 판별 (번호 열이 숫자인 행만)
+    num_col = _as_str(grid[:, col_idx_num])
+    name_col = _as_str(grid[:, col_idx_name]).tolist()
+    row_ok = (lengths >= 2) & (lengths > col_idx_num) & np.char.isdigit(num_col)
+
+    nums = {}
+    for r_idx in np.flatnonzero(row_ok):
+        try: nums[r_idx] = int(num_col[r_idx])
+        except ValueError: row_ok[r_idx] = False
+
+    # 3. 마스크 한 번으로 값이 있는 칸만 추려냄
+    #    (빈 칸과 체크 해제('FALSE')만 있는 칸은 문자열 처리 없이 바로 제외)
+    checks = grid[:, date_cols]
+    texts = grid[:, date_cols + 1]
+    filled = (((checks != "") & (checks != "FALSE")) | (texts != "")) & row_ok[:, None]
+    cand_rows, cand_cols = np.nonzero(filled)  # 행 우선 순서 (기존 루프 순서와 동일)
+    if len(cand_rows) == 0: return []
+
+    # 4. 세로형(long)으로 펼친 뒤 최종 값 결정 (텍스트 우선, 체크박스 TRUE -> 결석)
+    chk = _as_str(checks[cand_rows, cand_cols])
+    txt = _as_str(texts[cand_rows, cand_cols])
+    chk_up = np.char.upper(chk)
+    final = np.where(txt != "", txt,
+             np.where(chk_up == "TRUE", "결석",
+             np.where((chk != "") & (chk_up != "FALSE"), chk, "")))
+
+    keep = (final != "") & (final != "-") & (final != "0") & (np.char.upper(final) != "FALSE")
+    if not keep.any(): return []
+    hit_rows, hit_cols = cand_rows[keep], cand_cols[keep]
+    vals = pd.Series(final[keep].tolist(), dtype=object)
+
+    # 5. 정규식 일괄 적용 (시간/사유/구분)
+    times = vals.str.extract(r'\((.*?)\)', expand=False).fillna("").tolist()
+    reasons = vals.str.extract(r'\[(.*?)\]', expand=False).fillna("").tolist()
+    clean_types = vals.str.replace(r'[\(].*?[\)]', '', regex=True).str.replace('[]', '', regex=False).str.strip().tolist()
+    unexcused = (vals.str.contains("미인정", regex=False) | vals.str.contains("무단", regex=False)).tolist()
+    vals = vals.tolist()
+
+    # 사유에서 대괄호 부분을 뺀 구분 코드 확정 후, 분류 코드를 한 번에 계산
+    for i, reason in enumerate(reasons):
+        if reason: clean_types[i] = clean_types[i].replace(f"[{reason}]", "").strip()
+    classes = classify_events(clean_types, reasons, unexcused)
+    kinds, excuses, trips, menstrual = (classes[k] for k in CLASS_FIELDS)
+
     events = []
-    
-    for row in all_values[header_row_idx + 1:]:
-        if not row or len(row) < 2: continue
-        
-        try:
-            if len(row) <= col_idx_num: continue
-            num_str = str(row[col_idx_num]).strip()
-            if not num_str.isdigit(): continue
-            num = int(num_str)
-            
-            name = ""
-            if len(row) > col_idx_name:
-                name = str(row[col_idx_name]).strip()
-            
+    names = {}
+    for i, (r_idx, c_idx) in enumerate(zip(hit_rows.tolist(), hit_cols.tolist())):
+        num = nums[r_idx]
+        if r_idx not in names:
+            name = name_col[r_idx]
             if not name and (roster and num in roster):
                 name = roster[num]
-            if not name: name = "Unknown"
+            names[r_idx] = name or "Unknown"
 
-        except: continue
+        events.append({
+            'num': num, 'name': names[r_idx], 'date': date_objs[c_idx],
+            'type': vals[i], 'raw_type': clean_types[i], 
+            'time': times[i],
+            'is_unexcused': bool(unexcused[i]),
+            'reason': reasons[i],
+            'kind': kinds[i], 'excuse': excuses[i], 'trip': trips[i], 'is_menstrual': menstrual[i]
+        })
+    return events
 
-        for col_idx, date_obj in date_map.items():
-            if col_idx >= len(row): continue
-            
-            val_check = str(row[col_idx]).strip() 
-            final_val = ""
-            
-            if col_idx + 1 < len(row):
-                val_text = str(row[col_idx + 1]).strip() 
-            else: val_text = ""
-            
-            if val_text:
-                final_val = val_text
-            elif val_check.upper() == "TRUE":
-                final_val = "결석" 
-            elif val_check and val_check.upper() != "FALSE":
-                final_val = val_check
-
-            if not final_val or final_val == "-" or final_val == "0" or final_val.upper() == "FALSE": 
-                continue
-
-            time_info = ""
-            match_time = re.search(r'\((.*?)\)', final_val)
-            if match_time: time_info = match_time.group(1)
-            
-            clean_type = re.sub(r'[\(].*?[\)]', '', final_val).replace('[]', '').strip()
-            reason_match = re.search(r'\[(.*?)\]', final_val)
-            reason = reason_match.group(1) if reason_match else ""
-            if reason: clean_type = clean_type.replace(f"[{reason}]", "").strip()
-
-            events.append({
-                'num': num, 'name': name, 'date': date_obj,
-                'type': final_val, 'raw_type': clean_type, 
-                'time': time_info,
-                'is_unexcused': ("미인정" in final_val or "무단" in final_val),
-                'reason': reason
-            })
+def _save_month(year, target_month, events, sheet):
+    """월 파티션 저장 + 이전 저장본과의 변경분을 변경 로그/이벤트 로그에 기록"""
+    previous = event_store.read_month(year, target_month, sheet=sheet)
+    event_store.write_month(year, target_month, events, sheet=sheet)
+    ns = cache_namespace(year)
+    try:
+        # 캐시가 지워져 저장본이 없으면 이벤트 로그의 마지막 상태와 비교 -> 변경 이력이 끊기지 않음
+        if previous is None: previous = event_log.latest_month(ns, target_month)
+        changes = sync_delta.record(ns, target_month, previous, events)
+        event_log.append(ns, target_month, previous, events, changes)
+    except Exception as e:
+        print(f"⚠️ [Delta] {target_month}월 변경분 기록 실패: {e}")
+
+def _parse_and_save(target_month, all_values, roster, year=None):
+    year = _resolve_year(year)
+    sheet = sheet_id_for(year)
+    if not all_values or len(all_values) < 2:
+        _save_month(year, target_month, [], sheet)
+        return []
+
+    # 1. 헤더 분석 + 2. 날짜 매핑
+    layout = _analyze_header(all_values, target_month, year)
+    if layout is None:
+        print(f"   ⚠️ {target_month}월: 번호/이름 열을 찾을 수 없어 건너뜁니다.")
+        _save_month(year, target_month, [], sheet)
+        return []
+
+    header_row_idx, col_idx_num, col_idx_name, date_map = layout
+
+    # 3. 벡터화 파싱
+    events = _extract_events(all_values[header_row_idx + 1:], col_idx_num, col_idx_name, date_map, roster)
             
-    save_to_cache(cache_key, events)
+    _save_month(year, target_month, events, sheet)
+    return events
+
+
+# =============================================================================
+# [메모리 캐시] 이미 만들어 둔 이벤트 리스트를 프로세스 안에서 재사용 (LRU)
+# - 키: (학년도, 시트 ID, 월, 저장 파일 mtime) -> 저장소가 갱신되면 자동으로 새 버전을 읽음
+# - 여러 생성기/세션/rerun이 같은 리스트를 공유하므로 제자리 수정 금지
+# =============================================================================
+EVENTS_MEMO_SIZE = 24  # 두 학년도 x 12개월
+_EVENTS_MEMO = LRUCache(maxsize=EVENTS_MEMO_SIZE)
+
+def read_month_cached(target_month, ttl=None, year=None):
+    """저장소 월 파티션 읽기 (메모리에 같은 버전이 있으면 디스크를 읽지 않음)"""
+    year = _resolve_year(year)
+    sheet = sheet_id_for(year)
+    ts = event_store.month_timestamp(year, target_month, sheet=sheet)
+    if ts is None: return None
+    if ttl is not None and (time.time() - ts) >= ttl: return None
+
+    key = (year, sheet, target_month, ts)
+    events = _EVENTS_MEMO.get(key)
+    if events is not None: return events
+
+    events = event_store.read_month(year, target_month, sheet=sheet)
+    if events is not None:
+        _EVENTS_MEMO.invalidate(predicate=lambda k: k[:3] == key[:3])  # 이전 버전 정리
+        _EVENTS_MEMO.put(key, events)
     return events
 
+def invalidate_memory_cache():
+    """메모리 캐시(이벤트 LRU, 시트 배치 정보)를 비움 - 캐시 삭제/새로고침 시 호출"""
+    count = _EVENTS_MEMO.invalidate()
+    _LAYOUT_CACHE.clear()
+    return count
+
+def memory_cache_stats():
+    """{'hits', 'misses', 'size', 'maxsize'}"""
+    return _EVENTS_MEMO.stats()
+
+# =============================================================================
+# [Stale-While-Revalidate] 만료된 캐시를 바로 반환하고 백그라운드에서 갱신
+# - Streamlit 앱에서 켜 두면 TTL이 지나도 화면이 네트워크를 기다리지 않습니다.
+# - 화면에는 data_as_of()로 '데이터 기준 시각'을 표시합니다.
+# =============================================================================
+STALE_WHILE_REVALIDATE = bool(GLOBAL_CONFIG.get("stale_while_revalidate", False))
+_REFRESH_THREADS = {}
+_REFRESH_LOCK = threading.Lock()
+
+def set_stale_while_revalidate(enabled=True):
+    global STALE_WHILE_REVALIDATE
+    STALE_WHILE_REVALIDATE = bool(enabled)
+
+def _refresh_in_background(target_month, roster, year=None):
+    """월 하나를 백그라운드에서 갱신 (같은 월이 이미 갱신 중이면 건너뜀)"""
+    key = (_resolve_year(year), target_month)
+    with _REFRESH_LOCK:
+        running = _REFRESH_THREADS.get(key)
+        if running is not None and running.is_alive(): return False
+        t = threading.Thread(
+            target=load_all_events, args=(None, target_month, roster),
+            kwargs={'stale_ok': False, 'year': key[0]}, name=f"refresh-{key[0]}-{target_month}", daemon=True
+        )
+        _REFRESH_THREADS[key] = t
+        t.start()
+        return True
+
+def is_refreshing(months=None, year=None):
+    """백그라운드 갱신 중인 월이 있으면 True"""
+    year = _resolve_year(year)
+    with _REFRESH_LOCK:
+        return any(t.is_alive() for (y, m), t in _REFRESH_THREADS.items()
+                   if y == year and (months is None or m in months))
+
+def data_as_of(months=None, year=None):
+    """
+    지정한 월들의 데이터 기준 시각 (가장 오래된 월의 마지막 동기화/확인 시각).
+    저장된 월이 하나도 없으면 None.
+    """
+    year = _resolve_year(year)
+    sheet = sheet_id_for(year)
+    stamps = [event_store.month_timestamp(year, m, sheet=sheet) for m in (months or ACADEMIC_MONTHS)]
+    stamps = [ts for ts in stamps if ts is not None]
+    if not stamps: return None
+    return datetime.datetime.fromtimestamp(min(stamps))
 
-def load_all_events(file_path_ignored, target_month, roster, force_update=False):
+def load_all_events(file_path_ignored, target_month, roster, force_update=False, stale_ok=None, year=None):
+    """
+    [얇은 뷰] 이벤트 저장소의 월 파티션을 읽고, 없거나 만료되었을 때만 구글 시트에서 다시 받습니다.
+    stale_ok(기본: STALE_WHILE_REVALIDATE)이면 만료된 데이터를 바로 반환하고 갱신은 백그라운드에서 합니다.
+    year: 학년도 (생략 시 TARGET_YEAR)
+    """
     if target_month is None: return []
-    cache_key = f"events_{target_month}"
+    if stale_ok is None: stale_ok = STALE_WHILE_REVALIDATE
+    year = _resolve_year(year)
     
     if not force_update:
-        cached = load_from_cache(cache_key, ttl=1800)
+        cached = read_month_cached(target_month, ttl=EVENTS_TTL, year=year)
         if cached is not None: return cached
-    
-    print(f"☁️ [Google] {target_month}월 데이터 개별 다운로드 중...")
+
+        if stale_ok:
+            stale = read_month_cached(target_month, year=year)
+            if stale is not None:
+                _refresh_in_background(target_month, roster, year)
+                return stale
+
+    # 같은 월을 동시에 요청한 호출은 진행 중인 다운로드 하나의 결과를 함께 받음
+    return _FLIGHTS.do(('month', cache_namespace(year), target_month, bool(force_update)),
+                       _download_month, target_month, roster, force_update, year)
+
+def _download_month(target_month, roster, force_update=False, year=None):
+    """구글 시트에서 월 하나를 받아 저장소에 반영 (single-flight 리더만 실행)"""
+    year = _resolve_year(year)
+    sheet = sheet_id_for(year)
+
+    # 캐시 확인과 다운로드 시작 사이에 다른 요청이 이미 갱신을 끝냈을 수 있음
+    if not force_update:
+        cached = read_month_cached(target_month, ttl=EVENTS_TTL, year=year)
+        if cached is not None: return cached
+
     try:
-        doc = get_sheet_instance()
+        doc = get_sheet_instance(year)
         if not doc: return []
 
+        # 시트가 마지막 동기화 이후 수정되지 않았다면 TTL만 연장
+        state = _load_sync_state(year)
+        modified_time = get_sheet_modified_time(doc)
+        if not force_update and _months_unchanged(state, modified_time, [target_month], year):
+            event_store.touch_month(year, target_month, sheet=sheet)
+            cached = read_month_cached(target_month, year=year)
+            if cached is not None: return cached
+
+        print(f"☁️ [Google] {target_month}월 데이터 개별 다운로드 중...")
         ws = None
         for cand in [f"{target_month}월", f"{target_month:02d}월"]:
             try: ws = doc.worksheet(cand); break
             except: pass
         
         if not ws:
-            save_to_cache(cache_key, []) 
-            return []
-            
-        return _parse_and_save(target_month, ws.get_all_values(), roster)
+            _save_month(year, target_month, [], sheet)
+            state.setdefault("months", {})[str(target_month)] = None
+        else:
+            _apply_month_values(state, target_month, _fetch_ws_values(ws, target_month, year), roster, year)
+
+        # 이번에 받은 월만 확인 시각 기록 (다른 월은 각자 기록된 시각으로 판단)
+        _mark_verified(state, [target_month], modified_time)
+        _merge_month_state(state, [target_month], year=year)
+        return read_month_cached(target_month, year=year) or []
 
     except Exception as e:
         print(f"❌ {target_month}월 처리 중 오류: {e}")
         return []
 
-def sync_all_data_batch(roster, target_months=None):
+def _find_title(sheet_map, candidates):
+    return next((t for t in candidates if t in sheet_map), None)
+
+def _batch_sync(roster, target_months=None, fetch_roster=False, fetch_birthday=False, force=False, year=None):
+    """
+    만료된 월(+필요하면 명렬표/생일 시트)을 values_batch_get 한 번으로 받아 캐시를 채웁니다.
+    force=True면 TTL/수정 시각과 무관하게 대상 월을 모두 받습니다.
+    Returns: 명렬표 (fetch_roster=True면 새로 받은 명렬표)
+    """
     if not target_months: target_months = ACADEMIC_MONTHS
+    year = _resolve_year(year)
+    sheet = sheet_id_for(year)
     
     months_to_fetch = []
     for m in target_months:
-        if load_from_cache(f"events_{m}", ttl=1800) is None:
+        if force or not event_store.is_fresh(year, m, EVENTS_TTL, sheet=sheet):
             months_to_fetch.append(m)
             
-    if not months_to_fetch:
+    if not months_to_fetch and not fetch_roster and not fetch_birthday:
         print("✨ 모든 데이터가 최신입니다 (캐시 사용).")
-        return
+        return roster
 
-    print(f"☁️ [Google] {len(months_to_fetch)}개 시트 일괄 다운로드 중... (Batch)")
-    
     try:
-        doc = get_sheet_instance()
-        if not doc: return
+        doc = get_sheet_instance(year)
+        if not doc: return roster if roster is not None else {}
 
+        # 1. 변경 감지: 시트 수정 시각이 그대로면 다운로드 없이 TTL만 연장
+        state = _load_sync_state(year)
+        modified_time = get_sheet_modified_time(doc) if months_to_fetch else None
+        # (생일 시트가 필요하면 월만 건너뛰고 생일 범위는 아래 일괄 요청으로 받음)
+        if months_to_fetch and not (fetch_roster or force) and _months_unchanged(state, modified_time, months_to_fetch, year):
+            for m in months_to_fetch: event_store.touch_month(year, m, sheet=sheet)
+            print(f"✨ 시트 변경 없음 ({modified_time}) -> {len(months_to_fetch)}개월 캐시 유지.")
+            if not fetch_birthday: return roster
+            months_to_fetch = []
+
+        print(f"☁️ [Google] {len(months_to_fetch)}개 시트 일괄 다운로드 중... (Batch)")
+
+        # 워크시트 메타데이터(제목/격자 크기)는 값과 같은 요청에 담을 수 없으므로 1회 별도 호출
         all_worksheets = doc.worksheets()
         sheet_map = {ws.title: ws for ws in all_worksheets}
+
+        # 명렬표/생일 시트 (같은 시트면 한 번만 요청)
+        roster_title = _find_title(sheet_map, ROSTER_TITLES) if fetch_roster else None
+        birthday_title = None
+        if fetch_birthday:
+            birthday_title = _find_title(sheet_map, BIRTHDAY_TITLES) or (all_worksheets[0].title if all_worksheets else None)
+        info_titles = list(dict.fromkeys(t for t in (roster_title, birthday_title) if t))
+        if fetch_roster and not roster_title:
+            print("❌ 명렬표 시트를 찾을 수 없습니다.")
+            roster = {}
         
-        ranges = []
-        valid_months = []
+        targets = []  # (월, 워크시트)
         
         for m in months_to_fetch:
             target_title = None
@@ -353,25 +849,166 @@ def sync_all_data_batch(roster, target_months=None):
                     break
             
             if target_title:
-                ranges.append(f"'{target_title}'!A1:ZZ2000")
-                valid_months.append(m)
+                targets.append((m, sheet_map[target_title]))
             else:
-                save_to_cache(f"events_{m}", [])
+                _save_month(year, m, [], sheet)
+                state.setdefault("months", {})[str(m)] = None
         
-        if not ranges: return
+        # 2. 사용 영역만 일괄 요청 (범위 끝에 닿은 월은 격자 전체로 한 번 더)
+        fetched = {}
+        pending = targets
+        for attempt in range(2):
+            if not pending and (attempt > 0 or not info_titles): break
+            head = [f"'{t}'!A:E" for t in info_titles] if attempt == 0 else []
+            requested = [_used_range(ws, year) for _, ws in pending]
+            ranges = head + [f"'{ws.title}'!{req[0]}" for (_, ws), req in zip(pending, requested)]
+            results = doc.values_batch_get(ranges, params={'valueRenderOption': VALUE_RENDER})
+            value_ranges = results.get('valueRanges', [])
 
-        results = doc.values_batch_get(ranges)
-        
-        if 'valueRanges' in results:
-            for i, result in enumerate(results['valueRanges']):
-                m = valid_months[i]
+            if head:
+                info_rows = {t: vr.get('values', []) for t, vr in zip(info_titles, value_ranges)}
+                if roster_title:
+                    roster = _parse_roster(info_rows.get(roster_title, []))
+                    save_to_cache(_roster_key(year), roster)
+                    print(f"   -> 명렬표 {len(roster)}명")
+                if birthday_title:
+                    save_to_cache(_birthday_key(year), info_rows.get(birthday_title, []))
+                value_ranges = value_ranges[len(head):]
+
+            retry = []
+            for (m, ws), req, result in zip(pending, requested, value_ranges):
                 raw_values = result.get('values', [])
-                _parse_and_save(m, raw_values, roster)
+                if _learn_layout(ws, m, raw_values, req, year):
+                    fetched[m] = raw_values
+                else:
+                    retry.append((m, ws))
+            pending = retry
+        if targets: _save_layouts(year)
+        
+        # 3. 지문이 바뀐 월만 다시 파싱 (명렬표를 먼저 채운 뒤)
+        for m, _ in targets:
+            if m not in fetched: continue
+            if _apply_month_values(state, m, fetched[m], roster, year):
                 print(f"   -> {m}월 처리 완료")
+            else:
+                print(f"   -> {m}월 변경 없음 (캐시 유지)")
+
+        # 실제로 받아 확인한 월(시트가 없는 월 포함)만 확인 시각 기록 -> 일부 월만 받아도 다음 동기화에서 TTL 연장 가능
+        checked = [m for m in months_to_fetch if m in fetched or m not in dict(targets)]
+        _mark_verified(state, checked, modified_time)
+        _merge_month_state(state, months_to_fetch, year)
                 
     except Exception as e:
         print(f"❌ 일괄 다운로드 중 오류 발생: {e}")
 
+    return roster if roster is not None else {}
+
+def sync_all_data_batch(roster, target_months=None, year=None):
+    _batch_sync(roster, target_months, year=year)
+
+def bootstrap_fetch(target_months=None, force=False, year=None):
+    """
+    [부트스트랩] 콜드 스타트용 일괄 로드.
+    워크시트 메타데이터 1회 + values_batch_get 1회로 명렬표(생일 E열 포함)와 만료된 모든 월을
+    함께 받아 명렬표/생일/이벤트 캐시를 한꺼번에 채웁니다. 캐시가 모두 살아 있으면 API 호출 없음.
+    Returns: 명렬표 dict
+    """
+    year = _resolve_year(year)
+    roster = None if force else load_from_cache(_roster_key(year), ttl=ROSTER_TTL)
+    need_birthday = force or load_from_cache(_birthday_key(year), ttl=ROSTER_TTL) is None
+    key = ('bootstrap', cache_namespace(year), tuple(target_months or ACADEMIC_MONTHS), roster is None, need_birthday, force)
+    return _FLIGHTS.do(key, _batch_sync, roster, target_months,
+                       fetch_roster=roster is None, fetch_birthday=need_birthday, force=force, year=year)
+
+def query_events(months=None, num=None, raw_type_contains=None, year=None):
+    """
+    저장소에서 조건에 맞는 이벤트만 바로 조회 (전체 로드 없이 필터 푸시다운).
+    예) query_events(num=7, raw_type_contains="결석"), query_events(year=2024) -> 이전 학년도
+    """
+    year = _resolve_year(year)
+    table = event_store.query(year, months=months, num=num, raw_type_contains=raw_type_contains,
+                              columns=event_store.EVENT_KEYS, sheet=sheet_id_for(year))
+    return event_store.table_to_events(table)
+
+# =============================================================================
+# [공유 스냅샷] 명렬표 + 학년도 전체 이벤트를 한 번만 로드
+# =============================================================================
+class AttendanceSnapshot:
+    """
+    명렬표와 ACADEMIC_MONTHS 이벤트를 한 번만 로드하여 모든 리포트 생성기가 공유하는 메모리 스냅샷.
+    - 명렬표/월별 이벤트는 처음 요청될 때 로드되고, 이후에는 메모리에서 바로 반환됩니다.
+    - 반환되는 리스트는 여러 리포트가 함께 쓰므로 제자리 수정(sort 등)을 하지 마세요.
+    - year를 주면 해당 학년도(학년도별 시트/캐시)의 스냅샷 -> 여러 학년도를 나란히 비교 가능
+    - events({월: 이벤트 리스트})를 주면 그 월은 로드하지 않고 그대로 사용 (누적 카운터의 규정 평가 등)
+    """
+    def __init__(self, roster=None, months=None, year=None, events=None):
+        self._roster = roster
+        self.year = _resolve_year(year)
+        self.months = list(months) if months else list(ACADEMIC_MONTHS)
+        self._events = dict(events or {})
+        self._stamps = {}
+        self._matrix = None
+        self._compliance = None
+
+    @property
+    def roster(self):
+        if self._roster is None:
+            # 명렬표 캐시가 없으면(콜드 스타트) 명렬표 + 만료된 월을 한 번에 받음
+            # (캐시가 있으면 월 데이터는 get_events에서 - Stale-While-Revalidate 적용)
+            cached = load_from_cache(_roster_key(self.year), ttl=ROSTER_TTL)
+            self._roster = cached if cached is not None else bootstrap_fetch(self.months, year=self.year)
+        return self._roster
+
+    def year_of(self, month):
+        return self.year + 1 if month < 3 else self.year
+
+    def get_events(self, month):
+        if month not in self._events:
+            self._events[month] = load_all_events(None, month, self.roster, year=self.year)
+        return self._events[month]
+
+    def month_stamp(self, month):
+        """
+        이 스냅샷이 실제로 읽은 월 데이터의 지문 (리포트 빌드 입력 해시용).
+        동기화 기록 대신 메모리의 이벤트로 계산 -> 만료된 데이터를 반환한 뒤 백그라운드 갱신이 끝나도
+        이번 스냅샷으로 만든 리포트에는 이전 데이터의 지문이 기록됩니다.
+        """
+        if month not in self._stamps:
+            h = hashlib.blake2b(digest_size=12)
+            for e in self.get_events(month):
+                h.update(json.dumps(sync_delta.plain_event(e), ensure_ascii=False, sort_keys=True).encode('utf-8'))
+            self._stamps[month] = h.hexdigest()
+        return self._stamps[month]
+
+    def iter_months(self, months=None):
+        """(월, 이벤트 리스트)를 학년도 순서대로 반환"""
+        for m in (months or self.months):
+            yield m, self.get_events(m)
+
+    def matrix(self, months=None):
+        """학생 x 날짜 출결 행렬 (요청한 월만 채움, 한 번 채운 월은 재사용)"""
+        if self._matrix is None:
+            self._matrix = AttendanceMatrix(self.year, sorted(self.roster))
+        for m in (months or self.months):
+            self._matrix.add_month(m, self.get_events(m))
+        return self._matrix
+
+    def compliance(self):
+        """체험학습/생리인정/장기결석 규정 평가 결과 (학년도 1회 스캔, 스냅샷 단위로 재사용)"""
+        if self._compliance is None:
+            self._compliance = compliance.evaluate(self)
+        return self._compliance
+
+    def preload(self):
+        for m in self.months:
+            self.get_events(m)
+        return self
+
+def load_snapshot(roster=None, preload=True, year=None):
+    """학년도 전체를 미리 로드한 스냅샷 생성 (메뉴 6 등 연간 작업용)"""
+    snapshot = AttendanceSnapshot(roster=roster, year=year)
+    return snapshot.preload() if preload else snapshot
+
 # [Refactor] Phase 3: 레거시 로직 제거 및 Utils 위임
 # 기존 check_gap_is_holiday 함수는 DateCalculator 내부 로직으로 대체되었으므로 삭제했습니다.
 
@@ -382,9 +1019,8 @@ def group_consecutive_events(events):
     """
     if not events: return []
 
-    # 1. 계산기 인스턴스 생성 (ROOT_DIR 전달)
-    # src.paths의 ROOT_DIR은 Path 객체일 수 있으므로 str()로 변환하여 안전하게 전달
-    date_calc = DateCalculator(str(ROOT_DIR))
+    # 1. 공용 계산기 사용 (학년도 캘린더를 매 호출마다 다시 만들지 않음)
+    date_calc = get_date_calculator()
     
     # 2. 작업 위임 (Toss)
     # DateCalculator가 정렬, 휴일 체크, 그룹화, real_days 계산까지 모두 수행함
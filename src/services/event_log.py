@@ -0,0 +1,196 @@
+import datetime
+import gzip
+import json
+import os
+import shutil
+import threading
+
+from src.paths import CACHE_DIR, DATA_DIR
+from src.services import sync_delta
+from src.utils.state_manager import StateManager
+
+# =============================================================================
+# [이벤트 로그] 동기화마다 월 변경분을 덧붙이기만 하는(append-only) 기록 + 주기적 체크포인트
+# - 위치: DATA_DIR/event_log/<학년도>/ (캐시 삭제와 함께 지워지지 않도록 캐시 폴더 밖에 보관)
+#     seg-000001.jsonl.gz ...  항목 한 줄씩 (gzip 멤버를 이어 붙이므로 기존 내용은 다시 쓰지 않음)
+#     ckpt-000050.json.gz ...  해당 seq 시점의 전체 상태 (월 -> 이벤트 목록)
+#     head.json                 마지막 seq / 현재 세그먼트 / 체크포인트 목록
+# - 항목: {'seq', 'at', 'month', 'op': 'put'(처음 받은 월 전체) | 'delta'(변경 목록), ...}
+# - 과거 시점 복원: 그 시점 이전의 가장 가까운 체크포인트 + 이후 항목만 재생
+#   (월 전체 사본을 동기화마다 남기지 않고도 "월요일에 시트가 어땠는지" 복원)
+# =============================================================================
+LOG_DIR = DATA_DIR / "event_log"
+_LEGACY_DIR = CACHE_DIR / "event_log"   # 이전 버전 위치 (처음 접근할 때 옮김)
+SEGMENT_ENTRIES = 500     # 세그먼트 하나에 담는 항목 수
+CHECKPOINT_EVERY = 50     # 항목 N개마다 체크포인트
+_LOCK = threading.Lock()
+
+def _dir(ns):
+    path = LOG_DIR / str(ns)
+    legacy = _LEGACY_DIR / str(ns)
+    if not path.exists() and legacy.exists():
+        try:
+            os.makedirs(LOG_DIR, exist_ok=True)
+            shutil.move(str(legacy), str(path))
+        except OSError as e:
+            print(f"⚠️ [EventLog] 이전 로그 이동 실패: {e}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _segment_path(ns, segment):
+    return _dir(ns) / f"seg-{segment:06d}.jsonl.gz"
+
+def _checkpoint_path(ns, seq):
+    return _dir(ns) / f"ckpt-{seq:06d}.json.gz"
+
+def _head(ns):
+    return StateManager(str(_dir(ns))).load_json("head.json", default={'seq': 0, 'segment': 1, 'in_segment': 0, 'checkpoints': []})
+
+def _save_head(ns, head):
+    StateManager(str(_dir(ns))).save_json("head.json", head)
+
+def _parse_when(when):
+    """날짜만 주면 그 날 끝(23:59:59) 기준"""
+    if isinstance(when, str): when = datetime.datetime.fromisoformat(when)
+    if not isinstance(when, datetime.datetime):
+        when = datetime.datetime.combine(when, datetime.time.max)
+    return when.replace(microsecond=0).isoformat()
+
+# =============================================================================
+# 기록
+# =============================================================================
+def append(ns, month, previous, events, changes):
+    """
+    월 저장 직후 호출. 처음 받은 월(previous None)은 전체(put), 그 외에는 변경 목록(delta)만 기록.
+    변경이 없으면 아무것도 쓰지 않습니다.
+    """
+    if previous is None:
+        entry = {'op': 'put', 'events': [sync_delta.plain_event(e) for e in events]}
+    elif changes:
+        entry = {'op': 'delta', 'changes': changes}
+    else:
+        return None
+
+    with _LOCK:
+        head = _head(ns)
+        if head['in_segment'] >= SEGMENT_ENTRIES:
+            head['segment'] += 1
+            head['in_segment'] = 0
+        head['seq'] += 1
+        entry = {'seq': head['seq'], 'at': datetime.datetime.now().isoformat(timespec='seconds'), 'month': month, **entry}
+
+        with gzip.open(_segment_path(ns, head['segment']), "at", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        head['in_segment'] += 1
+        _save_head(ns, head)
+
+        if head['seq'] % CHECKPOINT_EVERY == 0:
+            _write_checkpoint(ns, head)
+    return entry['seq']
+
+def _write_checkpoint(ns, head):
+    """현재 seq까지 재생한 상태를 체크포인트로 저장 (직전 체크포인트 + 이후 항목만 재생)"""
+    months, at = _replay(ns, head, until_seq=head['seq'])
+    with gzip.open(_checkpoint_path(ns, head['seq']), "wt", encoding="utf-8") as f:
+        json.dump({'seq': head['seq'], 'at': at, 'months': _dump_months(months)}, f, ensure_ascii=False)
+    head['checkpoints'].append({'seq': head['seq'], 'at': at})
+    _save_head(ns, head)
+
+# =============================================================================
+# 재생
+# =============================================================================
+def _dump_months(months):
+    return {str(m): [e for _, cell in sorted(cells.items()) for e in cell] for m, cells in months.items()}
+
+def _cells(events):
+    cells = {}
+    for e in events:
+        cells.setdefault((e['num'], e['date']), []).append(e)
+    return cells
+
+def _entries(ns, head, after_seq=0):
+    """after_seq 이후 항목을 순서대로 (해당 항목이 없는 앞쪽 세그먼트는 건너뜀)"""
+    for segment in range(1, head['segment'] + 1):
+        path = _segment_path(ns, segment)
+        if not path.exists(): continue
+        if segment < head['segment'] and segment * SEGMENT_ENTRIES <= after_seq: continue
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry['seq'] > after_seq: yield entry
+
+def _replay(ns, head, until_seq=None, until_at=None):
+    """
+    until_seq/until_at(ISO) 시점까지의 상태.
+    Returns: ({월: {(번호, 날짜): [이벤트]}}, 마지막으로 반영한 항목의 시각)
+    """
+    base = None
+    for ckpt in head['checkpoints']:
+        if until_seq is not None and ckpt['seq'] > until_seq: break
+        if until_at is not None and ckpt['at'] > until_at: break
+        base = ckpt
+
+    months, at, after = {}, None, 0
+    if base is not None:
+        with gzip.open(_checkpoint_path(ns, base['seq']), "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        months = {int(m): _cells(events) for m, events in data['months'].items()}
+        at, after = data['at'], data['seq']
+
+    for entry in _entries(ns, head, after):
+        if until_seq is not None and entry['seq'] > until_seq: break
+        if until_at is not None and entry['at'] > until_at: break
+        if entry['op'] == 'put':
+            months[entry['month']] = _cells(entry['events'])
+        else:
+            sync_delta.apply_changes(months.setdefault(entry['month'], {}), entry['changes'])
+        at = entry['at']
+    return months, at
+
+# =============================================================================
+# 조회
+# =============================================================================
+def _events(cells):
+    """칸 딕셔너리 -> 날짜, 번호 순 이벤트 목록 (날짜는 date 객체)"""
+    return [dict(e, date=datetime.date.fromisoformat(e['date']))
+            for _, cell in sorted(cells.items(), key=lambda kv: (kv[0][1], kv[0][0])) for e in cell]
+
+def state_at(ns, when, months=None):
+    """
+    when(날짜/일시/ISO 문자열) 시점에 저장소가 알고 있던 월별 이벤트.
+    Returns: {월: [이벤트(날짜는 date 객체)]} - 그 시점까지 한 번도 받지 않은 월은 빠짐
+    """
+    head = _head(ns)
+    replayed, _ = _replay(ns, head, until_at=_parse_when(when))
+    result = {}
+    for m, cells in replayed.items():
+        if months is not None and m not in months: continue
+        result[m] = _events(cells)
+    return result
+
+def latest_month(ns, month):
+    """
+    로그에 마지막으로 기록된 월 이벤트 (캐시가 지워져 이전 저장본이 없을 때 비교 기준으로 사용).
+    Returns: [이벤트(날짜는 date 객체)] 또는 None (한 번도 기록되지 않은 월)
+    """
+    head = _head(ns)
+    if head['seq'] == 0: return None
+    replayed, _ = _replay(ns, head)
+    return _events(replayed[month]) if month in replayed else None
+
+def history(ns, num=None, month=None, since=None):
+    """
+    변경 이력 (감사용): [{'seq', 'at', 'month', 'change', 'num', 'name', 'date', 'before', 'after'}]
+    since(날짜/일시) 이후 항목만, 처음 받은 월(put)은 제외
+    """
+    head = _head(ns)
+    since = _parse_when(since) if since is not None else None
+    result = []
+    for entry in _entries(ns, head):
+        if entry['op'] != 'delta': continue
+        if since is not None and entry['at'] <= since: continue
+        if month is not None and entry['month'] != month: continue
+        for c in entry['changes']:
+            if num is not None and c['num'] != num: continue
+            result.append({'seq': entry['seq'], 'at': entry['at'], **c})
+    return result
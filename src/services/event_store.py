@@ -0,0 +1,236 @@
+import os
+import sys
+import time
+import tempfile
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+# [나침반] 경로 설정
+from src.paths import CACHE_DIR
+
+# =============================================================================
+# [이벤트 저장소] 월별 출결 이벤트를 컬럼형(Arrow IPC) 파일로 보관
+# - 위치: CACHE_DIR/event_store/vN/sheet=ID/year=YYYY/month=M/events.arrow
+#   (스프레드시트/학년도/월 파티션 -> 여러 학년도·시트를 동시에 보관)
+# - 스키마가 바뀌면 STORE_VERSION을 올림 -> 이전 파일은 읽지 않고 새로 동기화
+# - 무압축 IPC 파일이므로 memory-map으로 열면 복사 없이 바로 읽힙니다.
+# - query()는 파티션(학년도/월)과 컬럼 필터를 스캔 단계로 밀어 넣습니다.
+# =============================================================================
+STORE_VERSION = 2
+STORE_DIR = CACHE_DIR / "event_store" / f"v{STORE_VERSION}"
+EVENTS_FILE = "events.arrow"
+
+# 문자열 중 반복이 많은 열(이름/구분)은 사전(dictionary) 인코딩 -> 정수 코드로 저장
+_CODE = pa.dictionary(pa.int16(), pa.string())
+
+SCHEMA = pa.schema([
+    ('num', pa.int16()),
+    ('name', _CODE),
+    ('date', pa.date32()),
+    ('type', _CODE),           # 시트 원문 (예: 질병조퇴(13:00)[병원])
+    ('raw_type', _CODE),       # 구분 코드 (예: 질병조퇴)
+    ('time', pa.string()),
+    ('reason', pa.string()),
+    ('is_unexcused', pa.bool_()),
+    # 수집 시 한 번 계산한 분류 코드 (src.utils.event_classifier 참고)
+    ('kind', pa.int8()),       # 결석/지각/조퇴/결과
+    ('excuse', pa.int8()),     # 질병/미인정/기타/인정/표기 없음
+    ('trip', pa.int8()),       # 체험학습 국내/국외
+    ('is_menstrual', pa.bool_()),
+])
+
+EVENT_KEYS = [f.name for f in SCHEMA]
+
+DEFAULT_SHEET = "default"
+
+def sheet_dir(sheet=DEFAULT_SHEET):
+    return STORE_DIR / f"sheet={sheet}"
+
+def partition_dir(year, month, sheet=DEFAULT_SHEET):
+    return sheet_dir(sheet) / f"year={year}" / f"month={month}"
+
+def partition_path(year, month, sheet=DEFAULT_SHEET):
+    return partition_dir(year, month, sheet) / EVENTS_FILE
+
+# =============================================================================
+# [이벤트 레코드] 딕셔너리 대신 쓰는 __slots__ 객체 (학년도 전체를 메모리에 올려도 가볍게)
+# - e['name'], e.get('reason', ''), e.keys()/items(), dict(e) 등 딕셔너리 방식 접근을 그대로 지원
+# - 여러 리포트가 같은 객체를 공유하므로 수정하지 말고 copy()로 딕셔너리를 받아 쓸 것
+# =============================================================================
+_SHARED_KEYS = {'name', 'date', 'type', 'raw_type', 'time', 'reason'}
+
+class EventRecord:
+    __slots__ = tuple(EVENT_KEYS)
+
+    def __init__(self, *values):
+        for k, v in zip(EVENT_KEYS, values):
+            setattr(self, k, v)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(EVENT_KEYS)
+
+    def __len__(self):
+        return len(EVENT_KEYS)
+
+    def keys(self):
+        return list(EVENT_KEYS)
+
+    def values(self):
+        return [getattr(self, k) for k in EVENT_KEYS]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in EVENT_KEYS]
+
+    def copy(self):
+        """수정 가능한 일반 딕셔너리 사본"""
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (EventRecord, dict)):
+            return self.copy() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.values()
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __repr__(self):
+        return f"EventRecord({self.copy()!r})"
+
+# =============================================================================
+# 변환 (이벤트 딕셔너리 <-> Arrow Table)
+# =============================================================================
+def events_to_table(events):
+    columns = {k: [e[k] for e in events] for k in EVENT_KEYS}
+    arrays = []
+    for field in SCHEMA:
+        if pa.types.is_dictionary(field.type):
+            arr = pa.array(columns[field.name], type=pa.string()).dictionary_encode().cast(field.type)
+        else:
+            arr = pa.array(columns[field.name], type=field.type)
+        arrays.append(arr)
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+def table_to_events(table):
+    """Arrow Table -> EventRecord 리스트 (문자열은 intern, 날짜 객체는 같은 날끼리 공유)"""
+    if table.num_rows == 0: return []
+    cols = []
+    for k in EVENT_KEYS:
+        values = table.column(k).to_pylist()
+        if k in _SHARED_KEYS:
+            shared = {}
+            values = [shared.setdefault(v, sys.intern(v) if isinstance(v, str) else v) for v in values]
+        cols.append(values)
+    return [EventRecord(*row) for row in zip(*cols)]
+
+# =============================================================================
+# 쓰기 / 읽기
+# =============================================================================
+def write_month(year, month, events, sheet=DEFAULT_SHEET):
+    """월 파티션을 통째로 교체 (임시 파일에 쓴 뒤 원자적 이름 변경)"""
+    path = partition_path(year, month, sheet)
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 쓰기마다 고유한 임시 파일 ('.'으로 시작 -> 조회 시 자동 제외) -> 같은 월을 동시에 써도 서로 덮어쓰지 않음
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{EVENTS_FILE}.", suffix=".tmp", dir=str(path.parent))
+        os.close(fd)
+        table = events_to_table(events)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, SCHEMA) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"⚠️ [EventStore] {year}학년도 {month}월 저장 실패: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            try: os.remove(tmp_path)
+            except OSError: pass
+        return False
+
+def month_timestamp(year, month, sheet=DEFAULT_SHEET):
+    """마지막 저장(동기화) 시각 (파일 mtime), 없으면 None"""
+    try:
+        return os.path.getmtime(partition_path(year, month, sheet))
+    except OSError:
+        return None
+
+def is_fresh(year, month, ttl, sheet=DEFAULT_SHEET):
+    ts = month_timestamp(year, month, sheet)
+    return ts is not None and (time.time() - ts) < ttl
+
+def touch_month(year, month, sheet=DEFAULT_SHEET):
+    """데이터 변경 없이 저장 시각만 갱신 (TTL 연장)"""
+    try:
+        os.utime(partition_path(year, month, sheet), None)
+        return True
+    except OSError:
+        return False
+
+def read_month(year, month, ttl=None, sheet=DEFAULT_SHEET):
+    """
+    월 파티션을 memory-map으로 읽어 EventRecord 리스트로 반환.
+    파일이 없거나 ttl(초)이 지났으면 None.
+    """
+    path = partition_path(year, month, sheet)
+    if ttl is not None and not is_fresh(year, month, ttl, sheet): return None
+    if not path.exists(): return None
+    try:
+        with pa.memory_map(str(path), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            return table_to_events(table)
+    except Exception as e:
+        print(f"⚠️ [EventStore] {year}학년도 {month}월 읽기 실패: {e}")
+        return None
+
+# =============================================================================
+# 조회 (필터 푸시다운)
+# =============================================================================
+def _dataset(sheet=DEFAULT_SHEET):
+    return ds.dataset(
+        str(sheet_dir(sheet)), format="ipc", partitioning="hive",
+        filesystem=pafs.LocalFileSystem(use_mmap=True)
+    )
+
+def query(year=None, months=None, num=None, raw_type_contains=None, columns=None, sheet=DEFAULT_SHEET):
+    """
+    스프레드시트 하나의 저장소에서 조건에 맞는 행만 Arrow Table로 반환.
+    예) query(2025, num=7, raw_type_contains="결석") -> 7번 학생의 결석 행만
+    """
+    if not sheet_dir(sheet).exists(): return SCHEMA.empty_table()
+
+    conditions = []
+    if year is not None: conditions.append(ds.field('year') == int(year))
+    if months: conditions.append(ds.field('month').isin([int(m) for m in months]))
+    if num is not None: conditions.append(ds.field('num') == int(num))
+    if raw_type_contains:
+        conditions.append(pc.match_substring(ds.field('raw_type').cast(pa.string()), raw_type_contains))
+
+    flt = None
+    for c in conditions:
+        flt = c if flt is None else (flt & c)
+
+    try:
+        return _dataset(sheet).to_table(columns=columns, filter=flt)
+    except Exception as e:
+        print(f"⚠️ [EventStore] 조회 실패: {e}")
+        return SCHEMA.empty_table()
@@ -0,0 +1,185 @@
+import datetime
+import threading
+
+from src.paths import DATA_DIR
+from src.services import data_loader, compliance, sync_delta
+from src.utils.state_manager import StateManager
+from src.utils.date_calculator import get_date_calculator
+
+# =============================================================================
+# [누적 카운터] 규정(장기결석/체험학습/생리인정) 학생별 누적값을 파일로 보관하고 변경분만 반영
+# - 월마다 규정 대상 이벤트(compliance.RULES의 where 조건)만 보관하고, 동기화 기록(월별 원본 지문)이
+#   바뀐 월만 갱신합니다. 바뀐 월이 없으면 파일만 읽고 끝.
+# - 동기화 변경 로그(sync_delta)가 빠짐없이 남아 있으면 월을 다시 읽지 않고 변경 목록만 적용합니다.
+#   (로그가 정리되어 빠졌거나 처음 받는 월이면 그 월만 스냅샷에서 다시 읽음)
+# - 누적값은 보관한 대상 이벤트로 규정 평가 엔진(compliance.evaluate)을 돌려 계산합니다.
+#   (대상 이벤트만으로도 리포트의 전체 평가와 같은 결과 -> 지난 달 수정도 그 월만 다시 읽으면 됨)
+# - 파일은 데이터 폴더(DATA_DIR)에 보관 (캐시 삭제와 무관하게 새 경고 판정 기준을 유지)
+# =============================================================================
+COUNTERS_VERSION = 3
+_LOCK = threading.Lock()
+
+def _counters_file(year=None):
+    return f"compliance_counters_{data_loader.cache_namespace(year)}.json"
+
+def _targeted(e):
+    """어느 규정이든 대상 조건에 맞는 이벤트인지"""
+    return any(compliance.matches(e, r['where']) for r in compliance.RULES)
+
+def _sort_plain(plain):
+    """보관 순서 고정: 날짜, 번호, 구분 순 (갱신 경로와 무관하게 같은 파일/같은 평가 결과)"""
+    return sorted(plain, key=lambda e: (e['date'], e['num'], e['raw_type'], e['time'] or ''))
+
+def _month_events(plain):
+    """보관 형식(plain) -> 이벤트"""
+    return [dict(e, date=datetime.date.fromisoformat(e['date'])) for e in plain]
+
+def _month_record(version, events):
+    """월 반영 기록: 동기화 지문 + 규정 대상 이벤트 (plain 형식)"""
+    return {'version': version, 'events': _sort_plain([sync_delta.plain_event(e) for e in events if _targeted(e)])}
+
+# =============================================================================
+# 집계 (규정 평가 엔진 결과 -> 파일에 보관하는 학생별 누적값)
+# =============================================================================
+def _summarize(result):
+    """
+    Returns: {번호(문자열): {'name', 'absence', 'trip', 'menstrual', 'flags'}}
+    flags: '규정 id.점검 id' (생리인정은 '.월'까지) - 새로 생긴 항목만 알림에 사용
+    """
+    students = {}
+
+    def entry(num, name):
+        return students.setdefault(str(num), {'name': name, 'absence': None, 'trip': {}, 'menstrual': {}, 'flags': []})
+
+    for num, a in result['students']['long_term'].items():
+        if not a['count']: continue
+        last = a['streaks'][-1] if a['streaks'] else None
+        st = entry(num, a['name'])
+        st['absence'] = {
+            'count': a['count'],
+            'max_streak': a['max_streak'],
+            'last_run': [last[0].isoformat(), last[1].isoformat(), last[2]] if last else None,
+        }
+        st['flags'].extend(f"long_term.{c}" for c in a['flags'])
+
+    splits = list(compliance.rule_by_id('fieldtrip')['splits'])
+    for num, a in result['students']['fieldtrip'].items():
+        if not any(a[f'{s}_total'] for s in splits): continue
+        st = entry(num, a['name'])
+        st['trip'] = {s: {'days': a[f'{s}_total'], 'max': a[f'{s}_max']} for s in splits}
+        st['flags'].extend(f"fieldtrip.{c}" for c in a['flags'])
+
+    splits = list(compliance.rule_by_id('menstrual')['splits'])
+    for num, a in result['students']['menstrual'].items():
+        usage = {m: cell for m, cell in a['months'].items() if any(cell[s] for s in splits)}
+        if not usage: continue
+        st = entry(num, a['name'])
+        st['menstrual'] = {str(m): {s: cell[s] for s in splits} for m, cell in usage.items()}
+        st['flags'].extend(f"menstrual.{c}.{m}" for m, cell in usage.items() for c in cell['flags'])
+    return students
+
+def _evaluate(state, snapshot):
+    """보관한 대상 이벤트만 담은 스냅샷으로 규정 평가 -> 학생별 누적값"""
+    events = {m: _month_events(state['months'][str(m)]['events']) for m in snapshot.months}
+    stored = data_loader.AttendanceSnapshot(roster=snapshot.roster, months=snapshot.months,
+                                            year=snapshot.year, events=events)
+    return _summarize(compliance.evaluate(stored))
+
+# =============================================================================
+# 변경분 반영
+# =============================================================================
+def _apply_change_log(state, snapshot, changed):
+    """
+    변경 로그로 반영할 수 있는 월에 변경 목록을 적용하고, 반영한 월 목록을 반환.
+    (로그가 완전하지 않으면 빈 목록 -> 바뀐 월을 모두 다시 읽음)
+    """
+    changes, seq, complete = data_loader.sync_changes(state.get('change_seq', 0), year=snapshot.year)
+    if not complete: return []
+    known = [m for m in changed if state['months'].get(str(m), {}).get('version') is not None]
+    by_month = {}
+    for c in changes:
+        if c['month'] in known: by_month.setdefault(c['month'], []).append(c)
+
+    for m, month_changes in by_month.items():
+        cells = {}
+        for e in state['months'][str(m)]['events']:
+            cells.setdefault((e['num'], e['date']), []).append(e)
+        # 대상이 아닌 기록은 보관하지 않으므로, 대상에서 빠지는 수정은 삭제와 같음
+        month_changes = [dict(c, after=c['after'] if c['after'] and _targeted(c['after']) else None)
+                         for c in month_changes]
+        sync_delta.apply_changes(cells, month_changes)
+        state['months'][str(m)]['events'] = _sort_plain([e for cell in cells.values() for e in cell])
+    return list(by_month)
+
+def _save(state, year):
+    StateManager(str(DATA_DIR)).save_json(_counters_file(year),
+                                          {k: v for k, v in state.items() if k not in ('mode', 'new_flags')})
+
+# =============================================================================
+# 갱신
+# =============================================================================
+def load_counters(year=None):
+    year = int(year or data_loader.TARGET_YEAR)
+    state = StateManager(str(DATA_DIR)).load_json(_counters_file(year), default=None)
+    if not state or state.get('version') != COUNTERS_VERSION or state.get('year') != year:
+        return None
+    return state
+
+def rebuild(snapshot):
+    """학년도 전체를 처음부터 다시 계산"""
+    versions = data_loader.month_versions(snapshot.months, year=snapshot.year)
+    state = {'version': COUNTERS_VERSION, 'year': snapshot.year, 'months': {},
+             'change_seq': data_loader.sync_changes(year=snapshot.year)[1]}
+    for m in snapshot.months:
+        state['months'][str(m)] = _month_record(versions.get(m), snapshot.get_events(m))
+    state['students'] = _evaluate(state, snapshot)
+    state['mode'] = 'rebuild'
+    return state
+
+def update(snapshot):
+    """
+    동기화 이후 바뀐 월만 반영하고 누적값을 다시 평가한 뒤 저장.
+    Returns: 누적 상태 딕셔너리
+        state['mode']: 'unchanged' / 'delta' / 'rebuild'
+        state['new_flags']: {번호: [이번 갱신에서 새로 생긴 위반 항목]} (처음 계산할 때는 비어 있음)
+    """
+    with _LOCK:
+        state = load_counters(snapshot.year)
+        if state is None:
+            state = rebuild(snapshot)
+            state['new_flags'] = {}
+            _save(state, snapshot.year)
+            return state
+
+        versions = data_loader.month_versions(snapshot.months, year=snapshot.year)
+        changed = [m for m in snapshot.months if state['months'].get(str(m), {}).get('version') != versions.get(m)]
+        if not changed:
+            state.update(mode='unchanged', new_flags={})
+            return state
+
+        patched = _apply_change_log(state, snapshot, changed)
+        for m in changed:
+            if m in patched:
+                state['months'][str(m)]['version'] = versions.get(m)
+            else:
+                state['months'][str(m)] = _month_record(versions.get(m), snapshot.get_events(m))
+        state['change_seq'] = data_loader.sync_changes(year=snapshot.year)[1]
+
+        before = {num: set(st['flags']) for num, st in state['students'].items()}
+        state['students'] = _evaluate(state, snapshot)
+        state['new_flags'] = {num: [f for f in st['flags'] if f not in before.get(num, set())]
+                              for num, st in state['students'].items()}
+        state['new_flags'] = {num: flags for num, flags in state['new_flags'].items() if flags}
+        state['mode'] = 'delta'
+        _save(state, snapshot.year)
+        return state
+
+def current_streak(absence, today=None):
+    """오늘 기준으로 이어지고 있는 연속 결석일수 (마지막 결석 구간 이후 등교일이 지났으면 0)"""
+    if not absence or not absence.get('last_run'): return 0
+    _, end, days = absence['last_run']
+    last = datetime.date.fromisoformat(end)
+    today = today or datetime.date.today()
+    if today <= last or get_date_calculator().is_gap_all_holidays(last, today):
+        return days
+    return 0
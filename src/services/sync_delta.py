@@ -0,0 +1,151 @@
+import datetime
+import os
+import threading
+
+from src.paths import CACHE_DIR, DATA_DIR
+from src.utils.state_manager import StateManager
+
+# =============================================================================
+# [동기화 변경분] 월을 다시 파싱할 때 이전 저장본과 (번호, 날짜) 단위로 비교한 변경 목록
+# - 종류: ADDED(새 기록) / CORRECTED(같은 날 기록의 구분·사유 등 수정) / REMOVED(삭제)
+# - 변경 로그: reports/data/sync_changes_<학년도>.json, 동기화마다 일련번호(seq)가 붙은 묶음(batch)
+#   소비자(알림/누적 카운터 등)는 마지막으로 읽은 seq를 기억했다가 그 이후 묶음만 읽습니다.
+#   (캐시 삭제와 함께 지워지지 않도록 캐시 폴더가 아닌 데이터 폴더에 보관)
+# - 처음 받는 월(이전 저장본 없음)은 비교 대상이 없으므로 기록하지 않습니다.
+# =============================================================================
+ADDED = 'added'
+CORRECTED = 'corrected'
+REMOVED = 'removed'
+
+CHANGE_LOG_SIZE = 200   # 보관할 최근 묶음 수 (오래된 묶음부터 정리)
+_LOCK = threading.Lock()
+
+# 이벤트에서 변경 로그에 남기는 필드 (before/after)
+CHANGE_FIELDS = ['num', 'name', 'type', 'raw_type', 'time', 'reason', 'is_unexcused', 'kind', 'excuse', 'trip', 'is_menstrual']
+_SIGNATURE = ('name', 'type', 'raw_type', 'time', 'reason')
+
+def _log_file(ns):
+    return f"sync_changes_{ns}.json"
+
+def plain_event(e):
+    """이벤트 -> JSON으로 저장할 수 있는 딕셔너리 (날짜는 ISO 문자열)"""
+    d = {k: e[k] for k in CHANGE_FIELDS}
+    d.update(num=int(d['num']), kind=int(d['kind']), excuse=int(d['excuse']), trip=int(d['trip']),
+             is_unexcused=bool(d['is_unexcused']), is_menstrual=bool(d['is_menstrual']))
+    d['date'] = e['date'].isoformat()
+    return d
+
+def _signature(e):
+    return tuple(str(e[k] or '') for k in _SIGNATURE)
+
+def _by_key(events):
+    keyed = {}
+    for e in events:
+        keyed.setdefault((int(e['num']), e['date']), []).append(e)
+    return keyed
+
+# =============================================================================
+# 비교
+# =============================================================================
+def diff_events(old, new, month=None):
+    """
+    이전/새 이벤트 목록을 (번호, 날짜)로 맞춰 비교합니다.
+    같은 칸에 여러 기록이 있으면 내용이 같은 것끼리 먼저 짝짓고, 남은 것은 순서대로 수정/추가/삭제로 봅니다.
+    Returns: [{'change', 'num', 'name', 'date', 'month', 'before', 'after'}] (번호, 날짜 순)
+    """
+    old_by, new_by = _by_key(old), _by_key(new)
+    changes = []
+    for key in sorted(old_by.keys() | new_by.keys()):
+        before, after = list(old_by.get(key, [])), list(new_by.get(key, []))
+        for e in list(after):
+            match = next((o for o in before if _signature(o) == _signature(e)), None)
+            if match is not None:
+                before.remove(match)
+                after.remove(e)
+        for i in range(max(len(before), len(after))):
+            b = plain_event(before[i]) if i < len(before) else None
+            a = plain_event(after[i]) if i < len(after) else None
+            kind = CORRECTED if a and b else (ADDED if a else REMOVED)
+            changes.append({
+                'change': kind, 'num': key[0], 'name': (a or b)['name'], 'date': key[1].isoformat(),
+                'month': month if month is not None else key[1].month, 'before': b, 'after': a,
+            })
+    return changes
+
+def apply_changes(cells, changes):
+    """
+    (번호, 날짜 ISO) -> [plain 이벤트] 칸 딕셔너리에 변경 목록을 순서대로 적용 (제자리 수정).
+    누적 카운터의 변경분 반영, 이벤트 로그의 시점 복원에 함께 사용
+    """
+    for c in changes:
+        cell = cells.setdefault((c['num'], c['date']), [])
+        if c['before'] is not None:
+            old = next((e for e in cell if e == c['before']), None)
+            if old is not None: cell.remove(old)
+        if c['after'] is not None:
+            cell.append(c['after'])
+        if not cell: del cells[(c['num'], c['date'])]
+    return cells
+
+# =============================================================================
+# 변경 로그
+# =============================================================================
+def _migrate_legacy(ns):
+    """이전 버전이 캐시 폴더에 남긴 변경 로그를 데이터 폴더로 옮김 (한 번만)"""
+    legacy, path = CACHE_DIR / _log_file(ns), DATA_DIR / _log_file(ns)
+    if legacy.exists() and not path.exists():
+        try:
+            DATA_DIR.mkdir(parents=True, exist_ok=True)
+            os.replace(legacy, path)
+        except OSError as e:
+            print(f"⚠️ [Delta] 이전 변경 로그 이동 실패: {e}")
+
+def load_log(ns):
+    _migrate_legacy(ns)
+    return StateManager(str(DATA_DIR)).load_json(_log_file(ns), default={'seq': 0, 'batches': []})
+
+def record(ns, month, old, new):
+    """
+    재파싱한 월의 변경분을 로그에 추가. old가 None(처음 받는 월)이거나 변경이 없으면 기록하지 않음.
+    Returns: 변경 목록
+    """
+    if old is None: return []
+    changes = diff_events(old, new, month)
+    if not changes: return changes
+
+    with _LOCK:
+        log = load_log(ns)
+        log['seq'] += 1
+        log['batches'].append({
+            'seq': log['seq'],
+            'at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'month': month,
+            'changes': changes,
+        })
+        log['batches'] = log['batches'][-CHANGE_LOG_SIZE:]
+        StateManager(str(DATA_DIR)).save_json(_log_file(ns), log)
+
+    counts = summarize(changes)
+    print(f"   🔀 [Delta] {month}월 변경: 추가 {counts[ADDED]} / 수정 {counts[CORRECTED]} / 삭제 {counts[REMOVED]}")
+    return changes
+
+def latest_seq(ns):
+    return load_log(ns)['seq']
+
+def changes_since(ns, since=0, months=None):
+    """
+    since 이후 묶음의 변경 목록 (오래된 것부터).
+    Returns: (변경 목록, 마지막 seq, 완전 여부) - since 이후 묶음 일부가 이미 정리되었으면 완전 여부 False
+    """
+    log = load_log(ns)
+    since = since or 0
+    batches = [b for b in log['batches'] if b['seq'] > since]
+    complete = since >= log['seq'] or (bool(batches) and batches[0]['seq'] == since + 1)
+    changes = [c for b in batches if months is None or b['month'] in months for c in b['changes']]
+    return changes, log['seq'], complete
+
+def summarize(changes):
+    """{종류: 건수}"""
+    counts = {ADDED: 0, CORRECTED: 0, REMOVED: 0}
+    for c in changes: counts[c['change']] += 1
+    return counts
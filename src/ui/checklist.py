@@ -1,14 +1,14 @@
 import streamlit as st
 import os
-from src.components import generate_checklist as checklist_gen
+from src.components import report_pipeline
 from src.paths import REPORTS_DIR
 from src.ui.common import display_html_report
 
-def render(selected_months):
+def render(selected_months, snapshot=None):
     st.subheader("✅ 증빙서류 체크리스트")
     if st.button("📝 생성 실행") or st.session_state.get('checklist_done'):
         if not st.session_state.get('checklist_done'):
-            checklist_gen.run_checklists(selected_months)
+            report_pipeline.build(selected_months, snapshot, only=['checklist'])
             st.session_state['checklist_done'] = True
             
         tabs = st.tabs([f"{m}월" for m in selected_months])
@@ -2,18 +2,18 @@ import streamlit as st
 import os
 import datetime
 from src.services import data_loader, config_manager
-from src.components import universal_weekly_summary_batch as weekly_gen
-from src.components import universal_calendar_batch as calendar_gen
+from src.components import report_pipeline
 from src.paths import REPORTS_DIR
 from src.ui.common import display_html_report, set_page
 
-def render(current_year, all_months):
+def render(current_year, all_months, snapshot=None):
+    if snapshot is None: snapshot = data_loader.AttendanceSnapshot()
     st.header(f"👋 {current_year}학년도 출결 관리 대시보드")
     
     # 상단 요약 지표
     col_a, col_b, col_c = st.columns(3)
     with col_a:
-        st.metric(label="총 학생 수", value=f"{len(data_loader.get_master_roster())}명")
+        st.metric(label="총 학생 수", value=f"{len(snapshot.roster)}명")
     with col_b:
         st.metric(label="오늘 날짜", value=datetime.date.today().strftime("%Y-%m-%d"))
     with col_c:
@@ -45,13 +45,13 @@ def render(current_year, all_months):
         this_month = datetime.date.today().month
         target_months = [this_month] if this_month in all_months else [3]
         
-        # 파일이 없거나 오래되었으면 자동 생성 시도
+        # 파일이 없거나 오래되었으면 자동 생성 시도 (빌드 매니페스트로 판단, 최신이면 바로 표시)
         weekly_path = os.path.join(REPORTS_DIR, "weekly", f"{target_months[0]:02d}월_주간요약.html")
-        if not os.path.exists(weekly_path):
-            with st.spinner(f"{target_months[0]}월 주간 요약 생성 중..."):
-                try:
-                    weekly_gen.run_weekly(target_months)
-                except: st.error("데이터 로드 실패")
+        with st.spinner(f"{target_months[0]}월 주간 요약 확인 중..."):
+            try:
+                report_pipeline.build(target_months, snapshot, only=['weekly'])
+            except Exception as e:
+                st.error(f"오류: {e}")
         
         display_html_report(weekly_path, height=600)
 
@@ -60,10 +60,10 @@ def render(current_year, all_months):
         st.caption("※ 현재 월 기준으로 자동 생성된 생활기록 달력입니다.")
         calendar_path = os.path.join(REPORTS_DIR, "calendar", f"{target_months[0]:02d}월_생활기록_달력.html")
         
-        if not os.path.exists(calendar_path):
-            with st.spinner(f"{target_months[0]}월 달력 생성 중..."):
-                try:
-                    calendar_gen.run_calendar(target_months)
-                except: st.error("데이터 로드 실패")
+        with st.spinner(f"{target_months[0]}월 달력 확인 중..."):
+            try:
+                report_pipeline.build(target_months, snapshot, only=['calendar'])
+            except Exception as e:
+                st.error(f"오류: {e}")
         
         display_html_report(calendar_path, height=800)
@@ -1,15 +1,10 @@
 import streamlit as st
 import os
-from src.components import universal_monthly_report_batch as monthly_gen
+from src.components import report_pipeline
 from src.paths import REPORTS_DIR
 from src.ui.common import display_html_report
 
-try:
-    from src.components import universal_monthly_index as index_gen
-except ImportError:
-    index_gen = None
-
-def render(selected_months):
+def render(selected_months, snapshot=None):
     st.subheader("📑 월별/학급별 리포트")
     
     # 실행 버튼 (상태 저장)
@@ -17,8 +12,8 @@ def render(selected_months):
         if not selected_months: st.warning("월을 선택해주세요.")
         else:
             with st.spinner("생성 중..."):
-                monthly_gen.run_monthly_reports(selected_months)
-                if index_gen: index_gen.run_monthly_index(selected_months)
+                # 입력이 바뀐 월만 다시 생성 (빌드 매니페스트 기준)
+                report_pipeline.build(selected_months, snapshot, only=['monthly', 'index'])
             st.session_state['monthly_report_done'] = True # 상태 저장
             st.success("생성 완료!")
 
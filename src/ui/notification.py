@@ -3,7 +3,7 @@ from src.services import universal_notification
 from src.components import daily_alert_system as daily_bot
 from src.ui.common import set_page
 
-def render():
+def render(snapshot=None):
     st.subheader("🔔 텔레그램 알림 발송 센터")
     
     token, chat_id = universal_notification.get_telegram_config()
@@ -30,5 +30,5 @@ def render():
             st.write("### 🌅 오늘 아침 브리핑 (수동 실행)")
             if st.button("▶️ 브리핑 즉시 실행"):
                 with st.spinner("실행 중..."):
-                    daily_bot.run_daily_checks()
+                    daily_bot.run_daily_checks(snapshot=snapshot)
                 st.success("완료")
@@ -1,11 +1,10 @@
 import streamlit as st
 import os
-from src.components import universal_weekly_summary_batch as weekly_gen
-from src.components import universal_calendar_batch as calendar_gen
+from src.components import report_pipeline
 from src.paths import REPORTS_DIR
 from src.ui.common import display_html_report
 
-def render(selected_months):
+def render(selected_months, snapshot=None):
     st.subheader("📅 주간 요약 및 생활기록 달력")
     
     if st.button("📆 생성 실행") or st.session_state.get('weekly_calendar_done'):
@@ -15,14 +14,17 @@ def render(selected_months):
             if not st.session_state.get('weekly_calendar_done'):
                 with st.spinner("생성 중..."):
                     try:
-                        weekly_gen.run_weekly(selected_months)
-                        calendar_gen.run_calendar(selected_months)
+                        report_pipeline.build(selected_months, snapshot, only=['weekly', 'weekly_semester', 'calendar'])
                         st.session_state['weekly_calendar_done'] = True
                         st.success("완료!")
                     except Exception as e:
                         st.error(f"오류: {e}")
 
-            tabs = st.tabs([f"{m}월" for m in selected_months])
+            tabs = st.tabs([f"{m}월" for m in selected_months] + ["📚 학기별 주간"])
+            with tabs[-1]:
+                for name in ("1학기", "2학기"):
+                    with st.expander(f"{name} 주간 요약", expanded=(name == "1학기")):
+                        display_html_report(os.path.join(REPORTS_DIR, "weekly", f"{name}_주간요약.html"))
             for i, m in enumerate(selected_months):
                 with tabs[i]:
                     t1, t2 = st.tabs(["📊 주간 요약", "🗓️ 생활기록 달력"])
@@ -1,20 +1,137 @@
 import json
 import logging
+import os
+import threading
+import time
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Set, Optional, Any, Union
+from typing import Dict, FrozenSet, List, Set, Optional, Any, Tuple, Union
 from pathlib import Path
 
+import numpy as np
+
 from src.paths import ROOT_DIR
+from src.utils.run_length import connected_runs, school_days_between
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class HolidayStore:
+    """
+    프로세스 전체가 공유하는 휴일 파일(holidays_YYYY.json) 저장소.
+    - 연도별로 한 번만 읽고, 파일 mtime이 바뀌면(학사일정 저장 등) 다시 읽습니다.
+    - mtime 확인(stat)은 연도별로 CHECK_INTERVAL초에 한 번만 수행합니다.
+    """
+
+    CHECK_INTERVAL = 2.0
+
+    def __init__(self, search_dirs: Optional[List[Path]] = None):
+        # 탐색 경로 우선순위: 1. ROOT_DIR  2. ROOT_DIR/config
+        self.search_dirs = search_dirs or [ROOT_DIR, ROOT_DIR / "config"]
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _find(self, year: int) -> Tuple[Optional[Path], Optional[float]]:
+        filename = f"holidays_{year}.json"
+        for base in self.search_dirs:
+            path = Path(base) / filename
+            try:
+                return path, os.path.getmtime(path)
+            except OSError:
+                continue
+        return None, None
+
+    def _read(self, year: int, path: Optional[Path], mtime: Optional[float]) -> Dict[str, Any]:
+        details: Dict[str, str] = {}
+        if path is None:
+            logger.warning(f"Holiday file for {year} not found. Assuming no holidays.")
+        else:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    details = json.load(f)
+                logger.debug(f"Loaded holidays from {path}")
+            except Exception as e:
+                logger.error(f"Failed to load holidays from {path}: {e}")
+        return {
+            'path': path, 'mtime': mtime, 'checked_at': time.monotonic(),
+            'details': details, 'dates': frozenset(details.keys()),
+        }
+
+    def _entry(self, year: int) -> Dict[str, Any]:
+        entry = self._entries.get(year)
+        if entry is not None and time.monotonic() - entry['checked_at'] < self.CHECK_INTERVAL:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(year)
+            path, mtime = self._find(year)
+            if entry is not None and entry['path'] == path and entry['mtime'] == mtime:
+                entry['checked_at'] = time.monotonic()
+                return entry
+            entry = self._read(year, path, mtime)
+            self._entries[year] = entry
+            return entry
+
+    def get_details(self, year: int) -> Dict[str, str]:
+        """{'YYYY-MM-DD': 휴일명} (공유 객체이므로 수정하지 말 것)"""
+        return self._entry(year)['details']
+
+    def get_dates(self, year: int) -> FrozenSet[str]:
+        """'YYYY-MM-DD' 형식의 휴일 문자열 집합"""
+        return self._entry(year)['dates']
+
+    def get_path(self, year: int) -> Optional[Path]:
+        return self._entry(year)['path']
+
+    def version(self, year: int) -> Tuple[Optional[Path], Optional[float]]:
+        """파일이 바뀌면 달라지는 값 (캘린더 캐시 무효화 판단용)"""
+        entry = self._entry(year)
+        return entry['path'], entry['mtime']
+
+    def invalidate(self, year: Optional[int] = None) -> None:
+        with self._lock:
+            if year is None: self._entries.clear()
+            else: self._entries.pop(year, None)
+
+HOLIDAY_STORE = HolidayStore()
+
+class _AcademicYearCalendar:
+    """
+    한 학년도(3/1 ~ 다음 해 2월 말)의 등교일 비트맵과 누적합(prefix sum) 배열.
+    - bitmap[i]: 시작일 + i일이 등교일이면 True
+    - cum[i]: 시작일부터 i일 전까지의 등교일 수 (cum[0] = 0)
+    """
+
+    def __init__(self, academic_year: int, holidays: Set[date]):
+        self.academic_year = academic_year
+        self.start = date(academic_year, 3, 1)
+        self.end = date(academic_year + 1, 3, 1) - timedelta(days=1)
+
+        n_days = (self.end - self.start).days + 1
+        weekdays = (self.start.weekday() + np.arange(n_days)) % 7
+        bitmap = weekdays < 5  # 0~4: 월~금
+
+        for h in holidays:
+            if self.start <= h <= self.end:
+                bitmap[(h - self.start).days] = False
+
+        self.bitmap = bitmap
+        self.cum = np.concatenate(([0], np.cumsum(bitmap, dtype=np.int64)))
+        self.school_offsets = np.flatnonzero(bitmap)  # k번째 등교일의 시작일 기준 오프셋
+
+    def offset(self, d: date) -> int:
+        return (d - self.start).days
+
+    def count(self, start: date, end: date) -> int:
+        """start ~ end (둘 다 포함, 같은 학년도 범위) 등교일 수"""
+        return int(self.cum[self.offset(end) + 1] - self.cum[self.offset(start)])
+
 class DateCalculator:
     """
     날짜 계산 및 휴일 처리를 담당하는 유틸리티 클래스
-    - Singleton 패턴이 적용되지 않았으므로 인스턴스 생성 시 주의
-    - 휴일 데이터 캐싱 기능 포함
+    - 공용 인스턴스는 get_date_calculator()로 가져다 쓰세요 (학년도 캘린더를 프로세스 전체가 공유)
+    - 휴일 데이터는 HOLIDAY_STORE에서 가져오며, 파일이 바뀌면 캘린더를 다시 만듭니다.
+    - 학년도별 등교일 비트맵 + 누적합을 한 번 만들어 두고, 등교일 수/휴일 갭/다음·이전 등교일을 O(1)로 계산
     """
 
     def __init__(self, project_root: Optional[Union[str, Path]] = None):
@@ -27,54 +144,74 @@ class DateCalculator:
         else:
             self.project_root = ROOT_DIR
             
-        self.holidays_cache: Dict[int, Set[str]] = {}
+        # 다른 루트를 명시한 경우에만 그 경로를 포함한 별도 저장소 사용
+        if self.project_root.resolve() == ROOT_DIR.resolve():
+            self.holiday_store = HOLIDAY_STORE
+        else:
+            self.holiday_store = HolidayStore([ROOT_DIR, self.project_root, ROOT_DIR / "config"])
+        self.calendar_cache: Dict[int, _AcademicYearCalendar] = {}
+        self._calendar_versions: Dict[int, Any] = {}
 
-    def _load_holidays(self, year: int) -> Set[str]:
+    def _load_holidays(self, year: int) -> FrozenSet[str]:
         """
-        연도별 휴일 데이터를 로드하고 캐싱합니다.
+        연도별 휴일 데이터를 반환합니다. (공유 HOLIDAY_STORE에서 조회)
 
         Args:
             year: 로드할 연도
 
         Returns:
-            Set[str]: 'YYYY-MM-DD' 형식의 휴일 문자열 집합
+            FrozenSet[str]: 'YYYY-MM-DD' 형식의 휴일 문자열 집합
         """
-        if year in self.holidays_cache:
-            return self.holidays_cache[year]
-        
-        filename = f"holidays_{year}.json"
-        
-        # 탐색 경로 우선순위:
-        # 1. src.paths.ROOT_DIR
-        # 2. self.project_root (인스턴스 생성 시 전달된 경우)
-        # 3. ROOT_DIR/config
-        
-        candidate_paths = [
-            ROOT_DIR / filename,
-            self.project_root / filename,
-            ROOT_DIR / "config" / filename
-        ]
+        return self.holiday_store.get_dates(year)
+
+    @staticmethod
+    def academic_year_of(date_obj: date) -> int:
+        """학년도 (3월 시작): 2026-01-05 -> 2025"""
+        return date_obj.year if date_obj.month >= 3 else date_obj.year - 1
+
+    def _get_calendar(self, academic_year: int) -> _AcademicYearCalendar:
+        """
+        학년도 등교일 비트맵을 생성/캐싱합니다.
+        휴일 파일은 학년도 단위(holidays_2026.json에 2027-01-01 포함)와 연도 단위가 섞여 있으므로
+        holidays_{학년도}.json과 holidays_{학년도+1}.json 중 해당 기간에 속하는 날짜를 모두 반영합니다.
+        두 파일 중 하나라도 바뀌면(mtime 변경) 캘린더를 다시 만듭니다.
+        """
+        version = (self.holiday_store.version(academic_year), self.holiday_store.version(academic_year + 1))
+        cal = self.calendar_cache.get(academic_year)
+        if cal is not None and self._calendar_versions.get(academic_year) == version:
+            return cal
 
         holidays = set()
-        loaded = False
-        
-        for path in candidate_paths:
-            if path.exists():
+        for year in (academic_year, academic_year + 1):
+            for d_str in self._load_holidays(year):
                 try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        holidays = set(data.keys())
-                    logger.debug(f"Loaded holidays from {path}")
-                    loaded = True
-                    break
-                except Exception as e:
-                    logger.error(f"Failed to load holidays from {path}: {e}")
-        
-        if not loaded:
-            logger.warning(f"Holiday file for {year} not found. Assuming no holidays.")
+                    holidays.add(date.fromisoformat(d_str))
+                except ValueError:
+                    continue
+
+        cal = _AcademicYearCalendar(academic_year, holidays)
+        self.calendar_cache[academic_year] = cal
+        self._calendar_versions[academic_year] = version
+        return cal
 
-        self.holidays_cache[year] = holidays
-        return holidays
+    def academic_calendar(self, academic_year: int) -> _AcademicYearCalendar:
+        """학년도 등교일 비트맵/누적합 (배열 연산용, 읽기 전용으로 사용)"""
+        return self._get_calendar(academic_year)
+
+    def school_day_prefix(self, first: date, last: date) -> np.ndarray:
+        """
+        first ~ last(포함) 구간의 등교일 누적합 (학년도 경계를 넘어도 이어 붙임)
+        cum[i] = first부터 i일 전까지의 등교일 수 (길이 = 일수 + 1)
+        """
+        parts = []
+        current = first
+        while current <= last:
+            cal = self._get_calendar(self.academic_year_of(current))
+            seg_end = min(last, cal.end)
+            parts.append(cal.bitmap[cal.offset(current):cal.offset(seg_end) + 1])
+            current = seg_end + timedelta(days=1)
+        bitmap = np.concatenate(parts) if parts else np.zeros(0, dtype=bool)
+        return np.concatenate(([0], np.cumsum(bitmap, dtype=np.int64)))
 
     def is_school_day(self, date_obj: Union[date, datetime]) -> bool:
         """
@@ -88,19 +225,14 @@ class DateCalculator:
         """
         if isinstance(date_obj, datetime):
             date_obj = date_obj.date()
-            
-        if date_obj.weekday() >= 5: # 5: 토요일, 6: 일요일
-            return False 
-        
-        holidays = self._load_holidays(date_obj.year)
-        if date_obj.strftime("%Y-%m-%d") in holidays:
-            return False
-            
-        return True
+
+        cal = self._get_calendar(self.academic_year_of(date_obj))
+        return bool(cal.bitmap[cal.offset(date_obj)])
 
     def count_real_school_days(self, start_date: Union[date, datetime], end_date: Union[date, datetime]) -> int:
         """
         두 날짜 사이(시작일, 종료일 포함)의 실제 등교일 수를 계산합니다.
+        (학년도 누적합 배열의 차이로 계산하므로 기간 길이와 무관하게 O(1))
 
         Args:
             start_date: 시작 날짜
@@ -115,18 +247,64 @@ class DateCalculator:
         count = 0
         current = start_date
         while current <= end_date:
-            if self.is_school_day(current):
-                count += 1
-            current += timedelta(days=1)
+            # 학년도 경계를 넘는 기간은 학년도별로 나누어 합산
+            cal = self._get_calendar(self.academic_year_of(current))
+            seg_end = min(end_date, cal.end)
+            count += cal.count(current, seg_end)
+            current = seg_end + timedelta(days=1)
         return count
 
-    def group_consecutive_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def is_gap_all_holidays(self, after: Union[date, datetime], before: Union[date, datetime]) -> bool:
+        """
+        after와 before 사이(양 끝 제외)에 등교일이 하나도 없는지 확인합니다.
+        (두 결석일이 주말/휴일만 끼고 이어지는지 판단할 때 사용)
+        """
+        if isinstance(after, datetime): after = after.date()
+        if isinstance(before, datetime): before = before.date()
+
+        gap_start = after + timedelta(days=1)
+        gap_end = before - timedelta(days=1)
+        if gap_start > gap_end: return True
+        return self.count_real_school_days(gap_start, gap_end) == 0
+
+    def next_school_day(self, date_obj: Union[date, datetime]) -> Optional[date]:
+        """date_obj 다음(당일 제외) 첫 등교일. 휴일 데이터 범위를 크게 벗어나면 None"""
+        if isinstance(date_obj, datetime): date_obj = date_obj.date()
+
+        academic_year = self.academic_year_of(date_obj)
+        cal = self._get_calendar(academic_year)
+        k = int(cal.cum[cal.offset(date_obj) + 1])  # 당일까지의 등교일 수 = 다음 등교일의 순번
+        for ay in range(academic_year, academic_year + 2):
+            if ay != academic_year:
+                cal, k = self._get_calendar(ay), 0
+            if k < len(cal.school_offsets):
+                return cal.start + timedelta(days=int(cal.school_offsets[k]))
+        return None
+
+    def prev_school_day(self, date_obj: Union[date, datetime]) -> Optional[date]:
+        """date_obj 이전(당일 제외) 마지막 등교일. 휴일 데이터 범위를 크게 벗어나면 None"""
+        if isinstance(date_obj, datetime): date_obj = date_obj.date()
+
+        academic_year = self.academic_year_of(date_obj)
+        cal = self._get_calendar(academic_year)
+        k = int(cal.cum[cal.offset(date_obj)])  # 전날까지의 등교일 수
+        for ay in range(academic_year, academic_year - 2, -1):
+            if ay != academic_year:
+                cal = self._get_calendar(ay)
+                k = len(cal.school_offsets)
+            if k > 0:
+                return cal.start + timedelta(days=int(cal.school_offsets[k - 1]))
+        return None
+
+    def group_consecutive_events(self, events: List[Dict[str, Any]], by: Tuple[str, ...] = ('name',)) -> List[Dict[str, Any]]:
         """
         [핵심 로직] 연속된 결석/조퇴 등의 이벤트를 하나로 묶고 실제 등교일 수를 계산합니다.
         중간에 휴일이 끼어있어도 논리적으로 연속되면 하나로 묶습니다 (Bridge 적용).
+        여러 학생을 한 번에 넘기면 정렬 + run-length 연산 한 번으로 모두 처리합니다.
 
         Args:
             events: 이벤트 딕셔너리 리스트 (필수 키: 'name', 'raw_type', 'date' 또는 'start'/'end')
+            by: 학생을 구분하는 키 (기본 이름, 예: ('num', 'name'))
 
         Returns:
             List[Dict[str, Any]]: 그룹화된 이벤트 리스트
@@ -152,56 +330,48 @@ class DateCalculator:
 
         if not sanitized_events: return []
 
-        # 2. 정렬 (이름 -> 시작일 순)
-        sanitized_events.sort(key=lambda x: (x['name'], x['start']))
+        # 2. 정렬 (학생 키(기본 이름) -> 시작일 순, 안정 정렬) - 키 값은 정렬된 고유값 코드로 변환
+        n = len(sanitized_events)
+        starts = np.fromiter((x['start'].toordinal() for x in sanitized_events), dtype=np.int64, count=n)
+        ends = np.fromiter((x['end'].toordinal() for x in sanitized_events), dtype=np.int64, count=n)
+        sort_codes = []
+        for field in by:
+            values = np.empty(n, dtype=object)
+            values[:] = [x.get(field) for x in sanitized_events]
+            sort_codes.append(np.unique(values, return_inverse=True)[1])
+        order = np.lexsort((starts, *reversed(sort_codes)))
+
+        # 3. 분리 키: 학생 + 결석 사유(raw_type)가 같아야 같은 그룹
+        key_ids = {}
+        keys = np.fromiter((key_ids.setdefault(tuple(x.get(f) for f in by) + (x.get('raw_type'),), len(key_ids))
+                            for x in sanitized_events), dtype=np.int64, count=n)
+
+        # 4. 등교일 누적합 위에서 run-length로 묶음 (사이에 등교일이 없으면 연속)
+        base = int(min(starts.min(), ends.min()))
+        cum = self.school_day_prefix(date.fromordinal(base), date.fromordinal(int(max(starts.max(), ends.max()))))
+        s_idx, e_idx = starts[order] - base, ends[order] - base
+        firsts, lasts = connected_runs(keys[order], s_idx, e_idx, cum)
+        real_days = school_days_between(s_idx[firsts], e_idx[lasts], cum)
 
         grouped = []
-        current = sanitized_events[0].copy()
-        
-        for i in range(1, len(sanitized_events)):
-            next_event = sanitized_events[i]
-            
-            # 3. 분리 조건: 학생이 다르거나 결석 사유가 다르면 분리
-            if (current['name'] != next_event['name']) or \
-               (current.get('raw_type') != next_event.get('raw_type')):
-                current['real_days'] = self.count_real_school_days(current['start'], current['end'])
-                grouped.append(current)
-                current = next_event.copy()
-                continue
-            
-            # 4. 연속성 판단 (Gap 검사)
-            # current['end'] 다음 날부터 next_event['start'] 전날까지가 모두 휴일이어야 연속으로 인정
-            gap_start = current['end'] + timedelta(days=1)
-            gap_end = next_event['start']
-            
-            is_connected = True
-            
-            if gap_start < gap_end:
-                # 갭이 존재하는 경우: 사이의 모든 날짜가 등교일이 아니어야 함 (휴일이어야 함)
-                check_date = gap_start
-                while check_date < gap_end:
-                    if self.is_school_day(check_date): 
-                        is_connected = False # 평일(등교일)이 끼어있으면 연속 아님
-                        break
-                    check_date += timedelta(days=1)
-            elif gap_start > gap_end:
-                 # 데이터 순서가 꼬인 경우 (방어적 처리: 분리)
-                is_connected = False
-
-            if is_connected:
-                # 기간 연장 (병합)
-                current['end'] = next_event['end']
-                
-                # 메타데이터 병합 (필요 시 로직 추가)
-                # 예: 비고란 합치기 등
-            else:
-                # 연결되지 않음 -> 현재 그룹 종료 및 저장
-                current['real_days'] = self.count_real_school_days(current['start'], current['end'])
-                grouped.append(current)
-                current = next_event.copy()
-        
-        # 마지막 항목 처리
-        current['real_days'] = self.count_real_school_days(current['start'], current['end'])
-        grouped.append(current)
-        
+        for f, l, days in zip(firsts.tolist(), lasts.tolist(), real_days.tolist()):
+            current = sanitized_events[order[f]].copy()
+            current['end'] = sanitized_events[order[l]]['end']
+            current['real_days'] = int(days)
+            grouped.append(current)
         return grouped
+
+# =============================================================================
+# 공용 인스턴스 (data_loader / 각 컴포넌트가 같은 캘린더를 공유)
+# =============================================================================
+_SHARED_CALCULATOR: Optional[DateCalculator] = None
+_SHARED_LOCK = threading.Lock()
+
+def get_date_calculator() -> DateCalculator:
+    """프로세스 전체가 공유하는 DateCalculator 인스턴스"""
+    global _SHARED_CALCULATOR
+    if _SHARED_CALCULATOR is None:
+        with _SHARED_LOCK:
+            if _SHARED_CALCULATOR is None:
+                _SHARED_CALCULATOR = DateCalculator()
+    return _SHARED_CALCULATOR
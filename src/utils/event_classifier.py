@@ -0,0 +1,92 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# [이벤트 분류] 시트 구분 문자열을 수집 시점에 한 번만 정수 코드로 분류
+# - 리포트/알림은 문자열 검색 대신 아래 코드로 필터링합니다.
+# - 저장소(event_store)에 열로 함께 저장되므로 다시 계산하지 않습니다.
+# =============================================================================
+
+# 종류 (kind): 키워드가 여러 개면 아래 순서(결석 > 지각 > 조퇴 > 결과)가 우선
+KIND_NONE = 0
+KIND_ABSENCE = 1   # 결석
+KIND_LATE = 2      # 지각
+KIND_EARLY = 3     # 조퇴
+KIND_RESULT = 4    # 결과
+
+KIND_KEYWORDS = [(KIND_ABSENCE, "결석"), (KIND_LATE, "지각"), (KIND_EARLY, "조퇴"), (KIND_RESULT, "결과")]
+PARTIAL_KINDS = (KIND_LATE, KIND_EARLY, KIND_RESULT)
+
+# 사유 구분 (excuse): 0~3은 학급 통계표의 칸 순서(질병, 미인정, 기타, 인정)와 같음
+EXCUSE_DISEASE = 0      # 질병 (명시)
+EXCUSE_UNEXCUSED = 1    # 미인정/무단
+EXCUSE_OTHER = 2        # 기타
+EXCUSE_AUTHORIZED = 3   # 인정 (체험학습, 생리인정 등)
+EXCUSE_UNSPECIFIED = 4  # 표기 없음 (통계표에서는 질병 칸으로 집계)
+
+# 체험학습 (trip)
+TRIP_NONE = 0
+TRIP_DOMESTIC = 1
+TRIP_INTERNATIONAL = 2
+
+TRIP_KEYWORDS = ["체험", "교외"]
+INTERNATIONAL_KEYWORDS = ["국외", "해외", "유학", "출국", "비자"]
+MENSTRUAL_KEYWORD = "생리"
+
+CLASS_FIELDS = ['kind', 'excuse', 'trip', 'is_menstrual']
+
+def _contains_any(series: pd.Series, keywords: Sequence[str]) -> np.ndarray:
+    mask = np.zeros(len(series), dtype=bool)
+    for k in keywords:
+        mask |= series.str.contains(k, regex=False).to_numpy(dtype=bool)
+    return mask
+
+def classify_events(raw_types: Sequence[str], reasons: Sequence[str], unexcused: Sequence[bool]) -> Dict[str, List]:
+    """
+    이벤트 여러 건을 한 번에 분류합니다.
+
+    Args:
+        raw_types: 구분 코드 (예: 질병조퇴)
+        reasons: 대괄호 사유 (예: 병원)
+        unexcused: 원문에 미인정/무단이 있는지 여부
+
+    Returns:
+        Dict[str, List]: CLASS_FIELDS 각각의 값 리스트 (입력과 같은 순서)
+    """
+    if len(raw_types) == 0: return {k: [] for k in CLASS_FIELDS}
+
+    raw = pd.Series(list(raw_types), dtype=object).fillna("")
+    rsn = pd.Series(list(reasons), dtype=object).fillna("").astype(str)
+    unexc = np.asarray(list(unexcused), dtype=bool)
+
+    kind = np.select([raw.str.contains(k, regex=False).to_numpy(dtype=bool) for _, k in KIND_KEYWORDS],
+                     [code for code, _ in KIND_KEYWORDS], default=KIND_NONE)
+
+    excuse = np.select(
+        [unexc,
+         raw.str.contains("인정", regex=False).to_numpy(dtype=bool),
+         raw.str.contains("기타", regex=False).to_numpy(dtype=bool),
+         raw.str.contains("질병", regex=False).to_numpy(dtype=bool)],
+        [EXCUSE_UNEXCUSED, EXCUSE_AUTHORIZED, EXCUSE_OTHER, EXCUSE_DISEASE],
+        default=EXCUSE_UNSPECIFIED)
+
+    # 체험학습: 구분+사유(공백 제거)에 키워드가 있고 미인정이 아닌 경우
+    full_text = (raw + rsn).str.replace(" ", "", regex=False)
+    is_trip = _contains_any(full_text, TRIP_KEYWORDS) & ~unexc
+    is_intl = _contains_any(full_text, INTERNATIONAL_KEYWORDS)
+    trip = np.where(is_trip, np.where(is_intl, TRIP_INTERNATIONAL, TRIP_DOMESTIC), TRIP_NONE)
+
+    menstrual = (raw.str.contains(MENSTRUAL_KEYWORD, regex=False) | rsn.str.contains(MENSTRUAL_KEYWORD, regex=False))
+
+    return {
+        'kind': kind.tolist(),
+        'excuse': excuse.tolist(),
+        'trip': trip.tolist(),
+        'is_menstrual': menstrual.to_numpy(dtype=bool).tolist(),
+    }
+
+def class_column(excuse: int) -> int:
+    """학급 통계표 칸 번호 (0:질병, 1:미인정, 2:기타, 3:인정) - 표기 없음은 질병으로 집계"""
+    return EXCUSE_DISEASE if excuse == EXCUSE_UNSPECIFIED else excuse
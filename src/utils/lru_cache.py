@@ -0,0 +1,58 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class LRUCache:
+    """
+    크기 제한이 있는 프로세스 내 LRU 캐시 (스레드 안전)
+    - 가장 오래 쓰지 않은 항목부터 밀려납니다.
+    - 적중(hit)/실패(miss) 횟수를 기록합니다.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        key를 주면 그 항목만, predicate를 주면 조건에 맞는 항목들을, 둘 다 없으면 전체를 비웁니다.
+
+        Returns:
+            int: 지운 항목 수
+        """
+        with self._lock:
+            if key is not None:
+                return 1 if self._data.pop(key, None) is not None else 0
+            if predicate is not None:
+                targets = [k for k in self._data if predicate(k)]
+                for k in targets: del self._data[k]
+                return len(targets)
+            count = len(self._data)
+            self._data.clear()
+            return count
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,83 @@
+import io
+import os
+import contextlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+# =============================================================================
+# [병렬 렌더링] 작업(인자 없는 함수) 목록을 프로세스 풀에 나눠 실행
+# - fork 방식: 부모가 미리 읽어 둔 스냅샷/템플릿을 자식이 복사 없이(copy-on-write) 그대로 사용
+#   작업 함수는 피클링하지 않고 전역 목록에 두었다가 자식에게는 번호만 넘깁니다.
+# - 자식의 print 출력은 모아 두었다가 작업 순서대로 출력 -> 실행 순서와 무관하게 같은 로그
+# - fork를 쓸 수 없는 환경(Windows 등)이나 작업자 1명이면 현재 프로세스에서 순서대로 실행
+# - 다른 스레드가 돌고 있으면(Streamlit 세션, 백그라운드 갱신 스레드 등) 역시 순서대로 실행:
+#   fork 시점에 그 스레드가 잡고 있던 잠금(상태 파일/LRU/logging)이 자식에서 영원히 풀리지 않을 수 있음
+# =============================================================================
+_JOBS: Sequence[Callable[[], Any]] = ()
+
+def resolve_workers(setting: Optional[int] = None) -> int:
+    """작업자 수 설정값 -> 실제 프로세스 수 (0/None: CPU 코어 수)"""
+    if not setting or setting < 0:
+        return os.cpu_count() or 1
+    return int(setting)
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+def fork_safe() -> bool:
+    """현재 프로세스에 메인 스레드만 있어 fork해도 잠금이 꼬이지 않는지 (CLI 실행)"""
+    return threading.active_count() == 1
+
+def effective_workers(workers: int) -> int:
+    """실제로 쓸 수 있는 프로세스 수 (fork 불가 또는 다른 스레드 실행 중이면 1)"""
+    if workers <= 1: return 1
+    if not fork_available(): return 1
+    if not fork_safe():
+        print(f"ℹ️ [Parallel] 다른 스레드가 실행 중이어서 순서대로 렌더링합니다. (스레드 {threading.active_count()}개)")
+        return 1
+    return workers
+
+def _run_one(index: int) -> Tuple[bool, str]:
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            _JOBS[index]()
+        return True, buf.getvalue()
+    except Exception as e:
+        return False, buf.getvalue() + f"❌ [Parallel] 작업 실패: {e}\n"
+
+def run_jobs(jobs: Sequence[Callable[[], Any]], workers: int = 1) -> List[bool]:
+    """
+    Args:
+        jobs: 인자 없는 작업 함수 목록 (서로 다른 파일을 쓰는 작업이어야 함)
+        workers: 프로세스 수
+
+    Returns:
+        List[bool]: 작업별 성공 여부 (jobs 순서)
+    """
+    global _JOBS
+    workers = effective_workers(min(workers, len(jobs)))
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            try:
+                job()
+                results.append(True)
+            except Exception as e:
+                print(f"❌ [Parallel] 작업 실패: {e}")
+                results.append(False)
+        return results
+
+    _JOBS = jobs
+    try:
+        ctx = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            outcomes = list(pool.map(_run_one, range(len(jobs))))
+    finally:
+        _JOBS = ()
+
+    for _, output in outcomes:
+        if output: print(output, end="")
+    return [ok for ok, _ in outcomes]
@@ -0,0 +1,37 @@
+from typing import Tuple
+
+import numpy as np
+
+# =============================================================================
+# [연속 구간 엔진] 정렬된 (키, 시작일, 종료일) 배열을 run-length로 묶는 벡터 연산
+# - 날짜는 등교일 누적합 배열(cum)의 인덱스로 받습니다. (cum[i] = 0 ~ i-1일의 등교일 수)
+# - 같은 키에서 다음 시작일이 이전 종료일보다 뒤이고, 그 사이(양 끝 제외)에 등교일이 없으면 연속
+#   (같은 날/겹치는 기록은 연속으로 보지 않음)
+# - DateCalculator.group_consecutive_events, AttendanceMatrix.streaks 가 함께 사용
+# =============================================================================
+
+def connected_runs(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray, cum: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Args:
+        keys: 그룹 키 코드 (값이 바뀌면 구간 분리), 키별로 시작일 순 정렬되어 있어야 함
+        starts, ends: 각 기록의 시작/종료일 (cum 인덱스)
+        cum: 등교일 누적합
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 각 구간의 첫/마지막 기록 위치
+    """
+    n = len(starts)
+    if n == 0: return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    prev_end = ends[:-1]
+    nxt_start = starts[1:]
+    connected = (keys[1:] == keys[:-1]) & (nxt_start > prev_end) & (cum[nxt_start] - cum[prev_end + 1] == 0)
+
+    breaks = np.flatnonzero(~connected) + 1
+    firsts = np.concatenate(([0], breaks)).astype(np.int64)
+    lasts = np.concatenate((breaks - 1, [n - 1])).astype(np.int64)
+    return firsts, lasts
+
+def school_days_between(starts: np.ndarray, ends: np.ndarray, cum: np.ndarray) -> np.ndarray:
+    """start ~ end(포함) 등교일 수 (배열)"""
+    return cum[ends + 1] - cum[starts]
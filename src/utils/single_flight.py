@@ -0,0 +1,49 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 호출을 하나로 합치는 유틸리티 클래스
+    - 처음 호출한 스레드만 실제 함수를 실행하고, 그동안 들어온 같은 키의 호출은 그 결과를 기다렸다가 함께 받습니다.
+    - 결과는 캐시하지 않습니다. 실행이 끝나면 다음 호출은 다시 실행됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Dict[str, Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Args:
+            key: 합칠 요청을 구분하는 키 (예: ('month', 2025, 3))
+            fn: 실제로 실행할 함수
+
+        Returns:
+            Any: fn의 반환값 (대기한 호출도 같은 객체를 받으므로 제자리 수정 금지)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None: raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn(*args, **kwargs)
+            return call['result']
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['event'].set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
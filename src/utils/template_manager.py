@@ -1,9 +1,146 @@
 import os
+import json
+import hashlib
+import threading
+import uuid
 from pathlib import Path
-from typing import Optional, Union, Any, Dict
-from jinja2 import Environment, FileSystemLoader
+from typing import Optional, Union, Any, Dict, List, Tuple
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, ModuleLoader, ChoiceLoader, Template
 
-from src.paths import ROOT_DIR
+from src.paths import ROOT_DIR, CACHE_DIR, SRC_DIR
+
+try:
+    from src.services.config_manager import GLOBAL_CONFIG
+except ImportError:
+    GLOBAL_CONFIG = {}
+
+# =============================================================================
+# [공유 템플릿 환경] 프로세스 전체가 템플릿 폴더당 Jinja2 Environment 하나를 공유
+# - 컴파일 결과(bytecode)는 CACHE_DIR/jinja_bytecode 에 저장 -> 다음 실행(CLI/Streamlit rerun)은 파싱/컴파일 생략
+#   (원본이 바뀌면 체크섬이 달라져 자동으로 다시 컴파일)
+# - precompile_templates(): 템플릿 전체를 CACHE_DIR/jinja_compiled 아래 파이썬 모듈로 미리 컴파일
+#   config.json "precompile_templates": true 면 처음 사용할 때 자동으로 컴파일해 둡니다.
+#   원본 파일(이름/수정 시각/크기)이 컴파일 당시와 다르면 미리 컴파일한 모듈은 쓰지 않습니다.
+# =============================================================================
+TEMPLATE_DIR = SRC_DIR / "templates"
+BYTECODE_DIR = CACHE_DIR / "jinja_bytecode"
+PRECOMPILED_DIR = CACHE_DIR / "jinja_compiled"
+STAMP_FILE = "stamp.json"
+
+_ENVS: Dict[str, Tuple[Environment, Optional[str]]] = {}  # 폴더 -> (환경, 미리 컴파일 지문)
+_ENV_LOCK = threading.Lock()
+
+def _dir_key(template_dir: Union[str, Path]) -> str:
+    return str(Path(template_dir).resolve())
+
+def _source_stamp(template_dir: Union[str, Path]) -> str:
+    """템플릿 원본 목록의 (이름, 수정 시각, 크기) 지문 - 파일 내용은 읽지 않음"""
+    entries: List[Any] = []
+    for root, _, files in os.walk(template_dir):
+        for name in sorted(files):
+            st = os.stat(os.path.join(root, name))
+            entries.append([os.path.relpath(os.path.join(root, name), template_dir), st.st_mtime_ns, st.st_size])
+    return hashlib.blake2b(json.dumps(sorted(entries)).encode("utf-8"), digest_size=12).hexdigest()
+
+def _compiled_dir(template_dir: Union[str, Path]) -> Path:
+    return PRECOMPILED_DIR / hashlib.blake2b(_dir_key(template_dir).encode("utf-8"), digest_size=6).hexdigest()
+
+def _compiled_stamp(template_dir: Union[str, Path]) -> Optional[str]:
+    try:
+        with open(_compiled_dir(template_dir) / STAMP_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("stamp")
+    except (OSError, ValueError):
+        return None
+
+def precompile_templates(template_dir: Optional[Union[str, Path]] = None) -> int:
+    """
+    템플릿 폴더 전체를 파이썬 모듈로 미리 컴파일 (ModuleLoader로 바로 import)
+
+    Returns:
+        int: 컴파일한 템플릿 수
+    """
+    template_dir = Path(template_dir or TEMPLATE_DIR)
+    out_dir = _compiled_dir(template_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = _source_stamp(template_dir)
+
+    env = Environment(loader=FileSystemLoader(str(template_dir)))
+    names = env.list_templates()
+    env.compile_templates(str(out_dir), zip=None, ignore_errors=False)
+    with open(out_dir / STAMP_FILE, "w", encoding="utf-8") as f:
+        json.dump({"stamp": stamp, "templates": names}, f, ensure_ascii=False)
+
+    with _ENV_LOCK:
+        _ENVS.pop(_dir_key(template_dir), None)  # 다음 호출에서 새 모듈로 환경 재구성
+    return len(names)
+
+def _create_env(template_dir: Path) -> Tuple[Environment, Optional[str]]:
+    BYTECODE_DIR.mkdir(parents=True, exist_ok=True)
+    loader: Any = FileSystemLoader(str(template_dir))
+
+    stamp = None
+    if GLOBAL_CONFIG.get("precompile_templates", False):
+        stamp = _source_stamp(template_dir)
+        if _compiled_stamp(template_dir) != stamp:
+            try:
+                precompile_templates(template_dir)
+            except Exception as e:
+                print(f"⚠️ [TemplateManager] 템플릿 미리 컴파일 실패: {e}")
+        if _compiled_stamp(template_dir) == stamp:
+            loader = ChoiceLoader([ModuleLoader(str(_compiled_dir(template_dir))), loader])
+        else:
+            stamp = None
+
+    env = Environment(loader=loader, bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_DIR)))
+    return env, stamp
+
+def get_template_env(template_dir: Optional[Union[str, Path]] = None) -> Environment:
+    """
+    템플릿 폴더의 공유 Environment (처음 호출 때 생성)
+    미리 컴파일한 모듈을 쓰는 중에 원본이 바뀌면 환경을 다시 만듭니다.
+    """
+    template_dir = Path(template_dir or TEMPLATE_DIR)
+    key = _dir_key(template_dir)
+    with _ENV_LOCK:
+        cached = _ENVS.get(key)
+        if cached is not None and (cached[1] is None or cached[1] == _source_stamp(template_dir)):
+            return cached[0]
+    env, stamp = _create_env(template_dir)
+    with _ENV_LOCK:
+        _ENVS[key] = (env, stamp)
+    return env
+
+# =============================================================================
+# [스트리밍 저장] 렌더링 결과를 문자열로 모으지 않고 조각 단위로 파일에 바로 기록
+# - Template.stream()을 STREAM_CHUNK 조각씩 묶어 WRITE_BUFFER 크기 버퍼로 기록 -> 리포트가 커져도 메모리 일정
+# - 같은 폴더의 임시 파일에 쓴 뒤 os.replace로 교체 -> 중간에 실패해도 기존 리포트는 그대로
+# =============================================================================
+STREAM_CHUNK = 64            # 템플릿 출력 조각 몇 개씩 묶어서 기록할지
+WRITE_BUFFER = 1024 * 1024   # 파일 쓰기 버퍼 (bytes)
+
+def stream_to_file(template: Template, context: Dict[str, Any], output_path: Union[str, Path]) -> Path:
+    """
+    템플릿을 output_path로 스트리밍 렌더링 (임시 파일 -> 원자적 교체)
+
+    Returns:
+        Path: 저장한 파일 경로
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # 호출마다 고유한 임시 파일 -> 여러 세션(스레드)이 같은 리포트를 동시에 만들어도 서로 섞이지 않음
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        stream = template.stream(**context)
+        stream.enable_buffering(STREAM_CHUNK)
+        with open(tmp_path, "x", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+            stream.dump(f)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+    return output_path
 
 class TemplateManager:
     """
@@ -31,7 +168,8 @@ class TemplateManager:
                  # 폴더가 없으면 생성 시도
                  self.template_dir.mkdir(parents=True, exist_ok=True)
             
-        self.env = Environment(loader=FileSystemLoader(str(self.template_dir)))
+        # 같은 폴더를 쓰는 TemplateManager들은 환경(파싱/컴파일 캐시)을 공유
+        self.env = get_template_env(self.template_dir)
 
     def render_and_save(self, template_name: str, context: Dict[str, Any], output_path: Union[str, Path]) -> bool:
         """
@@ -47,17 +185,8 @@ class TemplateManager:
         """
         try:
             template = self.env.get_template(template_name)
-            html_content = template.render(**context)
-            
-            output_path = Path(output_path)
-            
-            # 출력 폴더가 없으면 생성
-            if not output_path.parent.exists():
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
-                
+            # 스트리밍 렌더링 + 원자적 교체 (출력 폴더가 없으면 생성)
+            stream_to_file(template, context, output_path)
             return True
         except Exception as e:
             print(f"❌ [TemplateManager] HTML 생성 실패 ({template_name}): {e}")
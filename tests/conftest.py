@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# 저장소 루트를 import 경로에 추가 (src 패키지)
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
+
+from src.utils import event_classifier as ec
+
+ROSTER = {1: '김하나', 2: '이두리', 3: '박세나', 4: '최네리'}
+
+def build_events(rows, roster=ROSTER):
+    """(번호, 날짜, 구분[, 사유]) 목록 -> 분류 코드까지 채운 이벤트 (시트 파싱 결과와 같은 형식)"""
+    rows = [tuple(r) + ('',) * (4 - len(r)) for r in rows]
+    codes = ec.classify_events([r[2] for r in rows], [r[3] for r in rows], ['미인정' in r[2] for r in rows])
+    events = []
+    for i, (num, day, raw, reason) in enumerate(rows):
+        e = {'num': num, 'name': roster.get(num, f'{num}번'), 'date': day, 'type': raw, 'raw_type': raw,
+             'time': '', 'reason': reason, 'is_unexcused': '미인정' in raw}
+        e.update({f: codes[f][i] for f in ec.CLASS_FIELDS})
+        events.append(e)
+    return events
+
+@pytest.fixture
+def roster():
+    return dict(ROSTER)
+
+@pytest.fixture
+def make_events():
+    return build_events
@@ -0,0 +1,85 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+from src.components import report_pipeline
+from src.services import data_loader
+
+YEAR = 2025
+MONTHS = [3, 4]
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch, roster):
+    """출력 폴더/매니페스트를 임시 폴더로, 대상은 렌더링 횟수를 세는 가짜 산출물 하나"""
+    out_dir = tmp_path / "fake"
+    rendered = []
+
+    def run(months, snapshot):
+        out_dir.mkdir(exist_ok=True)
+        for m in months:
+            (out_dir / f"{m:02d}.html").write_text(f"{m} {len(snapshot.roster)}", encoding="utf-8")
+            rendered.append(m)
+
+    target = {
+        'id': 'fake', 'module': sys.modules[__name__], 'per_month': True,
+        'inputs': ['events', 'roster'], 'templates': [],
+        'outputs': lambda m: [os.path.join(str(out_dir), f"{m:02d}.html")],
+        'run': run,
+    }
+    events = {m: [] for m in MONTHS}
+    monkeypatch.setattr(report_pipeline, 'REPORTS_DIR', tmp_path)
+    monkeypatch.setattr(report_pipeline, 'TARGETS', [target])
+
+    class Env:
+        def build(self, roster=roster, **kw):
+            rendered.clear()
+            snapshot = data_loader.AttendanceSnapshot(roster=roster, months=MONTHS, year=YEAR, events=dict(events))
+            result = report_pipeline.build(MONTHS, snapshot, workers=1, **kw)
+            return sorted(rendered), result
+    env = Env()
+    env.events, env.out_dir = events, out_dir
+    return env
+
+def test_unchanged_inputs_are_skipped(pipeline):
+    rendered, result = pipeline.build()
+    assert rendered == MONTHS and result['built'] == ['2025/fake/03', '2025/fake/04']
+    assert os.path.exists(report_pipeline.REPORTS_DIR / report_pipeline.MANIFEST_FILE)
+
+    rendered, result = pipeline.build()
+    assert rendered == [] and result['skipped'] == ['2025/fake/03', '2025/fake/04']
+
+def test_changed_month_events_rebuild_only_that_month(pipeline, make_events):
+    pipeline.build()
+    pipeline.events[4] = make_events([(1, datetime.date(2025, 4, 7), '질병결석')])
+    rendered, result = pipeline.build()
+    assert rendered == [4]
+    assert result['skipped'] == ['2025/fake/03']
+
+def test_events_hash_follows_loaded_data_not_sync_state(pipeline, monkeypatch, make_events):
+    # 백그라운드 갱신으로 동기화 기록만 앞서 나가도, 스냅샷이 읽은 데이터가 같으면 다시 만들지 않음
+    pipeline.build()
+    monkeypatch.setattr(data_loader, 'month_versions', lambda months=None, year=None: {m: 'refreshed' for m in MONTHS})
+    assert pipeline.build()[0] == []
+    # 같은 데이터라도 한 칸이 바뀌면 그 월만 다시 생성
+    pipeline.events[3] = make_events([(2, datetime.date(2025, 3, 4), '질병지각')])
+    assert pipeline.build()[0] == [3]
+
+def test_changed_roster_rebuilds_everything(pipeline, roster):
+    pipeline.build()
+    rendered, _ = pipeline.build(roster={**roster, 5: '정다섯'})
+    assert rendered == MONTHS
+
+def test_missing_output_or_force_rebuilds(pipeline):
+    pipeline.build()
+    os.remove(pipeline.out_dir / "03.html")
+    assert pipeline.build()[0] == [3]
+    assert pipeline.build(force=True)[0] == MONTHS
+
+def test_failed_render_is_not_recorded(pipeline, monkeypatch):
+    target = report_pipeline.TARGETS[0]
+    monkeypatch.setitem(target, 'run', lambda months, snapshot: None)   # 출력 파일을 쓰지 못한 렌더링
+    rendered, result = pipeline.build()
+    assert result['built'] == []
+    assert report_pipeline.load_manifest()['artifacts'] == {}
@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+
+from src.services import event_log, sync_delta
+
+NS = "2025_test"
+D = lambda m, d: datetime.date(2025, m, d)
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_log, 'LOG_DIR', tmp_path / "event_log")
+    monkeypatch.setattr(event_log, '_LEGACY_DIR', tmp_path / "legacy")
+    monkeypatch.setattr(event_log, 'CHECKPOINT_EVERY', 3)
+    monkeypatch.setattr(event_log, 'SEGMENT_ENTRIES', 4)
+    return tmp_path
+
+def _plain(events):
+    return sorted((sync_delta.plain_event(e) for e in events), key=lambda e: (e['date'], e['num'], e['type']))
+
+def _record_history(make_events):
+    """동기화를 여러 번 흉내 내며 로그에 기록. Returns: seq별 {월: 이벤트} 상태"""
+    versions = [
+        (5, [(1, D(5, 12), '질병결석')]),
+        (6, [(2, D(6, 2), '질병지각')]),
+        (5, [(1, D(5, 12), '질병결석'), (1, D(5, 13), '질병결석')]),
+        (5, [(1, D(5, 12), '인정결석', '교외체험학습'), (1, D(5, 13), '질병결석')]),
+        (6, [(2, D(6, 2), '질병지각'), (3, D(6, 3), '생리결석')]),
+        (5, [(1, D(5, 13), '질병결석')]),
+        (5, [(1, D(5, 13), '질병결석'), (4, D(5, 13), '미인정결석'), (4, D(5, 13), '질병조퇴')]),
+        (6, [(3, D(6, 3), '생리결석')]),
+        (5, [(4, D(5, 13), '미인정결석')]),
+        (6, [(3, D(6, 3), '생리결석'), (2, D(6, 9), '질병결과')]),
+    ]
+    current, states = {}, {}
+    for month, rows in versions:
+        events = make_events(rows)
+        previous = current.get(month)
+        changes = sync_delta.diff_events(previous, events, month) if previous is not None else []
+        seq = event_log.append(NS, month, previous, events, changes)
+        current[month] = events
+        states[seq] = {m: _plain(ev) for m, ev in current.items()}
+    return states
+
+def _replayed(months):
+    return {m: _plain(event_log._events(cells)) for m, cells in months.items()}
+
+def test_replay_matches_every_recorded_state(log_dir, make_events):
+    states = _record_history(make_events)
+    head = event_log._head(NS)
+    assert head['seq'] == len(states)
+    assert [c['seq'] for c in head['checkpoints']] == [3, 6, 9]
+    assert head['segment'] == 3
+
+    for seq, expected in states.items():
+        months, _ = event_log._replay(NS, head, until_seq=seq)
+        assert _replayed(months) == expected
+
+def test_checkpoints_equal_full_replay(log_dir, make_events):
+    _record_history(make_events)
+    head = event_log._head(NS)
+    without = dict(head, checkpoints=[])
+    for seq in range(1, head['seq'] + 1):
+        with_ckpt, _ = event_log._replay(NS, head, until_seq=seq)
+        from_start, _ = event_log._replay(NS, without, until_seq=seq)
+        assert _replayed(with_ckpt) == _replayed(from_start)
+
+def test_state_at_and_latest_month(log_dir, make_events):
+    states = _record_history(make_events)
+    final = states[max(states)]
+    now = datetime.datetime.now() + datetime.timedelta(minutes=1)
+
+    assert {m: _plain(ev) for m, ev in event_log.state_at(NS, now).items()} == final
+    assert list(event_log.state_at(NS, now, months=[6])) == [6]
+    assert event_log.state_at(NS, datetime.date(2000, 1, 1)) == {}
+    assert _plain(event_log.latest_month(NS, 5)) == final[5]
+    assert event_log.latest_month(NS, 7) is None
+
+def test_history_lists_only_deltas(log_dir, make_events):
+    _record_history(make_events)
+    changes = event_log.history(NS, num=1, month=5)
+    assert [c['change'] for c in changes] == [sync_delta.ADDED, sync_delta.CORRECTED, sync_delta.REMOVED, sync_delta.REMOVED]
+    assert all(c['num'] == 1 and c['month'] == 5 for c in changes)
@@ -0,0 +1,66 @@
+import datetime
+
+import pytest
+
+from src.services import event_store
+
+D = datetime.date
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_store, 'STORE_DIR', tmp_path / "event_store")
+    return tmp_path
+
+@pytest.fixture
+def may(make_events):
+    return make_events([
+        (1, D(2025, 5, 12), '질병결석'),
+        (1, D(2025, 5, 13), '질병조퇴', '병원'),
+        (2, D(2025, 5, 12), '인정결석', '교외체험학습'),
+        (3, D(2025, 5, 20), '생리결석'),
+        (4, D(2025, 5, 21), '미인정지각'),
+    ])
+
+def test_round_trip(store, may):
+    assert event_store.write_month(2025, 5, may, sheet='s1')
+    loaded = event_store.read_month(2025, 5, sheet='s1')
+
+    assert [dict(e) for e in loaded] == may
+    assert loaded[0]['date'] == D(2025, 5, 12) and loaded[1].get('reason') == '병원'
+    # 임시 파일이 남지 않음
+    assert [p.name for p in event_store.partition_dir(2025, 5, sheet='s1').iterdir()] == [event_store.EVENTS_FILE]
+
+def test_round_trip_empty_and_missing(store):
+    assert event_store.write_month(2025, 6, [], sheet='s1')
+    assert event_store.read_month(2025, 6, sheet='s1') == []
+    assert event_store.read_month(2025, 7, sheet='s1') is None
+    assert event_store.month_timestamp(2025, 7, sheet='s1') is None
+
+def test_read_respects_ttl(store, may):
+    event_store.write_month(2025, 5, may, sheet='s1')
+    assert event_store.read_month(2025, 5, ttl=3600, sheet='s1') is not None
+    assert event_store.read_month(2025, 5, ttl=0, sheet='s1') is None
+
+def test_query_filters(store, may, make_events):
+    event_store.write_month(2025, 5, may, sheet='s1')
+    event_store.write_month(2025, 4, make_events([(1, D(2025, 4, 3), '질병결석')]), sheet='s1')
+    event_store.write_month(2024, 5, make_events([(1, D(2024, 5, 7), '질병결석')]), sheet='s1')
+    event_store.write_month(2025, 5, make_events([(1, D(2025, 5, 2), '질병결석')]), sheet='s2')
+
+    def rows(**kw):
+        table = event_store.query(sheet='s1', **kw)
+        return sorted(zip(table.column('num').to_pylist(), table.column('date').to_pylist()))
+
+    assert rows(year=2025, months=[5]) == sorted((e['num'], e['date']) for e in may)
+    assert rows(year=2025, num=1) == [(1, D(2025, 4, 3)), (1, D(2025, 5, 12)), (1, D(2025, 5, 13))]
+    assert rows(year=2025, months=[5], raw_type_contains='결석') == [
+        (1, D(2025, 5, 12)), (2, D(2025, 5, 12)), (3, D(2025, 5, 20))]
+    assert rows(num=1, months=[5]) == [(1, D(2024, 5, 7)), (1, D(2025, 5, 12)), (1, D(2025, 5, 13))]
+
+    table = event_store.query(2025, months=[4], columns=['num', 'raw_type'], sheet='s1')
+    assert table.column_names == ['num', 'raw_type']
+    assert table.column('raw_type').to_pylist() == ['질병결석']
+
+def test_query_missing_sheet_is_empty(store):
+    table = event_store.query(2025, sheet='nothing')
+    assert table.num_rows == 0 and table.schema == event_store.SCHEMA
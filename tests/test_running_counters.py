@@ -0,0 +1,117 @@
+import datetime
+
+import pytest
+
+from src.services import data_loader, running_counters, sync_delta
+
+YEAR = 2025
+MONTHS = [3, 4, 5]
+NS = f"{YEAR}_test"
+
+D = lambda m, d: datetime.date(YEAR, m, d)
+
+class FakeSync:
+    """동기화 기록(월별 지문) + 변경 로그를 흉내 - 월을 바꿀 때마다 지문을 올리고 변경분을 기록"""
+    def __init__(self, events):
+        self.events = {m: list(events.get(m, [])) for m in MONTHS}
+        self.versions = {m: 1 for m in MONTHS}
+
+    def set_month(self, month, events):
+        sync_delta.record(NS, month, self.events[month], events)
+        self.events[month] = list(events)
+        self.versions[month] += 1
+
+    def snapshot(self, roster):
+        return data_loader.AttendanceSnapshot(roster=roster, months=MONTHS, year=YEAR,
+                                              events={m: list(ev) for m, ev in self.events.items()})
+
+@pytest.fixture
+def counters_env(tmp_path, monkeypatch):
+    """카운터 파일/변경 로그를 임시 폴더로, 동기화 기록은 FakeSync로"""
+    monkeypatch.setattr(running_counters, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(sync_delta, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(sync_delta, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(data_loader, 'cache_namespace', lambda year=None: f"{year}_test")
+    monkeypatch.setattr(data_loader, 'sync_changes',
+                        lambda since=0, months=None, year=None: sync_delta.changes_since(NS, since, months))
+
+    def install(sync):
+        monkeypatch.setattr(data_loader, 'month_versions',
+                            lambda months=None, year=None: {m: sync.versions.get(m) for m in (months or MONTHS)})
+        return sync
+    return install
+
+def _initial(make_events):
+    return {
+        3: make_events([(1, D(3, 10), '질병결석'), (1, D(3, 11), '질병결석'), (2, D(3, 20), '인정결석', '교외체험학습')]),
+        4: make_events([(3, D(4, 7), '생리결석'), (1, D(4, 8), '질병지각')]),
+        5: [],
+    }
+
+EDITS = [
+    ('append today', 5, [(1, D(5, 12), '질병결석'), (4, D(5, 12), '미인정결석')]),
+    ('continue streak', 5, [(1, D(5, 12), '질병결석'), (1, D(5, 13), '질병결석'), (4, D(5, 12), '미인정결석')]),
+    ('past correction', 3, [(1, D(3, 10), '인정결석', '교외체험학습'), (1, D(3, 11), '질병결석'),
+                            (2, D(3, 20), '인정결석', '교외체험학습')]),
+    ('past removal', 4, [(1, D(4, 8), '질병지각')]),
+    ('non-roster trip', 4, [(1, D(4, 8), '질병지각'), (9, D(4, 21), '인정결석', '해외체험학습')]),
+    ('menstrual violation', 4, [(1, D(4, 8), '질병지각'), (3, D(4, 9), '생리결석'), (3, D(4, 10), '생리조퇴'),
+                                (9, D(4, 21), '인정결석', '해외체험학습')]),
+]
+
+@pytest.mark.parametrize('log_complete', [True, False], ids=['change-log', 'reread-months'])
+def test_incremental_matches_rebuild(counters_env, roster, make_events, log_complete):
+    sync = counters_env(FakeSync(_initial(make_events)))
+    assert running_counters.update(sync.snapshot(roster))['mode'] == 'rebuild'
+
+    for _, month, rows in EDITS:
+        sync.set_month(month, make_events(rows))
+        if not log_complete:
+            # 변경 로그가 정리되어 빠진 상황 -> 바뀐 월을 다시 읽는 경로
+            state = running_counters.load_counters(YEAR)
+            state['change_seq'] = -5
+            running_counters._save(state, YEAR)
+        snapshot = sync.snapshot(roster)
+        state = running_counters.update(snapshot)
+        full = running_counters.rebuild(snapshot)
+
+        assert state['mode'] == 'delta'
+        assert state['students'] == full['students']
+        assert state['months'] == full['months']
+
+def test_counters_match_compliance_engine(counters_env, roster, make_events):
+    sync = counters_env(FakeSync(_initial(make_events)))
+    running_counters.update(sync.snapshot(roster))
+    for _, month, rows in EDITS:
+        sync.set_month(month, make_events(rows))
+    snapshot = sync.snapshot(roster)
+    state = running_counters.update(snapshot)
+
+    assert state['students'] == running_counters._summarize(snapshot.compliance())
+    assert state['students']['1']['absence']['count'] == 3
+    assert state['students']['9']['trip']['int']['days'] == 1
+    assert 'menstrual.monthly.4' in state['students']['3']['flags']
+
+def test_change_log_path_reads_no_months(counters_env, roster, make_events):
+    sync = counters_env(FakeSync(_initial(make_events)))
+    running_counters.update(sync.snapshot(roster))
+    sync.set_month(5, make_events([(1, D(5, 12), '질병결석')]))
+
+    snapshot = sync.snapshot(roster)
+    read = []
+    get_events = snapshot.get_events
+    snapshot.get_events = lambda m: read.append(m) or get_events(m)
+    assert running_counters.update(snapshot)['mode'] == 'delta'
+    assert read == []
+
+def test_unchanged_and_new_flags(counters_env, roster, make_events):
+    sync = counters_env(FakeSync(_initial(make_events)))
+    assert running_counters.update(sync.snapshot(roster))['new_flags'] == {}
+    assert running_counters.update(sync.snapshot(roster))['mode'] == 'unchanged'
+
+    sync.set_month(4, make_events([(3, D(4, 7), '생리결석'), (3, D(4, 8), '생리결석')]))
+    state = running_counters.update(sync.snapshot(roster))
+    assert state['new_flags'] == {'3': ['menstrual.monthly.4']}
+    # 같은 위반은 다음 갱신에서 다시 알리지 않음
+    sync.set_month(5, make_events([(2, D(5, 12), '질병결석')]))
+    assert running_counters.update(sync.snapshot(roster))['new_flags'] == {}